@@ -6,9 +6,11 @@ setup(
     packages=find_packages(),
     install_requires=[
         "pymongo>=4.6.0",
-        "redis>=5.0.0",
+        "redis>=5.0.1",
+        "motor>=3.3.0",
         "bcrypt>=4.0.0",
         "pandas>=2.0.0",
+        "numpy>=1.24.0",
         "fpdf>=1.7.0",
         "openpyxl>=3.0.0",
         "python-dotenv>=1.0.0",
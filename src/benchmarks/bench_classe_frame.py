@@ -0,0 +1,73 @@
+"""
+Benchmark des statistiques calculées sur la structure en colonnes (ClasseFrame)
+
+Compare les boucles Python sur des objets Etudiant aux calculs vectorisés NumPy
+(moyennes, statistiques par matière, rangs, mentions).
+
+Utilisation:
+    python -m src.benchmarks.bench_classe_frame --nombre 500000
+
+Ce benchmark n'utilise ni MongoDB ni Redis.
+"""
+import argparse
+import random
+import statistics
+import time
+
+from src.models.etudiant import Etudiant
+from src.models.classe_frame import ClasseFrame
+
+MATIERES = ["Maths", "Physique", "Français", "Anglais", "Histoire", "SVT"]
+
+def generer_documents(nombre: int) -> list:
+    """Génère des documents étudiants avec quatre à six notes chacun"""
+    aleatoire = random.Random(42)
+    return [
+        {
+            "_id": f"{i:024x}", "nom": f"Nom{i}", "prenom": f"Prenom{i}",
+            "telephone": f"{700000000 + i}", "classe": f"L{i % 3 + 1}",
+            "notes": {m: round(aleatoire.uniform(0, 20), 2) for m in aleatoire.sample(MATIERES, aleatoire.randint(4, 6))}
+        }
+        for i in range(nombre)
+    ]
+
+def analyser_objets(etudiants: list) -> None:
+    """Statistiques calculées par boucles Python"""
+    moyennes = [e.moyenne for e in etudiants]
+    for matiere in MATIERES:
+        notes = [e.notes[matiere] for e in etudiants if matiere in e.notes]
+        statistics.fmean(notes), statistics.pstdev(notes), min(notes), max(notes)
+    sorted(range(len(etudiants)), key=lambda i: moyennes[i], reverse=True)
+    [next(n for b, n in ((16, "tres_bien"), (14, "bien"), (12, "assez_bien"), (10, "passable"), (0, "insuffisant")) if m >= b)
+     for m in moyennes]
+
+def analyser_frame(frame: ClasseFrame) -> None:
+    """Statistiques calculées par NumPy"""
+    moyennes = frame.moyennes()
+    frame.statistiques_matieres()
+    frame.rangs(moyennes)
+    frame.mentions(moyennes)
+
+def chronometrer(fonction, *args) -> float:
+    """Retourne la durée d'un appel en millisecondes"""
+    debut = time.perf_counter()
+    fonction(*args)
+    return (time.perf_counter() - debut) * 1000
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark des statistiques vectorisées (ClasseFrame)")
+    parser.add_argument("--nombre", type=int, default=500000, help="Nombre d'étudiants générés")
+    args = parser.parse_args()
+
+    documents = generer_documents(args.nombre)
+    etudiants = [Etudiant.from_dict(data) for data in documents]
+    duree_construction = chronometrer(ClasseFrame.depuis_documents, documents)
+    frame = ClasseFrame.depuis_documents(documents)
+
+    print(f"{args.nombre} étudiants, {len(MATIERES)} matières")
+    print(f"Construction de la structure en colonnes: {duree_construction:.1f} ms")
+    print(f"Boucles Python sur les objets Etudiant: {chronometrer(analyser_objets, etudiants):.1f} ms")
+    print(f"Calculs vectorisés NumPy: {chronometrer(analyser_frame, frame):.1f} ms")
+
+if __name__ == "__main__":
+    main()
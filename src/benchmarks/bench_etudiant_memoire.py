@@ -0,0 +1,85 @@
+"""
+Benchmark mémoire et débit du modèle Etudiant
+
+Compare le modèle actuel (__slots__, moyenne mémorisée) à l'ancienne représentation
+(objet avec __dict__, moyenne recalculée à chaque accès).
+
+Utilisation:
+    python -m src.benchmarks.bench_etudiant_memoire --nombre 1000000
+
+Ce benchmark n'utilise ni MongoDB ni Redis.
+"""
+import argparse
+import gc
+import time
+import tracemalloc
+
+from src.models.etudiant import Etudiant
+
+class EtudiantDict:
+    """Ancienne représentation de l'étudiant, conservée comme référence"""
+
+    def __init__(self, nom, prenom, telephone, classe, notes=None, _id=None):
+        self.nom = nom
+        self.prenom = prenom
+        self.telephone = telephone
+        self.classe = classe
+        self.notes = notes or {}
+        self._id = _id
+
+    @property
+    def moyenne(self) -> float:
+        if not self.notes:
+            return 0.0
+        return sum(self.notes.values()) / len(self.notes)
+
+def creer(classe_modele, nombre: int) -> list:
+    """Crée des étudiants de test avec six notes chacun"""
+    return [
+        classe_modele(
+            f"Nom{i}", f"Prenom{i}", f"{700000000 + i}", f"L{i % 3 + 1}",
+            {"Maths": 12.0, "Physique": 14.5, "Français": 9.0, "Anglais": 16.0, "Histoire": 11.0, "SVT": 13.5},
+            f"{i:024x}"
+        )
+        for i in range(nombre)
+    ]
+
+def mesurer(classe_modele, nombre: int, lectures: int) -> dict:
+    """Mesure la mémoire allouée et le temps de lecture de la moyenne"""
+    gc.collect()
+    tracemalloc.start()
+    etudiants = creer(classe_modele, nombre)
+    memoire, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    # Lectures répétées de la moyenne, comme dans les statistiques et les exports
+    debut = time.perf_counter()
+    for _ in range(lectures):
+        for etudiant in etudiants:
+            etudiant.moyenne
+    duree_lectures = time.perf_counter() - debut
+
+    debut = time.perf_counter()
+    sorted(etudiants, key=lambda e: e.moyenne, reverse=True)
+    duree_tri = time.perf_counter() - debut
+
+    return {"memoire": memoire, "lectures": duree_lectures, "tri": duree_tri}
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark mémoire et débit du modèle Etudiant")
+    parser.add_argument("--nombre", type=int, default=1000000, help="Nombre d'étudiants créés")
+    parser.add_argument("--lectures", type=int, default=7, help="Lectures de la moyenne par étudiant")
+    args = parser.parse_args()
+
+    ancien = mesurer(EtudiantDict, args.nombre, args.lectures)
+    nouveau = mesurer(Etudiant, args.nombre, args.lectures)
+
+    print(f"{args.nombre} étudiants, {args.lectures} lectures de la moyenne par étudiant")
+    print(f"{'':32}{'__dict__':>14}{'__slots__':>14}")
+    print(f"{'Mémoire (Mo)':32}{ancien['memoire'] / 1e6:>14.1f}{nouveau['memoire'] / 1e6:>14.1f}")
+    print(f"{'Octets par étudiant':32}{ancien['memoire'] / args.nombre:>14.0f}{nouveau['memoire'] / args.nombre:>14.0f}")
+    print(f"{'Lectures de la moyenne (s)':32}{ancien['lectures']:>14.2f}{nouveau['lectures']:>14.2f}")
+    print(f"{'Tri par moyenne (s)':32}{ancien['tri']:>14.2f}{nouveau['tri']:>14.2f}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,51 @@
+"""
+Benchmark du hachage bcrypt des mots de passe (MotDePasseService)
+
+Compare le hachage séquentiel dans le processus courant au hachage réparti sur le pool
+de processus, et rapporte le débit (hashs par seconde) total et par cœur.
+
+Utilisation:
+    python -m src.benchmarks.bench_hachage --nombre 64 --cout 12 --processus 4
+
+Ce benchmark n'utilise ni MongoDB ni Redis.
+"""
+import argparse
+import os
+import time
+
+import src.services.mot_de_passe_service as mot_de_passe_service
+from src.services.mot_de_passe_service import MotDePasseService
+
+def chronometrer(fonction, *args) -> float:
+    """Retourne la durée d'un appel en secondes"""
+    debut = time.perf_counter()
+    fonction(*args)
+    return time.perf_counter() - debut
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark du hachage bcrypt des mots de passe")
+    parser.add_argument("--nombre", type=int, default=64, help="Nombre de mots de passe hachés")
+    parser.add_argument("--cout", type=int, default=mot_de_passe_service.BCRYPT_COUT, help="Facteur de travail bcrypt")
+    parser.add_argument("--processus", type=int, default=os.cpu_count() or 1, help="Nombre de processus du pool")
+    args = parser.parse_args()
+
+    mot_de_passe_service.MOT_DE_PASSE_PROCESSUS = args.processus
+    service = MotDePasseService(cout=args.cout)
+    passwords = [f"mot-de-passe-{i}" for i in range(args.nombre)]
+
+    # Démarrage des processus hors mesure
+    list(service.pool().map(mot_de_passe_service.hacher, ["x"] * args.processus, [4] * args.processus))
+
+    duree_sequentielle = chronometrer(lambda: [service.hacher(p) for p in passwords])
+    duree_pool = chronometrer(service.hacher_lot, passwords)
+    MotDePasseService.arreter()
+
+    debit_sequentiel = args.nombre / duree_sequentielle
+    debit_pool = args.nombre / duree_pool
+    print(f"{args.nombre} mots de passe, coût {args.cout}, {args.processus} processus ({os.cpu_count()} cœurs)")
+    print(f"Séquentiel (1 cœur): {duree_sequentielle:.2f} s, {debit_sequentiel:.1f} hashs/s")
+    print(f"Pool de processus: {duree_pool:.2f} s, {debit_pool:.1f} hashs/s, "
+          f"{debit_pool / args.processus:.1f} hashs/s par processus (accélération x{debit_pool / debit_sequentiel:.2f})")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,81 @@
+"""
+Benchmark du classement des étudiants: chargement complet et tri contre agrégation MongoDB
+
+Utilisation:
+    python -m src.benchmarks.bench_top_etudiants --nombre 200000 --limit 10
+
+Le benchmark travaille dans une base dédiée (<DB_NAME>_benchmark) supprimée à la fin.
+"""
+import argparse
+import os
+import random
+import time
+
+from src.config.database import Database
+from src.services.etudiant.etudiant_service import EtudiantService
+
+MATIERES = ["Mathématiques", "Physique", "Français", "Anglais", "Histoire", "SVT"]
+CLASSES = [f"L{niveau}-{groupe}" for niveau in range(1, 4) for groupe in "ABCD"]
+
+def generer_etudiants(collection, nombre: int, taille_lot: int = 10000) -> None:
+    """Insère des étudiants aléatoires dans la collection de benchmark"""
+    lot = []
+    for i in range(nombre):
+        lot.append({
+            "nom": f"Nom{i}",
+            "prenom": f"Prenom{i}",
+            "telephone": f"{700000000 + i}",
+            "classe": random.choice(CLASSES),
+            "notes": {
+                matiere: round(random.uniform(0, 20), 2)
+                for matiere in random.sample(MATIERES, random.randint(0, len(MATIERES)))
+            }
+        })
+        if len(lot) >= taille_lot:
+            collection.insert_many(lot, ordered=False)
+            lot = []
+    if lot:
+        collection.insert_many(lot, ordered=False)
+
+def chronometrer(fonction, repetitions: int) -> float:
+    """Retourne la durée moyenne d'un appel en millisecondes"""
+    debut = time.perf_counter()
+    for _ in range(repetitions):
+        fonction()
+    return (time.perf_counter() - debut) / repetitions * 1000
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark du classement des étudiants")
+    parser.add_argument("--nombre", type=int, default=100000, help="Nombre d'étudiants générés")
+    parser.add_argument("--limit", type=int, default=10, help="Taille du classement")
+    parser.add_argument("--repetitions", type=int, default=5, help="Nombre de mesures par méthode")
+    args = parser.parse_args()
+
+    os.environ['DB_NAME'] = f"{os.getenv('DB_NAME', 'gestion_etudiants')}_benchmark"
+    service = EtudiantService()
+    service.collection.drop()
+    Database.assurer_index(service.db)
+
+    try:
+        print(f"Génération de {args.nombre} étudiants...")
+        generer_etudiants(service.collection, args.nombre)
+
+        # Vérifier que les deux méthodes donnent le même classement
+        attendu = [round(e.moyenne, 6) for e in service.trier_etudiants_par_moyenne()[:args.limit]]
+        obtenu = [round(e.moyenne, 6) for e in service.top_etudiants(args.limit)]
+        if attendu != obtenu:
+            print("ATTENTION: les deux méthodes ne donnent pas les mêmes moyennes")
+
+        duree_python = chronometrer(
+            lambda: service.trier_etudiants_par_moyenne()[:args.limit], args.repetitions
+        )
+        duree_agregation = chronometrer(lambda: service.top_etudiants(args.limit), args.repetitions)
+
+        print(f"Chargement et tri (trier_etudiants_par_moyenne): {duree_python:.1f} ms")
+        print(f"Agrégation MongoDB (top_etudiants):              {duree_agregation:.1f} ms")
+        print(f"Accélération: x{duree_python / duree_agregation:.1f}")
+    finally:
+        service.collection.drop()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,474 @@
+"""
+Interface en ligne de commande non interactive (scripts, cron)
+
+Utilisation:
+    python -m src.cli --utilisateur admin import etudiants.csv
+    python -m src.cli --utilisateur admin export etudiants.ndjson.gz --classe L1
+    python -m src.cli --utilisateur prof notes set --file notes.csv
+    python -m src.cli --utilisateur prof stats --classe L1
+    python -m src.cli --utilisateur prof top --limit 20
+    python -m src.cli --utilisateur admin comptes --classe L1 --sortie identifiants_L1.csv
+
+Le mot de passe est lu dans la variable d'environnement GESTION_MOT_DE_PASSE (jamais
+sur la ligne de commande). Le résultat de chaque commande est écrit en JSON sur la
+sortie standard; les journaux vont sur la sortie d'erreur.
+"""
+import argparse
+import csv
+import json
+import os
+import sys
+import traceback
+from typing import List, Dict, Any, Optional
+from bson import ObjectId
+from dotenv import load_dotenv
+
+from src.models.utilisateur import Role
+from src.utils.logger import Logger
+from src.utils.exception.exceptions import ApplicationError, AuthenticationError, AuthorizationError
+
+# Chargement des variables d'environnement
+load_dotenv()
+
+# Codes de sortie
+CODE_SUCCES = 0
+CODE_ERREUR = 1
+CODE_USAGE = 2           # Arguments invalides (argparse)
+CODE_AUTHENTIFICATION = 3
+CODE_AUTORISATION = 4
+CODE_PARTIEL = 5         # Commande exécutée, mais des lignes ont été rejetées
+
+# Rôles autorisés pour chaque commande (comme dans les menus de l'application)
+ROLES_COMMANDES = {
+    "import": {Role.ADMIN.value},
+    "export": {Role.ADMIN.value},
+    "notes": {Role.ADMIN.value, Role.ENSEIGNANT.value},
+    "stats": {Role.ADMIN.value, Role.ENSEIGNANT.value},
+    "top": {Role.ADMIN.value, Role.ENSEIGNANT.value},
+    "comptes": {Role.ADMIN.value},
+}
+
+FORMATS_EXPORT = ("csv", "json", "ndjson", "excel", "pdf")
+
+class ApplicationCli:
+    """Exécute les commandes non interactives sur les services de l'application"""
+
+    def __init__(self):
+        """Initialise les services (importés ici pour que --help fonctionne sans base de données)"""
+        from src.services.utilisateur_service import UtilisateurService
+        from src.services.export_import_service import ExportImportService
+        from src.services.statistiques_service import StatistiquesService
+        from src.services.notification_service import NotificationService
+
+        self.utilisateur_service = UtilisateurService()
+        self.export_import_service = ExportImportService()
+        self.etudiant_service = self.export_import_service.etudiant_service
+        self.statistiques_service = StatistiquesService()
+        self.notification_service = NotificationService()
+        self.logger = Logger.get_instance()
+
+    def authentifier(self, username: str, password: str, commande: str) -> Dict[str, Any]:
+        """
+        Ouvre une session et vérifie que le rôle autorise la commande
+
+        Args:
+            username: Le nom d'utilisateur
+            password: Le mot de passe
+            commande: La commande demandée
+
+        Returns:
+            La session ouverte
+
+        Raises:
+            AuthenticationError: Si les identifiants sont invalides ou si trop de tentatives ont été faites
+            AuthorizationError: Si le rôle n'autorise pas la commande
+        """
+        session = self.utilisateur_service.authentifier(username, password)
+        if not session:
+            raise AuthenticationError("Nom d'utilisateur ou mot de passe incorrect")
+
+        role = session["utilisateur"]["role"]
+        if role not in ROLES_COMMANDES[commande]:
+            self.utilisateur_service.deconnecter(session["token"])
+            raise AuthorizationError(f"Le rôle '{role}' ne permet pas la commande '{commande}'")
+
+        return session
+
+    def importer(self, fichier: str, taille_lot: int) -> Dict[str, Any]:
+        """
+        Importe des étudiants (format déduit de l'extension, .gz accepté)
+
+        Args:
+            fichier: Le fichier à importer
+            taille_lot: Nombre d'étudiants insérés par requête
+
+        Returns:
+            Le rapport d'importation
+        """
+        rapport = self._importer_fichier(fichier, taille_lot)
+
+        self.logger.info(f"Importation en ligne de commande: {len(rapport['inseres'])} étudiant(s) depuis {fichier}")
+        return {
+            "inseres": len(rapport["inseres"]),
+            "doublons": rapport["doublons"],
+            "invalides": rapport["invalides"]
+        }
+
+    def _importer_fichier(self, fichier: str, taille_lot: int) -> Dict[str, List]:
+        """Importe un fichier d'étudiants selon son extension et retourne le rapport complet"""
+        extension = fichier[:-3] if fichier.endswith(".gz") else fichier
+        if extension.endswith(".csv"):
+            return self.export_import_service.importer_csv(fichier, taille_lot)
+        if extension.endswith((".json", ".ndjson", ".jsonl")):
+            return self.export_import_service.importer_json(fichier, taille_lot)
+        if extension.endswith((".xlsx", ".xls")):
+            return self.export_import_service.importer_excel(fichier, taille_lot)
+        raise ValueError(f"Format de fichier non reconnu: {fichier}")
+
+    def provisionner_comptes(self, classe: Optional[str], fichier: Optional[str], sortie: str,
+                             domaine: Optional[str], taille_lot: int) -> Dict[str, Any]:
+        """
+        Crée les comptes des étudiants d'une classe ou d'un fichier d'inscription
+
+        Un fichier est d'abord importé (les étudiants déjà inscrits, reconnus à leur
+        téléphone, sont conservés); les étudiants ayant déjà un compte sont ignorés. Les
+        identifiants créés sont écrits dans le fichier de sortie lot par lot, jamais sur la
+        sortie standard; ce fichier n'est pas conservé si aucun compte n'a été créé.
+
+        Args:
+            classe: La classe dont créer les comptes
+            fichier: Le fichier d'inscription (format de la commande import)
+            sortie: Le fichier CSV des identifiants
+            domaine: Domaine des adresses email (optionnel)
+            taille_lot: Nombre de comptes insérés par requête
+
+        Returns:
+            Dictionnaire {fichier, crees, comptes_existants, conflits, invalides}
+
+        Raises:
+            ValueError: Si le fichier de sortie existe déjà
+            ApplicationError: Si la création est interrompue (le message indique les comptes
+                déjà créés, dont les identifiants sont dans le fichier de sortie)
+        """
+        # Vérifié avant toute création: les mots de passe ne pourraient plus être exportés
+        if os.path.exists(sortie):
+            raise ValueError(f"Le fichier {sortie} existe déjà: choisissez un autre fichier de sortie")
+
+        invalides = []
+        if fichier:
+            rapport_import = self._importer_fichier(fichier, taille_lot)
+            invalides = rapport_import["invalides"]
+            critere = {"$or": [
+                {"_id": {"$in": [ObjectId(i) for i in rapport_import["inseres"]]}},
+                {"telephone": {"$in": rapport_import["doublons"]}}
+            ]}
+        else:
+            critere = {"classe": classe}
+
+        etudiants = self.etudiant_service.iterer_etudiants(critere, taille_lot)
+        options = {"domaine_email": domaine} if domaine else {}
+        with self.export_import_service.ouvrir_identifiants(sortie) as identifiants:
+            try:
+                rapport = self.utilisateur_service.provisionner_etudiants(
+                    etudiants, taille_lot=taille_lot, enregistrer=identifiants.ecrire, **options
+                )
+            except Exception as e:
+                if not identifiants.nombre:
+                    raise
+                raise ApplicationError(
+                    f"Création des comptes interrompue: {e}. "
+                    f"{identifiants.nombre} compte(s) créé(s) avant l'erreur, identifiants dans {sortie}"
+                ) from e
+        if rapport["crees"]:
+            self.logger.info(f"Création de comptes en ligne de commande: {len(rapport['crees'])} compte(s), identifiants dans {sortie}")
+        return {
+            "fichier": sortie if rapport["crees"] else None,
+            "crees": len(rapport["crees"]),
+            "comptes_existants": len(rapport["existants"]),
+            "conflits": rapport["conflits"],
+            "invalides": invalides
+        }
+
+    def exporter(self, fichier: str, format_export: Optional[str], classe: Optional[str]) -> Dict[str, Any]:
+        """
+        Exporte les étudiants
+
+        Args:
+            fichier: Le fichier à créer (.gz pour compresser en CSV/JSON)
+            format_export: Le format (si None, déduit de l'extension)
+            classe: Limite l'export à une classe (optionnel)
+
+        Returns:
+            Dictionnaire {fichier, format, nombre}
+        """
+        format_export = format_export or self._format_depuis_extension(fichier)
+        critere = {"classe": classe} if classe else None
+
+        if format_export == "csv":
+            self.export_import_service.exporter_csv(chemin_fichier=fichier, critere=critere)
+        elif format_export in ("json", "ndjson"):
+            self.export_import_service.exporter_json(chemin_fichier=fichier, critere=critere,
+                                                     ndjson=format_export == "ndjson")
+        elif format_export == "excel":
+            etudiants = self.etudiant_service.rechercher_etudiants(critere) if critere else None
+            self.export_import_service.exporter_excel(etudiants, fichier)
+        else:
+            self.export_import_service.exporter_pdf(chemin_fichier=fichier, critere=critere)
+
+        self.logger.info(f"Exportation {format_export} en ligne de commande: {fichier}")
+        return {
+            "fichier": fichier,
+            "format": format_export,
+            "nombre": self.etudiant_service.compter_etudiants(critere)
+        }
+
+    @staticmethod
+    def _format_depuis_extension(fichier: str) -> str:
+        """Déduit le format d'export de l'extension du fichier"""
+        extension = fichier[:-3] if fichier.endswith(".gz") else fichier
+        for suffixes, format_export in (((".csv",), "csv"), ((".ndjson", ".jsonl"), "ndjson"),
+                                         ((".json",), "json"), ((".xlsx",), "excel"), ((".pdf",), "pdf")):
+            if extension.endswith(suffixes):
+                return format_export
+        raise ValueError(f"Format non déduit de l'extension, utilisez --format: {fichier}")
+
+    def saisir_notes(self, fichier: str, matiere: Optional[str], notifier: bool = False) -> Dict[str, Any]:
+        """
+        Enregistre des notes lues dans un fichier CSV
+
+        Le fichier contient une colonne "telephone" (ou "id"), une colonne "note" et,
+        sauf si la matière est donnée en option, une colonne "matiere".
+
+        Args:
+            fichier: Le fichier CSV
+            matiere: La matière de toutes les notes (optionnel)
+            notifier: Notifier les étudiants par email
+
+        Returns:
+            Dictionnaire {mis_a_jour, introuvables, invalides, conflits}
+        """
+        notes_par_cle, invalides = self._lire_notes(fichier, matiere)
+
+        # Une requête $in par lot pour retrouver les IDs des étudiants désignés par téléphone
+        cles = list(notes_par_cle)
+        ids_par_cle = {}
+        for debut in range(0, len(cles), 1000):
+            lot = cles[debut:debut + 1000]
+            for data in self.etudiant_service.collection.find({"telephone": {"$in": lot}}, {"telephone": 1}):
+                ids_par_cle[data["telephone"]] = str(data["_id"])
+        for cle in cles:
+            if cle not in ids_par_cle and ObjectId.is_valid(cle):
+                ids_par_cle[cle] = cle
+
+        # Un bulk_write par matière
+        notes_par_matiere = {}
+        for cle, notes in notes_par_cle.items():
+            if cle in ids_par_cle:
+                for nom_matiere, note in notes.items():
+                    notes_par_matiere.setdefault(nom_matiere, {})[ids_par_cle[cle]] = note
+
+        mis_a_jour = set()
+        introuvables = {cle for cle in cles if cle not in ids_par_cle}
+        conflits = set()
+        for nom_matiere, notes in notes_par_matiere.items():
+            try:
+                rapport = self.etudiant_service.saisir_notes_en_masse(
+                    nom_matiere, notes, self.notification_service if notifier else None
+                )
+            except ValueError as e:
+                invalides.append({"matiere": nom_matiere, "erreur": str(e)})
+                continue
+            mis_a_jour.update(rapport["mis_a_jour"])
+            introuvables.update(rapport["introuvables"])
+            conflits.update(rapport["conflits"])
+            invalides.extend(rapport["invalides"])
+
+        self.logger.info(f"Saisie de notes en ligne de commande: {len(mis_a_jour)} étudiant(s) mis à jour depuis {fichier}")
+        return {
+            "mis_a_jour": len(mis_a_jour),
+            "introuvables": sorted(introuvables),
+            "conflits": sorted(conflits),
+            "invalides": invalides
+        }
+
+    @staticmethod
+    def _lire_notes(fichier: str, matiere: Optional[str]):
+        """
+        Lit et valide les lignes d'un fichier de notes
+
+        Returns:
+            Tuple ({telephone ou id: {matiere: note}}, [{"ligne", "erreur"}])
+        """
+        notes_par_cle = {}
+        invalides = []
+
+        with open(fichier, "r", newline="", encoding="utf-8") as f:
+            for numero, ligne in enumerate(csv.DictReader(f), start=2):
+                cle = (ligne.get("telephone") or ligne.get("id") or "").strip()
+                nom_matiere = matiere or (ligne.get("matiere") or "").strip()
+                try:
+                    if not cle or not nom_matiere:
+                        raise ValueError("téléphone (ou id) et matière obligatoires")
+                    # Une ligne trop courte donne None (DictReader): refusée comme une note vide
+                    valeur = (ligne.get("note") or "").strip()
+                    if not valeur:
+                        raise ValueError("note manquante")
+                    note = float(valeur)
+                    if not 0 <= note <= 20:
+                        raise ValueError(f"note hors de l'intervalle 0-20: {note}")
+                except ValueError as e:
+                    invalides.append({"ligne": numero, "erreur": str(e)})
+                    continue
+                notes_par_cle.setdefault(cle, {})[nom_matiere] = note
+
+        return notes_par_cle, invalides
+
+    def statistiques(self, classe: Optional[str]) -> Dict[str, Any]:
+        """
+        Retourne les statistiques de l'établissement ou d'une classe
+
+        Args:
+            classe: La classe (si None, tout l'établissement)
+
+        Returns:
+            Les statistiques
+        """
+        if classe is None:
+            return self.statistiques_service.calculer_statistiques()
+
+        return self.etudiant_service.statistiques_de_classe(classe)
+
+    def top(self, limit: int, classe: Optional[str]) -> List[Dict[str, Any]]:
+        """
+        Retourne les meilleurs étudiants
+
+        Args:
+            limit: Nombre d'étudiants
+            classe: Limite le classement à une classe (optionnel)
+
+        Returns:
+            Liste de {rang, id, nom, prenom, telephone, classe, moyenne}
+        """
+        return [
+            {
+                "rang": rang,
+                "id": etudiant._id,
+                "nom": etudiant.nom,
+                "prenom": etudiant.prenom,
+                "telephone": etudiant.telephone,
+                "classe": etudiant.classe,
+                "moyenne": round(etudiant.moyenne, 2)
+            }
+            for rang, etudiant in enumerate(self.etudiant_service.top_etudiants(limit, classe), start=1)
+        ]
+
+def construire_parser() -> argparse.ArgumentParser:
+    """Construit l'analyseur des arguments de la ligne de commande"""
+    parser = argparse.ArgumentParser(prog="python -m src.cli",
+                                     description="Gestion des étudiants en ligne de commande (sortie JSON)")
+    parser.add_argument("--utilisateur", default=os.getenv("GESTION_UTILISATEUR"),
+                        help="Nom d'utilisateur (défaut: $GESTION_UTILISATEUR); mot de passe dans $GESTION_MOT_DE_PASSE")
+    commandes = parser.add_subparsers(dest="commande", required=True)
+
+    importer = commandes.add_parser("import", help="Importer des étudiants (CSV, JSON, NDJSON, Excel, .gz)")
+    importer.add_argument("fichier")
+    importer.add_argument("--taille-lot", type=int, default=1000, help="Étudiants insérés par requête")
+
+    exporter = commandes.add_parser("export", help="Exporter les étudiants")
+    exporter.add_argument("fichier")
+    exporter.add_argument("--format", choices=FORMATS_EXPORT, help="Format (défaut: déduit de l'extension)")
+    exporter.add_argument("--classe", help="Exporter une seule classe")
+
+    notes = commandes.add_parser("notes", help="Gérer les notes")
+    actions_notes = notes.add_subparsers(dest="action", required=True)
+    definir = actions_notes.add_parser("set", help="Enregistrer des notes depuis un CSV (telephone|id, matiere, note)")
+    definir.add_argument("--file", dest="fichier", required=True, help="Fichier CSV des notes")
+    definir.add_argument("--matiere", help="Matière de toutes les notes (sinon, colonne 'matiere')")
+    definir.add_argument("--notifier", action="store_true", help="Notifier les étudiants par email")
+
+    stats = commandes.add_parser("stats", help="Statistiques de l'établissement ou d'une classe")
+    stats.add_argument("--classe")
+
+    top = commandes.add_parser("top", help="Meilleurs étudiants")
+    top.add_argument("--limit", type=int, default=10)
+    top.add_argument("--classe")
+
+    comptes = commandes.add_parser("comptes", help="Créer les comptes des étudiants d'une classe ou d'un fichier")
+    source = comptes.add_mutually_exclusive_group(required=True)
+    source.add_argument("--classe", help="Classe dont créer les comptes")
+    source.add_argument("--fichier", help="Fichier d'inscription à importer (CSV, JSON, NDJSON, Excel, .gz)")
+    comptes.add_argument("--sortie", default="identifiants.csv", help="Fichier CSV des identifiants créés")
+    comptes.add_argument("--domaine", help="Domaine des adresses email (défaut: $DOMAINE_EMAIL_ETUDIANTS)")
+    comptes.add_argument("--taille-lot", type=int, default=1000, help="Comptes insérés par requête")
+
+    return parser
+
+def executer(args: argparse.Namespace, cli: ApplicationCli) -> Dict[str, Any]:
+    """Exécute la commande analysée et retourne son résultat"""
+    if args.commande == "import":
+        return cli.importer(args.fichier, args.taille_lot)
+    if args.commande == "export":
+        return cli.exporter(args.fichier, args.format, args.classe)
+    if args.commande == "notes":
+        return cli.saisir_notes(args.fichier, args.matiere, args.notifier)
+    if args.commande == "stats":
+        return cli.statistiques(args.classe)
+    if args.commande == "comptes":
+        return cli.provisionner_comptes(args.classe, args.fichier, args.sortie, args.domaine, args.taille_lot)
+    return {"etudiants": cli.top(args.limit, args.classe)}
+
+def ecrire_json(donnees: Dict[str, Any], sortie=None) -> None:
+    """Écrit un résultat JSON sur une ligne"""
+    print(json.dumps(donnees, ensure_ascii=False, default=str), file=sortie or sys.stdout)
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """
+    Point d'entrée de la ligne de commande
+
+    Args:
+        argv: Les arguments (par défaut, ceux du processus)
+
+    Returns:
+        Le code de sortie
+    """
+    args = construire_parser().parse_args(argv)
+    logger = Logger.get_instance()
+
+    password = os.getenv("GESTION_MOT_DE_PASSE")
+    if not args.utilisateur or not password:
+        ecrire_json({"succes": False, "erreur": "Identifiants manquants: --utilisateur et $GESTION_MOT_DE_PASSE"},
+                    sys.stderr)
+        return CODE_AUTHENTIFICATION
+
+    session = None
+    cli = None
+    try:
+        cli = ApplicationCli()
+        session = cli.authentifier(args.utilisateur, password, args.commande)
+        resultat = executer(args, cli)
+    except AuthenticationError as e:
+        logger.warning(f"Échec de l'authentification en ligne de commande: {args.utilisateur}")
+        ecrire_json({"succes": False, "erreur": e.message}, sys.stderr)
+        return CODE_AUTHENTIFICATION
+    except AuthorizationError as e:
+        ecrire_json({"succes": False, "erreur": e.message}, sys.stderr)
+        return CODE_AUTORISATION
+    except (ApplicationError, ValueError, OSError) as e:
+        logger.error(f"Erreur en ligne de commande ({args.commande}): {e}")
+        ecrire_json({"succes": False, "erreur": str(e)}, sys.stderr)
+        return CODE_ERREUR
+    except Exception as e:
+        logger.error(f"Erreur inattendue en ligne de commande ({args.commande}): {e}\n{traceback.format_exc()}")
+        ecrire_json({"succes": False, "erreur": str(e)}, sys.stderr)
+        return CODE_ERREUR
+    finally:
+        if session is not None:
+            cli.utilisateur_service.deconnecter(session["token"])
+
+    ecrire_json({"succes": True, "commande": args.commande, "resultat": resultat})
+
+    rejets = any(resultat.get(cle) for cle in ("invalides", "doublons", "introuvables", "conflits"))
+    return CODE_PARTIEL if rejets else CODE_SUCCES
+
+if __name__ == "__main__":
+    sys.exit(main())
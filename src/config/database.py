@@ -4,6 +4,8 @@ from pymongo import MongoClient
 from pymongo.errors import ConnectionFailure, ServerSelectionTimeoutError
 from dotenv import load_dotenv
 from src.utils.logger import Logger
+from src.utils.exception.exceptions import DatabaseError
+from src.config.indexes import IndexManager
 
 # Chargement des variables d'environnement
 load_dotenv()
@@ -13,6 +15,7 @@ class Database:
     _mongo_instance = None
     _redis_instance = None
     _logger = None
+    _index_verifies = False
     
     @staticmethod
     def _get_logger():
@@ -87,9 +90,86 @@ class Database:
                 
         return Database._redis_instance
     
+    @staticmethod
+    def creer_connexions_async():
+        """
+        Crée les clients asyncio MongoDB (motor) et Redis (redis.asyncio)
+        
+        Contrairement aux connexions synchrones, ces clients ne sont pas partagés: leurs
+        connexions sont liées à la boucle d'événements qui les utilise en premier. Chaque
+        service asynchrone crée les siens et les ferme à la fin de sa boucle.
+        
+        Returns:
+            Tuple (client MongoDB, base de données, client Redis)
+            
+        Raises:
+            DatabaseError: Si les index uniques sont absents (voir assurer_index)
+        """
+        # Importations locales: l'application synchrone ne dépend pas de motor
+        from motor.motor_asyncio import AsyncIOMotorClient
+        import redis.asyncio as redis_async
+        
+        # Les services asynchrones s'appuient sur les mêmes index uniques: les vérifier
+        # (et créer les index manquants) une fois par processus
+        Database.get_db()
+        
+        client = AsyncIOMotorClient(
+            os.getenv('MONGODB_URI', 'mongodb://localhost:27017'),
+            serverSelectionTimeoutMS=30000,
+            connectTimeoutMS=30000,
+            socketTimeoutMS=30000,
+            retryWrites=True,
+            retryReads=True,
+            maxIdleTimeMS=60000,
+            appName='GestionEtudiants',
+            ssl=True
+        )
+        client_redis = redis_async.Redis(
+            host=os.getenv('REDIS_HOST', 'localhost'),
+            port=int(os.getenv('REDIS_PORT', 6379)),
+            password=os.getenv('REDIS_PASSWORD', None),
+            decode_responses=True,
+            socket_timeout=15,
+            socket_connect_timeout=15
+        )
+        return client, client[os.getenv('DB_NAME', 'gestion_etudiants')], client_redis
+    
     @staticmethod
     def get_db():
         """Récupère la base de données MongoDB"""
         client = Database.get_mongo_connection()
         db_name = os.getenv('DB_NAME', 'gestion_etudiants')
-        return client[db_name] 
\ No newline at end of file
+        db = client[db_name]
+        
+        # Vérifier et créer les index une seule fois par processus (nouvel essai tant
+        # que les index uniques ne sont pas confirmés)
+        if not Database._index_verifies:
+            Database.assurer_index(db)
+            Database._index_verifies = True
+        
+        return db
+    
+    @staticmethod
+    def assurer_index(db) -> None:
+        """
+        Vérifie les index déclarés, crée ceux qui manquent et supprime les index obsolètes
+        
+        Raises:
+            DatabaseError: Si un index unique n'existe pas et n'a pas pu être créé
+                (typiquement: des doublons existent déjà dans la collection)
+        """
+        logger = Database._get_logger()
+        gestionnaire = IndexManager(db)
+        try:
+            gestionnaire.creer_index_manquants()
+            gestionnaire.supprimer_index_obsoletes()
+        except Exception as e:
+            logger.error(f"Erreur lors de la vérification des index MongoDB: {e}")
+        
+        # Sans ces index, les doublons de téléphone ou de nom d'utilisateur seraient acceptés
+        manquants = gestionnaire.index_uniques_manquants()
+        if manquants:
+            message = (f"Index uniques absents: {', '.join(manquants)}. "
+                       "Supprimez les doublons existants puis relancez l'application.")
+            logger.error(message)
+            raise DatabaseError(message) 
\ No newline at end of file
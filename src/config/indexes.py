@@ -0,0 +1,173 @@
+from typing import List, Dict, Any, Tuple
+from pymongo import ASCENDING
+from pymongo.errors import OperationFailure
+
+from src.utils.logger import Logger
+
+# Déclaration des index attendus par collection
+# Chaque entrée: (nom de l'index, clés, options)
+INDEX_ATTENDUS: Dict[str, List[Tuple[str, List[Tuple[str, int]], Dict[str, Any]]]] = {
+    "etudiants": [
+        ("telephone_unique", [("telephone", ASCENDING)], {"unique": True}),
+        # Tri par classe et nom; _id rend l'ordre total pour la pagination par curseur
+        ("classe_nom_id", [("classe", ASCENDING), ("nom", ASCENDING), ("_id", ASCENDING)], {}),
+        # Champs de recherche normalisés (préfixes ancrés et trigrammes, multiclé)
+        ("recherche_nom", [("recherche.nom", ASCENDING)], {}),
+        ("recherche_prenom", [("recherche.prenom", ASCENDING)], {}),
+        ("recherche_classe", [("recherche.classe", ASCENDING)], {}),
+        ("recherche_trigrammes", [("recherche.trigrammes", ASCENDING)], {}),
+    ],
+    "utilisateurs": [
+        ("username_unique", [("username", ASCENDING)], {"unique": True}),
+        # Comptes existants des étudiants (création des comptes en masse)
+        ("id_etudiant", [("id_etudiant", ASCENDING)], {}),
+    ],
+}
+
+# Index créés par les versions précédentes et désormais couverts par un index déclaré
+# (préfixes de classe_nom_id). Chaque entrée: clés de l'index, quel que soit son nom
+INDEX_OBSOLETES: Dict[str, List[List[Tuple[str, int]]]] = {
+    "etudiants": [
+        [("classe", ASCENDING)],
+        [("classe", ASCENDING), ("nom", ASCENDING)],
+    ],
+}
+
+class IndexManager:
+    """Gestionnaire des index MongoDB de l'application"""
+
+    def __init__(self, db):
+        """
+        Initialise le gestionnaire d'index
+
+        Args:
+            db: La base de données MongoDB
+        """
+        self.db = db
+        self.logger = Logger.get_instance()
+
+    @staticmethod
+    def _signature(cles, options: Dict[str, Any]) -> Tuple:
+        """Construit une signature comparable (clés + unicité) pour un index"""
+        cles_normalisees = tuple(
+            (champ, int(sens) if isinstance(sens, (int, float)) else sens) for champ, sens in cles
+        )
+        return (cles_normalisees, bool(options.get("unique", False)))
+
+    def verifier_index(self) -> Dict[str, List[str]]:
+        """
+        Compare les index déclarés avec ceux qui existent dans la base
+
+        Returns:
+            Dictionnaire {collection: [noms des index manquants]}
+        """
+        manquants = {}
+
+        for nom_collection, index_declares in INDEX_ATTENDUS.items():
+            existants = self.db[nom_collection].index_information()
+            signatures_existantes = {
+                self._signature(info["key"], info) for info in existants.values()
+            }
+
+            manquants[nom_collection] = [
+                nom for nom, cles, options in index_declares
+                if self._signature(cles, options) not in signatures_existantes
+            ]
+
+        return manquants
+
+    def creer_index_manquants(self) -> List[str]:
+        """
+        Crée les index déclarés qui n'existent pas encore
+
+        Returns:
+            Liste des index créés (au format "collection.nom")
+        """
+        crees = []
+        manquants = self.verifier_index()
+
+        for nom_collection, index_declares in INDEX_ATTENDUS.items():
+            for nom, cles, options in index_declares:
+                if nom not in manquants.get(nom_collection, []):
+                    continue
+
+                try:
+                    self.db[nom_collection].create_index(cles, name=nom, **options)
+                    crees.append(f"{nom_collection}.{nom}")
+                    self.logger.info(f"Index créé: {nom_collection}.{nom}")
+                except OperationFailure as e:
+                    # Typiquement: doublons existants empêchant un index unique
+                    self.logger.error(f"Impossible de créer l'index {nom_collection}.{nom}: {e}")
+
+        return crees
+
+    def supprimer_index_obsoletes(self) -> List[str]:
+        """
+        Supprime les index obsolètes (INDEX_OBSOLETES) encore présents dans la base
+
+        Un index redondant ne sert plus aux requêtes mais reste mis à jour à chaque écriture.
+
+        Returns:
+            Liste des index supprimés (au format "collection.nom")
+        """
+        supprimes = []
+
+        for nom_collection, index_obsoletes in INDEX_OBSOLETES.items():
+            signatures_obsoletes = {self._signature(cles, {}) for cles in index_obsoletes}
+            existants = self.db[nom_collection].index_information()
+
+            for nom, info in existants.items():
+                if self._signature(info["key"], info) not in signatures_obsoletes:
+                    continue
+
+                try:
+                    self.db[nom_collection].drop_index(nom)
+                    supprimes.append(f"{nom_collection}.{nom}")
+                    self.logger.info(f"Index obsolète supprimé: {nom_collection}.{nom}")
+                except OperationFailure as e:
+                    self.logger.error(f"Impossible de supprimer l'index {nom_collection}.{nom}: {e}")
+
+        return supprimes
+
+    def index_uniques_manquants(self) -> List[str]:
+        """
+        Liste les index uniques déclarés qui n'existent pas dans la base
+
+        L'application s'appuie sur ces index pour refuser les doublons (téléphone,
+        nom d'utilisateur) sans requête préalable.
+
+        Returns:
+            Liste des index uniques manquants (au format "collection.nom")
+        """
+        manquants = self.verifier_index()
+        return [
+            f"{nom_collection}.{nom}"
+            for nom_collection, index_declares in INDEX_ATTENDUS.items()
+            for nom, _, options in index_declares
+            if options.get("unique") and nom in manquants.get(nom_collection, [])
+        ]
+
+    def rapport_utilisation(self) -> List[Dict[str, Any]]:
+        """
+        Rapporte l'utilisation des index via l'étape $indexStats
+
+        Returns:
+            Liste de dictionnaires (collection, index, nombre d'utilisations, depuis)
+        """
+        rapport = []
+
+        for nom_collection in INDEX_ATTENDUS:
+            try:
+                stats = self.db[nom_collection].aggregate([{"$indexStats": {}}])
+                for stat in stats:
+                    acces = stat.get("accesses", {})
+                    rapport.append({
+                        "collection": nom_collection,
+                        "index": stat.get("name"),
+                        "utilisations": acces.get("ops", 0),
+                        "depuis": acces.get("since")
+                    })
+            except OperationFailure as e:
+                self.logger.warning(f"Statistiques d'index indisponibles pour {nom_collection}: {e}")
+
+        return rapport
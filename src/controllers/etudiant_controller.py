@@ -1,13 +1,21 @@
-from typing import List, Optional
+from typing import List, Optional, Union
 import re
 
 from src.models.etudiant import Etudiant
+from src.models.etudiant_resume import EtudiantResume
 from src.services.etudiant.etudiant_service import EtudiantService
 from src.services.export_import_service import ExportImportService
 from src.services.notification_service import NotificationService
+from src.services.statistiques_service import StatistiquesService
 from src.utils.console.console import Console, Couleur
 from src.utils.logger import Logger
-from src.utils.exception.exceptions import ValidationError, ResourceNotFoundError
+from src.utils.exception.exceptions import ValidationError, ResourceNotFoundError, VersionConflictError
+
+# Nombre d'étudiants affichés par page dans la liste
+ETUDIANTS_PAR_PAGE = 20
+
+# Nombre maximal de résultats affichés par une recherche
+LIMITE_RECHERCHE = 50
 
 class EtudiantController:
     """Contrôleur pour gérer les interactions liées aux étudiants"""
@@ -17,6 +25,7 @@ class EtudiantController:
         self.etudiant_service = EtudiantService()
         self.export_import_service = ExportImportService()
         self.notification_service = NotificationService()
+        self.statistiques_service = StatistiquesService()
         self.logger = Logger.get_instance()
     
     def saisir_etudiant(self) -> Optional[str]:
@@ -86,23 +95,69 @@ class EtudiantController:
             self.logger.error(f"Erreur lors de l'ajout d'un étudiant: {e}")
             return None
     
-    def afficher_etudiants(self, etudiants: Optional[List[Etudiant]] = None) -> None:
+    def afficher_etudiants(self, etudiants: Optional[List[Union[Etudiant, EtudiantResume]]] = None) -> None:
         """
         Affiche une liste d'étudiants sous forme de tableau
         
         Args:
-            etudiants: Liste des étudiants à afficher (si None, affiche tous les étudiants)
+            etudiants: Liste des étudiants à afficher (si None, parcourt tous les étudiants page par page)
         """
         if etudiants is None:
-            etudiants = self.etudiant_service.lister_etudiants()
-            self.logger.info(f"Affichage de tous les étudiants ({len(etudiants)} trouvés)")
+            self.parcourir_etudiants()
+            return
         
         if not etudiants:
             Console.info("Aucun étudiant trouvé.")
             return
         
         Console.titre("Liste des étudiants")
+        self._afficher_tableau_etudiants(etudiants)
+    
+    def parcourir_etudiants(self, taille_page: int = ETUDIANTS_PAR_PAGE) -> None:
+        """
+        Affiche tous les étudiants une page à la fois, triés par classe puis par nom
         
+        Args:
+            taille_page: Nombre d'étudiants par page
+        """
+        self.logger.info("Affichage paginé de tous les étudiants")
+        page = self.etudiant_service.lister_etudiants_page(taille_page, tri="classe")
+        numero = 1
+        
+        while True:
+            if not page["etudiants"]:
+                Console.info("Aucun étudiant trouvé.")
+                return
+            
+            Console.titre(f"Liste des étudiants - page {numero}")
+            self._afficher_tableau_etudiants(page["etudiants"])
+            
+            options = []
+            if page["page_suivante"]:
+                options.append("Page suivante")
+            if page["page_precedente"]:
+                options.append("Page précédente")
+            if not options:
+                return
+            options.append("Terminer")
+            
+            choix = Console.menu("Navigation", options)
+            if not choix.isdigit() or not 1 <= int(choix) <= len(options):
+                Console.erreur("Choix invalide.")
+                continue
+            
+            action = options[int(choix) - 1]
+            if action == "Page suivante":
+                page = self.etudiant_service.lister_etudiants_page(taille_page, apres=page["fin"], tri="classe")
+                numero += 1
+            elif action == "Page précédente":
+                page = self.etudiant_service.lister_etudiants_page(taille_page, avant=page["debut"], tri="classe")
+                numero -= 1
+            else:
+                return
+    
+    def _afficher_tableau_etudiants(self, etudiants: List[Union[Etudiant, EtudiantResume]]) -> None:
+        """Affiche des étudiants sous forme de tableau"""
         donnees = []
         for etudiant in etudiants:
             donnees.append({
@@ -121,38 +176,44 @@ class EtudiantController:
         Console.titre("Recherche d'étudiants")
         
         options = [
-            "Par nom",
-            "Par prénom",
+            "Par nom (début du nom)",
+            "Par prénom (début du prénom)",
             "Par téléphone",
-            "Par classe"
+            "Par classe (début de la classe)",
+            "Recherche approximative (nom et prénom)"
         ]
         
         choix = Console.menu("Type de recherche", options)
         
-        critere = {}
+        # Les résultats n'affichent pas le détail des notes
         if choix == "1":
             nom = Console.saisie("Nom", True)
-            critere = {"nom": {"$regex": nom, "$options": "i"}}
+            etudiants = self.etudiant_service.rechercher_par_prefixe("nom", nom, LIMITE_RECHERCHE)
             self.logger.info(f"Recherche d'étudiants par nom: {nom}")
         elif choix == "2":
             prenom = Console.saisie("Prénom", True)
-            critere = {"prenom": {"$regex": prenom, "$options": "i"}}
+            etudiants = self.etudiant_service.rechercher_par_prefixe("prenom", prenom, LIMITE_RECHERCHE)
             self.logger.info(f"Recherche d'étudiants par prénom: {prenom}")
         elif choix == "3":
             telephone = Console.saisie("Téléphone", True)
-            critere = {"telephone": telephone}
+            etudiants = self.etudiant_service.rechercher_resumes({"telephone": telephone})
             self.logger.info(f"Recherche d'étudiants par téléphone: {telephone}")
         elif choix == "4":
             classe = Console.saisie("Classe", True)
-            critere = {"classe": {"$regex": classe, "$options": "i"}}
+            etudiants = self.etudiant_service.rechercher_par_prefixe("classe", classe, LIMITE_RECHERCHE)
             self.logger.info(f"Recherche d'étudiants par classe: {classe}")
+        elif choix == "5":
+            texte = Console.saisie("Nom et/ou prénom", True)
+            etudiants = self.etudiant_service.rechercher_approximatif(texte, LIMITE_RECHERCHE)
+            self.logger.info(f"Recherche approximative d'étudiants: {texte}")
         else:
             Console.erreur("Choix invalide.")
             return
         
-        etudiants = self.etudiant_service.rechercher_etudiants(critere)
         self.logger.info(f"Résultat de recherche: {len(etudiants)} étudiant(s) trouvé(s)")
         self.afficher_etudiants(etudiants)
+        if len(etudiants) == LIMITE_RECHERCHE:
+            Console.info(f"Seuls les {LIMITE_RECHERCHE} premiers résultats sont affichés. Précisez la recherche.")
     
     def modifier_notes(self) -> None:
         """Interface de modification des notes d'un étudiant"""
@@ -239,7 +300,7 @@ class EtudiantController:
                         matiere = matieres[index]
                         
                         if Console.confirmation(f"Êtes-vous sûr de vouloir supprimer la note de {matiere}?"):
-                            del etudiant.notes[matiere]
+                            etudiant.supprimer_note(matiere)
                             
                             if self.etudiant_service.mettre_a_jour_etudiant(etudiant):
                                 Console.succes(f"Note supprimée avec succès. Nouvelle moyenne: {etudiant.moyenne:.2f}/20")
@@ -253,6 +314,9 @@ class EtudiantController:
         except ResourceNotFoundError as e:
             Console.erreur(f"Erreur: {e}")
             self.logger.warning(f"Tentative de modification de notes: {e}")
+        except VersionConflictError as e:
+            Console.erreur(f"{e}. Rechargez l'étudiant pour voir ses notes à jour.")
+            self.logger.warning(f"Conflit de modification des notes: {e}")
         except Exception as e:
             Console.erreur(f"Une erreur s'est produite: {e}")
             self.logger.error(f"Erreur lors de la modification des notes: {e}")
@@ -295,14 +359,15 @@ class EtudiantController:
         
         choix_etudiants = Console.menu("Sélection des étudiants", options_etudiants)
         
-        etudiants = None
+        critere = None
         if choix_etudiants == "2":
             classe = Console.saisie("Classe", True)
-            etudiants = self.etudiant_service.lister_etudiants_par_classe(classe)
-            if not etudiants:
+            critere = {"classe": classe}
+            nb_etudiants = self.etudiant_service.compter_etudiants(critere)
+            if not nb_etudiants:
                 Console.avertissement(f"Aucun étudiant trouvé pour la classe {classe}.")
                 return
-            self.logger.info(f"Exportation des étudiants de la classe {classe} ({len(etudiants)} étudiants)")
+            self.logger.info(f"Exportation des étudiants de la classe {classe} ({nb_etudiants} étudiants)")
         else:
             self.logger.info("Exportation de tous les étudiants")
         
@@ -315,20 +380,25 @@ class EtudiantController:
         
         choix_format = Console.menu("Format d'exportation", options_format)
         
-        chemin_fichier = Console.saisie("Nom du fichier (avec extension)", True)
+        chemin_fichier = Console.saisie("Nom du fichier (avec extension, .gz pour compresser)", True)
         
         try:
+            # CSV et JSON sont écrits en flux depuis MongoDB; Excel nécessite la liste complète,
+            # le PDF se contente des résumés (sans le détail des notes)
             if choix_format == "1":
-                chemin = self.export_import_service.exporter_csv(etudiants, chemin_fichier)
+                chemin = self.export_import_service.exporter_csv(chemin_fichier=chemin_fichier, critere=critere)
                 self.logger.info(f"Exportation CSV réussie: {chemin}")
             elif choix_format == "2":
-                chemin = self.export_import_service.exporter_json(etudiants, chemin_fichier)
+                ndjson = chemin_fichier.replace('.gz', '').endswith(('.ndjson', '.jsonl'))
+                chemin = self.export_import_service.exporter_json(chemin_fichier=chemin_fichier, critere=critere,
+                                                                  ndjson=ndjson)
                 self.logger.info(f"Exportation JSON réussie: {chemin}")
             elif choix_format == "3":
+                etudiants = self.etudiant_service.rechercher_etudiants(critere) if critere else None
                 chemin = self.export_import_service.exporter_excel(etudiants, chemin_fichier)
                 self.logger.info(f"Exportation Excel réussie: {chemin}")
             elif choix_format == "4":
-                chemin = self.export_import_service.exporter_pdf(etudiants, chemin_fichier)
+                chemin = self.export_import_service.exporter_pdf(chemin_fichier=chemin_fichier, critere=critere)
                 self.logger.info(f"Exportation PDF réussie: {chemin}")
             else:
                 Console.erreur("Format non supporté.")
@@ -355,24 +425,34 @@ class EtudiantController:
         
         try:
             if choix_format == "1":
-                count = self.export_import_service.importer_csv(chemin_fichier)
+                rapport = self.export_import_service.importer_csv(chemin_fichier)
                 format_nom = "CSV"
             elif choix_format == "2":
-                count = self.export_import_service.importer_json(chemin_fichier)
+                rapport = self.export_import_service.importer_json(chemin_fichier)
                 format_nom = "JSON"
             elif choix_format == "3":
-                count = self.export_import_service.importer_excel(chemin_fichier)
+                rapport = self.export_import_service.importer_excel(chemin_fichier)
                 format_nom = "Excel"
             else:
                 Console.erreur("Format non supporté.")
                 return
             
+            count = len(rapport["inseres"])
             if count > 0:
                 Console.succes(f"{count} étudiant(s) importé(s) avec succès.")
                 self.logger.info(f"Importation {format_nom} réussie: {count} étudiant(s) importé(s) depuis {chemin_fichier}")
             else:
                 Console.avertissement("Aucun étudiant importé.")
                 self.logger.warning(f"Importation {format_nom} sans données: {chemin_fichier}")
+            
+            if rapport["doublons"]:
+                Console.avertissement(f"{len(rapport['doublons'])} doublon(s) de téléphone ignoré(s).")
+                self.logger.warning(f"Importation {format_nom}: {len(rapport['doublons'])} doublon(s) ignoré(s)")
+            
+            if rapport["invalides"]:
+                Console.avertissement(f"{len(rapport['invalides'])} ligne(s) invalide(s) ignorée(s):")
+                Console.tableau(rapport["invalides"])
+                self.logger.warning(f"Importation {format_nom}: {len(rapport['invalides'])} ligne(s) invalide(s)")
                 
         except FileNotFoundError:
             Console.erreur(f"Le fichier {chemin_fichier} n'existe pas.")
@@ -381,38 +461,198 @@ class EtudiantController:
             Console.erreur(f"Erreur lors de l'importation: {e}")
             self.logger.error(f"Erreur lors de l'importation depuis {chemin_fichier}: {e}")
     
+    def reconstruire_classement(self) -> None:
+        """Interface de reconstruction du classement Redis à partir de MongoDB"""
+        Console.titre("Reconstruction du classement")
+        
+        try:
+            nombre = self.etudiant_service.reconstruire_classement()
+            Console.succes(f"Classement reconstruit: {nombre} étudiant(s) classé(s).")
+            self.logger.info(f"Reconstruction du classement: {nombre} étudiant(s)")
+        except Exception as e:
+            Console.erreur(f"Erreur lors de la reconstruction du classement: {e}")
+            self.logger.error(f"Erreur lors de la reconstruction du classement: {e}")
+    
+    def indexer_recherche(self) -> None:
+        """Interface de renseignement des champs de recherche des étudiants existants"""
+        Console.titre("Indexation de la recherche")
+        
+        try:
+            nombre = self.etudiant_service.indexer_recherche()
+            Console.succes(f"Champs de recherche renseignés pour {nombre} étudiant(s).")
+            self.logger.info(f"Indexation de la recherche: {nombre} étudiant(s)")
+        except Exception as e:
+            Console.erreur(f"Erreur lors de l'indexation de la recherche: {e}")
+            self.logger.error(f"Erreur lors de l'indexation de la recherche: {e}")
+    
+    def afficher_utilisation_index(self) -> None:
+        """Affiche le nombre d'utilisations de chaque index MongoDB depuis le démarrage du serveur"""
+        Console.titre("Utilisation des index")
+        
+        try:
+            rapport = self.etudiant_service.rapport_utilisation_index()
+            if not rapport:
+                Console.avertissement("Statistiques d'index indisponibles.")
+                return
+            
+            Console.tableau([
+                {
+                    "Collection": ligne["collection"],
+                    "Index": ligne["index"],
+                    "Utilisations": ligne["utilisations"],
+                    "Depuis": ligne["depuis"].strftime("%d/%m/%Y %H:%M") if ligne["depuis"] else "-"
+                }
+                for ligne in rapport
+            ])
+            inutilises = [f"{ligne['collection']}.{ligne['index']}" for ligne in rapport if not ligne["utilisations"]]
+            if inutilises:
+                Console.info(f"Index jamais utilisés: {', '.join(inutilises)}")
+        except Exception as e:
+            Console.erreur(f"Erreur lors de la lecture de l'utilisation des index: {e}")
+            self.logger.error(f"Erreur lors de la lecture de l'utilisation des index: {e}")
+    
+    def verifier_statistiques_classe(self) -> None:
+        """Interface de vérification des statistiques de classe matérialisées"""
+        Console.titre("Vérification des statistiques de classe")
+        
+        try:
+            corriger = Console.confirmation("Corriger automatiquement les écarts détectés?")
+            ecarts = self.etudiant_service.statistiques_classe.verifier(corriger=corriger)
+            
+            if ecarts:
+                Console.avertissement(f"{len(ecarts)} écart(s) détecté(s):")
+                Console.tableau([
+                    {
+                        "Classe": ecart["classe"],
+                        "Champ": ecart["champ"],
+                        "Attendu": ecart["attendu"],
+                        "Stocké": ecart["stocke"]
+                    }
+                    for ecart in ecarts
+                ])
+            else:
+                Console.succes("Aucun écart détecté.")
+            
+            if corriger:
+                Console.succes("Statistiques de classe reconstruites.")
+            self.logger.info(f"Vérification des statistiques de classe: {len(ecarts)} écart(s), correction: {corriger}")
+        except Exception as e:
+            Console.erreur(f"Erreur lors de la vérification des statistiques: {e}")
+            self.logger.error(f"Erreur lors de la vérification des statistiques de classe: {e}")
+    
+    def afficher_statistiques_cache(self) -> None:
+        """Affiche les métriques du cache Redis des étudiants"""
+        Console.titre("Statistiques du cache")
+        
+        try:
+            stats = self.etudiant_service.cache.statistiques()
+            entite = stats["entite"]
+            Console.tableau([
+                {"Niveau": "Étudiants (ce processus)", "Hits": entite["hits"], "Misses": entite["misses"],
+                 "Taux de hits": f"{entite['taux_hits']:.1%}", "Évictions": "-"},
+                {"Niveau": "Cache local", "Hits": stats["local"]["hits"], "Misses": stats["local"]["misses"],
+                 "Taux de hits": f"{stats['local']['taux_hits']:.1%}", "Évictions": stats["local"]["evictions"]},
+                {"Niveau": "Serveur Redis", "Hits": stats["redis"]["hits"], "Misses": stats["redis"]["misses"],
+                 "Taux de hits": "-", "Évictions": stats["redis"]["evictions"]}
+            ])
+            Console.info(f"Hits négatifs (téléphones inconnus): {entite['hits_negatifs']}, "
+                         f"chargements depuis MongoDB: {entite['chargements']}, "
+                         f"attentes d'un chargement en cours: {entite['attentes']}, "
+                         f"invalidations: {entite['invalidations']}, "
+                         f"expirations Redis: {stats['redis']['expirations']}")
+        except Exception as e:
+            Console.erreur(f"Erreur lors de la lecture des statistiques du cache: {e}")
+            self.logger.error(f"Erreur lors de la lecture des statistiques du cache: {e}")
+    
+    def afficher_classement(self) -> None:
+        """Interface de consultation du classement: rang d'un étudiant ou étudiants d'une tranche de moyenne"""
+        Console.titre("Classement")
+        
+        choix = Console.menu("Consulter", [
+            "Rang d'un étudiant",
+            "Étudiants par tranche de moyenne"
+        ])
+        
+        if choix == "1":
+            telephone = Console.saisie("Téléphone de l'étudiant", True)
+            etudiant = self.etudiant_service.obtenir_etudiant_par_telephone(telephone)
+            if not etudiant:
+                Console.erreur(f"Aucun étudiant avec le téléphone {telephone}.")
+                return
+            
+            Console.info(f"{etudiant.prenom} {etudiant.nom} - moyenne {etudiant.moyenne:.2f}/20")
+            rang = self.etudiant_service.rang_etudiant(etudiant._id)
+            Console.info(f"Rang dans l'établissement: {Console.couleur(str(rang), Couleur.GRAS)}")
+            if etudiant.classe:
+                rang_classe = self.etudiant_service.rang_etudiant(etudiant._id, etudiant.classe)
+                Console.info(f"Rang dans la classe {etudiant.classe}: {Console.couleur(str(rang_classe), Couleur.GRAS)}")
+            self.logger.info(f"Consultation du rang de l'étudiant {etudiant._id}")
+        elif choix == "2":
+            try:
+                minimum = float(Console.saisie("Moyenne minimale (incluse)", True))
+                maximum = float(Console.saisie("Moyenne maximale (exclue)", True))
+            except ValueError:
+                Console.erreur("Veuillez entrer des nombres valides.")
+                return
+            classe = Console.saisie("Classe (laisser vide pour tout l'établissement)", False) or None
+            
+            etudiants = self.etudiant_service.etudiants_entre(minimum, maximum, classe, LIMITE_RECHERCHE)
+            self.afficher_etudiants(etudiants)
+            if len(etudiants) == LIMITE_RECHERCHE:
+                Console.info(f"Seuls les {LIMITE_RECHERCHE} premiers résultats sont affichés. Précisez la tranche.")
+            self.logger.info(f"Consultation des étudiants de moyenne [{minimum}, {maximum}[ ({classe or 'toutes classes'})")
+        else:
+            Console.erreur("Choix invalide.")
+    
+    def afficher_statistiques_classe(self) -> None:
+        """Affiche les statistiques détaillées d'une classe"""
+        classe = Console.saisie("Classe", True)
+        
+        try:
+            stats = self.etudiant_service.statistiques_de_classe(classe)
+        except Exception as e:
+            Console.erreur(f"Erreur lors du calcul des statistiques de la classe {classe}: {e}")
+            self.logger.error(f"Erreur lors du calcul des statistiques de la classe {classe}: {e}")
+            return
+        
+        if not stats["nombre"]:
+            Console.info(f"Aucun étudiant dans la classe {classe}.")
+            return
+        
+        Console.titre(f"Statistiques de la classe {classe}")
+        Console.info(f"Nombre d'étudiants: {Console.couleur(str(stats['nombre']), Couleur.VERT)}")
+        Console.info(f"Nombre d'étudiants avec notes: {Console.couleur(str(stats['nb_avec_notes']), Couleur.VERT)}")
+        moyenne_classe = stats["moyenne_avec_notes"]
+        Console.info(f"Moyenne de classe: {Console.couleur(f'{moyenne_classe:.2f}/20', Couleur.GRAS)}")
+        
+        if stats["matieres"]:
+            Console.titre("Par matière", niveau=2)
+            Console.tableau([
+                {
+                    "Matière": matiere,
+                    "Notes": valeurs["nombre"],
+                    "Moyenne": f"{valeurs['moyenne']:.2f}",
+                    "Min": valeurs["min"],
+                    "Max": valeurs["max"]
+                }
+                for matiere, valeurs in sorted(stats["matieres"].items())
+            ])
+        
+        self.logger.info(f"Consultation des statistiques de la classe {classe}")
+    
     def afficher_statistiques(self) -> None:
         """Affiche des statistiques sur les étudiants"""
         Console.titre("Statistiques des étudiants")
         
-        # Compter le nombre total d'étudiants
-        etudiants = self.etudiant_service.lister_etudiants()
-        nb_total = len(etudiants)
+        # Toutes les statistiques sont calculées par MongoDB en une seule agrégation
+        stats = self.statistiques_service.calculer_statistiques()
+        nb_total = stats["nb_total"]
+        nb_avec_notes = stats["nb_avec_notes"]
         
         if nb_total == 0:
             Console.info("Aucun étudiant enregistré dans le système.")
             return
         
-        # Calculer des statistiques
-        classes = {}
-        nb_avec_notes = 0
-        somme_moyennes = 0
-        moyennes_par_classe = {}
-        
-        for etudiant in etudiants:
-            # Compter par classe
-            if etudiant.classe in classes:
-                classes[etudiant.classe] += 1
-            else:
-                classes[etudiant.classe] = 1
-                moyennes_par_classe[etudiant.classe] = []
-            
-            # Statistiques sur les notes
-            if etudiant.notes:
-                nb_avec_notes += 1
-                somme_moyennes += etudiant.moyenne
-                moyennes_par_classe[etudiant.classe].append(etudiant.moyenne)
-        
         # Afficher le nombre d'étudiants
         Console.info(f"Nombre total d'étudiants: {Console.couleur(str(nb_total), Couleur.VERT)}")
         Console.info(f"Nombre d'étudiants avec notes: {Console.couleur(str(nb_avec_notes), Couleur.VERT)} ({nb_avec_notes/nb_total*100:.1f}%)")
@@ -421,11 +661,11 @@ class EtudiantController:
         Console.titre("Répartition par classe", niveau=2)
         
         donnees_classes = []
-        for classe, nombre in classes.items():
+        for classe in stats["classes"]:
             donnees_classes.append({
-                "Classe": classe,
-                "Nombre d'étudiants": nombre,
-                "Pourcentage": f"{nombre/nb_total*100:.1f}%"
+                "Classe": classe["classe"],
+                "Nombre d'étudiants": classe["nombre"],
+                "Pourcentage": f"{classe['nombre']/nb_total*100:.1f}%"
             })
         
         Console.tableau(donnees_classes)
@@ -434,40 +674,38 @@ class EtudiantController:
         if nb_avec_notes > 0:
             Console.titre("Statistiques de moyenne", niveau=2)
             
-            moyenne_generale = somme_moyennes / nb_avec_notes
+            moyenne_generale = stats["moyenne_generale"]
             Console.info(f"Moyenne générale: {Console.couleur(f'{moyenne_generale:.2f}/20', Couleur.GRAS)}")
             
             # Statistiques par classe
             donnees_moyennes = []
-            for classe, moyennes in moyennes_par_classe.items():
-                if moyennes:
-                    moy_classe = sum(moyennes) / len(moyennes)
+            for classe in stats["classes"]:
+                if classe["nb_avec_notes"]:
                     donnees_moyennes.append({
-                        "Classe": classe,
-                        "Nombre d'étudiants avec notes": len(moyennes),
-                        "Moyenne de classe": f"{moy_classe:.2f}/20"
+                        "Classe": classe["classe"],
+                        "Nombre d'étudiants avec notes": classe["nb_avec_notes"],
+                        "Moyenne de classe": f"{classe['moyenne']:.2f}/20"
                     })
             
             if donnees_moyennes:
                 Console.tableau(donnees_moyennes)
             
             # Afficher la répartition des résultats
-            nb_insuffisant = sum(1 for e in etudiants if e.notes and e.moyenne < 10)
-            nb_passable = sum(1 for e in etudiants if e.notes and 10 <= e.moyenne < 12)
-            nb_assez_bien = sum(1 for e in etudiants if e.notes and 12 <= e.moyenne < 14)
-            nb_bien = sum(1 for e in etudiants if e.notes and 14 <= e.moyenne < 16)
-            nb_tres_bien = sum(1 for e in etudiants if e.notes and e.moyenne >= 16)
+            mentions = stats["mentions"]
             
             Console.titre("Répartition des moyennes", niveau=2)
             
             donnees_repartition = [
-                {"Mention": Console.couleur("Très bien", Couleur.VERT), "Nombre": nb_tres_bien, "Pourcentage": f"{nb_tres_bien/nb_avec_notes*100:.1f}%"},
-                {"Mention": Console.couleur("Bien", Couleur.VERT), "Nombre": nb_bien, "Pourcentage": f"{nb_bien/nb_avec_notes*100:.1f}%"},
-                {"Mention": Console.couleur("Assez bien", Couleur.CYAN), "Nombre": nb_assez_bien, "Pourcentage": f"{nb_assez_bien/nb_avec_notes*100:.1f}%"},
-                {"Mention": Console.couleur("Passable", Couleur.JAUNE), "Nombre": nb_passable, "Pourcentage": f"{nb_passable/nb_avec_notes*100:.1f}%"},
-                {"Mention": Console.couleur("Insuffisant", Couleur.ROUGE), "Nombre": nb_insuffisant, "Pourcentage": f"{nb_insuffisant/nb_avec_notes*100:.1f}%"}
+                {"Mention": Console.couleur(libelle, couleur), "Nombre": mentions[cle], "Pourcentage": f"{mentions[cle]/nb_avec_notes*100:.1f}%"}
+                for cle, libelle, couleur in [
+                    ("tres_bien", "Très bien", Couleur.VERT),
+                    ("bien", "Bien", Couleur.VERT),
+                    ("assez_bien", "Assez bien", Couleur.CYAN),
+                    ("passable", "Passable", Couleur.JAUNE),
+                    ("insuffisant", "Insuffisant", Couleur.ROUGE)
+                ]
             ]
             
             Console.tableau(donnees_repartition)
             
-        self.logger.info("Consultation des statistiques des étudiants") 
\ No newline at end of file
+        self.logger.info("Consultation des statistiques des étudiants")
\ No newline at end of file
@@ -1,11 +1,15 @@
 from typing import List, Dict, Any, Optional
+import os
 import re
 
 from src.models.utilisateur import Utilisateur, Role
 from src.services.utilisateur_service import UtilisateurService
+from src.services.etudiant.etudiant_service import EtudiantService
+from src.services.export_import_service import ExportImportService
+from src.services.limiteur_service import LimiteurService
 from src.utils.console.console import Console, Couleur
 from src.utils.logger import Logger
-from src.utils.exception.exceptions import ValidationError, ResourceNotFoundError, AuthenticationError
+from src.utils.exception.exceptions import ValidationError, ResourceNotFoundError, AuthenticationError, RateLimitError
 
 class UtilisateurController:
     """Contrôleur pour gérer les interactions liées aux utilisateurs"""
@@ -13,6 +17,8 @@ class UtilisateurController:
     def __init__(self):
         """Initialise le contrôleur avec les services nécessaires"""
         self.utilisateur_service = UtilisateurService()
+        self.etudiant_service = EtudiantService()
+        self.export_import_service = ExportImportService()
         self.logger = Logger.get_instance()
     
     def creer_utilisateur(self) -> Optional[str]:
@@ -87,6 +93,50 @@ class UtilisateurController:
             self.logger.error(f"Erreur lors de la création d'un utilisateur: {e}")
             return None
     
+    def provisionner_comptes_classe(self) -> bool:
+        """
+        Interface de création des comptes de tous les étudiants d'une classe
+        
+        Returns:
+            True si des comptes ont été créés, False sinon
+        """
+        Console.titre("Création des comptes d'une classe")
+        
+        classe = Console.saisie("Classe", True)
+        sortie = Console.saisie("Fichier des identifiants", False) or f"identifiants_{classe}.csv"
+        
+        # Vérifié avant toute création: les mots de passe ne pourraient plus être exportés
+        if os.path.exists(sortie):
+            Console.erreur(f"Le fichier {sortie} existe déjà. Choisissez un autre fichier.")
+            return False
+        
+        identifiants = None
+        try:
+            # Les identifiants de chaque lot sont écrits dès l'insertion de ses comptes
+            etudiants = self.etudiant_service.iterer_etudiants({"classe": classe})
+            with self.export_import_service.ouvrir_identifiants(sortie) as identifiants:
+                rapport = self.utilisateur_service.provisionner_etudiants(etudiants, enregistrer=identifiants.ecrire)
+            
+            if not rapport["crees"]:
+                Console.info(f"Aucun compte à créer ({len(rapport['existants'])} étudiant(s) ont déjà un compte).")
+                return False
+            
+            Console.succes(f"{len(rapport['crees'])} compte(s) créé(s), identifiants dans {sortie}")
+            if rapport["existants"]:
+                Console.info(f"{len(rapport['existants'])} étudiant(s) avaient déjà un compte.")
+            if rapport["conflits"]:
+                Console.avertissement(f"{len(rapport['conflits'])} compte(s) non créé(s): nom d'utilisateur indisponible.")
+            self.logger.info(f"Comptes créés pour la classe {classe}: {len(rapport['crees'])} (identifiants: {sortie})")
+            return True
+            
+        except Exception as e:
+            Console.erreur(f"Erreur lors de la création des comptes: {e}")
+            self.logger.error(f"Erreur lors de la création des comptes de la classe {classe}: {e}")
+            if identifiants is not None and identifiants.nombre:
+                Console.avertissement(f"{identifiants.nombre} compte(s) créé(s) avant l'erreur, identifiants dans {sortie}")
+                return True
+            return False
+    
     def afficher_utilisateurs(self, utilisateurs: Optional[List[Utilisateur]] = None) -> None:
         """
         Affiche une liste d'utilisateurs sous forme de tableau
@@ -144,6 +194,10 @@ class UtilisateurController:
             else:
                 raise AuthenticationError()
                 
+        except RateLimitError as e:
+            Console.erreur(e.message)
+            self.logger.warning(f"Tentative d'authentification refusée (limite atteinte) pour l'utilisateur: {username}")
+            return None
         except AuthenticationError:
             Console.erreur("Échec de l'authentification. Nom d'utilisateur ou mot de passe incorrect.")
             self.logger.warning(f"Tentative d'authentification échouée pour l'utilisateur: {username}")
@@ -201,8 +255,12 @@ class UtilisateurController:
                         break
                     Console.erreur("Les mots de passe ne correspondent pas.")
                 
-                self.utilisateur_service.changer_mot_de_passe(utilisateur._id, password)
+                # Le mot de passe est enregistré seul (et les sessions de l'utilisateur fermées)
+                if not self.utilisateur_service.changer_mot_de_passe(utilisateur._id, password):
+                    raise ResourceNotFoundError("utilisateur", "nom d'utilisateur", username)
+                Console.succes("Mot de passe modifié, toutes les sessions de l'utilisateur ont été fermées.")
                 self.logger.info(f"Modification du mot de passe pour l'utilisateur {utilisateur._id} ({utilisateur.username})")
+                return True
                 
             elif choix == "3":
                 options_role = [
@@ -292,6 +350,20 @@ class UtilisateurController:
             self.logger.error(f"Erreur lors de la suppression d'un utilisateur: {e}")
             return False
     
+    def afficher_statistiques_connexions(self) -> None:
+        """Affiche les compteurs de la limitation des tentatives de connexion"""
+        Console.titre("Statistiques des connexions")
+        
+        stats = LimiteurService.statistiques()
+        Console.tableau([
+            {"Tentatives": stats["tentatives"], "Acceptées": stats["acceptees"], "Rejetées": stats["rejetees"],
+             "Taux de rejet": f"{stats['taux_rejet']:.1%}"}
+        ])
+        Console.info(f"Rejets par nom d'utilisateur: {stats['rejetees_username']}, "
+                     f"rejets par client: {stats['rejetees_client']}, "
+                     f"limitations en mémoire (Redis indisponible): {stats['repli_memoire']}")
+        Console.info("Compteurs de ce processus depuis son démarrage.")
+    
     def afficher_utilisateurs_par_role(self) -> None:
         """Interface d'affichage des utilisateurs par rôle"""
         Console.titre("Affichage des utilisateurs par rôle")
@@ -21,6 +21,12 @@ class GestionEtudiantsApp:
         self.session = None
         self.logger = Logger.get_instance()
         
+    def deconnecter(self):
+        """Ferme la session courante (dans Redis) et revient au menu principal"""
+        self.logger.info(f"Déconnexion: {self.session['utilisateur']['username']}")
+        self.utilisateur_controller.utilisateur_service.deconnecter(self.session['token'])
+        self.session = None
+        
     def afficher_en_tete(self):
         """Affiche l'en-tête de l'application"""
         Console.effacer_ecran()
@@ -97,8 +103,7 @@ class GestionEtudiantsApp:
             elif choix == "2":
                 self.menu_gestion_utilisateurs()
             elif choix == "3":
-                self.logger.info(f"Déconnexion: {self.session['utilisateur']['username']}")
-                self.session = None
+                self.deconnecter()
                 break
             elif choix == "4":
                 Console.succes("Au revoir!")
@@ -117,6 +122,7 @@ class GestionEtudiantsApp:
                 "Consulter les étudiants",
                 "Gérer les notes",
                 "Statistiques",
+                "Statistiques d'une classe",
                 "Se déconnecter",
                 "Quitter"
             ])
@@ -131,10 +137,12 @@ class GestionEtudiantsApp:
                 self.etudiant_controller.afficher_statistiques()
                 Console.pause()
             elif choix == "4":
-                self.logger.info(f"Déconnexion: {self.session['utilisateur']['username']}")
-                self.session = None
-                break
+                self.etudiant_controller.afficher_statistiques_classe()
+                Console.pause()
             elif choix == "5":
+                self.deconnecter()
+                break
+            elif choix == "6":
                 Console.succes("Au revoir!")
                 self.logger.info("Fermeture de l'application")
                 exit(0)
@@ -185,8 +193,7 @@ class GestionEtudiantsApp:
                     Console.avertissement("Aucun étudiant associé à votre compte.")
                 Console.pause()
             elif choix == "2":
-                self.logger.info(f"Déconnexion: {self.session['utilisateur']['username']}")
-                self.session = None
+                self.deconnecter()
                 break
             elif choix == "3":
                 Console.succes("Au revoir!")
@@ -231,6 +238,9 @@ class GestionEtudiantsApp:
                 "Exporter les données",
                 "Importer des données",
                 "Statistiques",
+                "Statistiques d'une classe",
+                "Classement",
+                "Maintenance",
                 "Retour"
             ])
             
@@ -259,6 +269,49 @@ class GestionEtudiantsApp:
                 self.etudiant_controller.afficher_statistiques()
                 Console.pause()
             elif choix == "9":
+                self.etudiant_controller.afficher_statistiques_classe()
+                Console.pause()
+            elif choix == "10":
+                self.etudiant_controller.afficher_classement()
+                Console.pause()
+            elif choix == "11":
+                self.menu_maintenance()
+            elif choix == "12":
+                break
+            else:
+                Console.erreur("Choix invalide.")
+                Console.pause()
+    
+    def menu_maintenance(self):
+        """Affiche le menu de maintenance des données dérivées (classement, statistiques, recherche, cache, index)"""
+        while True:
+            self.afficher_en_tete()
+            
+            choix = Console.menu("MAINTENANCE", [
+                "Reconstruire le classement",
+                "Vérifier les statistiques de classe",
+                "Indexer la recherche des étudiants existants",
+                "Statistiques du cache",
+                "Utilisation des index",
+                "Retour"
+            ])
+            
+            if choix == "1":
+                self.etudiant_controller.reconstruire_classement()
+                Console.pause()
+            elif choix == "2":
+                self.etudiant_controller.verifier_statistiques_classe()
+                Console.pause()
+            elif choix == "3":
+                self.etudiant_controller.indexer_recherche()
+                Console.pause()
+            elif choix == "4":
+                self.etudiant_controller.afficher_statistiques_cache()
+                Console.pause()
+            elif choix == "6":
+                self.etudiant_controller.afficher_utilisation_index()
+                Console.pause()
+            elif choix == "7":
                 break
             else:
                 Console.erreur("Choix invalide.")
@@ -271,10 +324,12 @@ class GestionEtudiantsApp:
             
             choix = Console.menu("GESTION DES UTILISATEURS", [
                 "Créer un utilisateur",
+                "Créer les comptes d'une classe",
                 "Afficher tous les utilisateurs",
                 "Afficher par rôle",
                 "Modifier un utilisateur",
                 "Supprimer un utilisateur",
+                "Statistiques des connexions",
                 "Retour"
             ])
             
@@ -282,18 +337,24 @@ class GestionEtudiantsApp:
                 self.utilisateur_controller.creer_utilisateur()
                 Console.pause()
             elif choix == "2":
-                self.utilisateur_controller.afficher_utilisateurs()
+                self.utilisateur_controller.provisionner_comptes_classe()
                 Console.pause()
             elif choix == "3":
-                self.utilisateur_controller.afficher_utilisateurs_par_role()
+                self.utilisateur_controller.afficher_utilisateurs()
                 Console.pause()
             elif choix == "4":
-                self.utilisateur_controller.modifier_utilisateur()
+                self.utilisateur_controller.afficher_utilisateurs_par_role()
                 Console.pause()
             elif choix == "5":
-                self.utilisateur_controller.supprimer_utilisateur()
+                self.utilisateur_controller.modifier_utilisateur()
                 Console.pause()
             elif choix == "6":
+                self.utilisateur_controller.supprimer_utilisateur()
+                Console.pause()
+            elif choix == "7":
+                self.utilisateur_controller.afficher_statistiques_connexions()
+                Console.pause()
+            elif choix == "8":
                 break
             else:
                 Console.erreur("Choix invalide.")
@@ -0,0 +1,205 @@
+from typing import Dict, List, Any, Iterable, Optional
+import warnings
+import numpy as np
+
+from src.services.etudiant.agregation import MENTIONS
+
+# Bornes inférieures et noms des mentions, dans l'ordre croissant (règle unique: agregation.MENTIONS)
+BORNES_MENTIONS = sorted(MENTIONS)
+NOMS_MENTIONS = [MENTIONS[borne] for borne in BORNES_MENTIONS]
+
+# Les notes sont stockées en float32 (erreur inférieure à 1e-6 entre 0 et 20): elles sont
+# relues en float64 arrondies à PRECISION_NOTES décimales, ce qui restitue les notes saisies
+PRECISION_NOTES = 5
+
+# Décimales des moyennes et statistiques calculées: une moyenne tombant exactement sur une
+# borne de mention (ex: 10) n'en est pas écartée par l'erreur d'arrondi des flottants
+PRECISION_MOYENNES = 6
+
+class ClasseFrame:
+    """
+    Représentation en colonnes des notes d'un ensemble d'étudiants
+
+    Les notes sont stockées dans une matrice float32 dense (étudiants x matières) où
+    les notes absentes valent NaN, ce qui permet des calculs vectorisés avec NumPy au
+    lieu de boucles Python sur des objets Etudiant.
+    """
+
+    def __init__(self, ids: np.ndarray, classes: np.ndarray, matieres: List[str], notes: np.ndarray):
+        """
+        Initialise la structure
+
+        Args:
+            ids: Tableau des IDs des étudiants (n)
+            classes: Tableau des classes des étudiants (n)
+            matieres: Liste des matières (m), dans l'ordre des colonnes
+            notes: Matrice float32 (n x m) des notes, NaN pour une note absente
+        """
+        self.ids = ids
+        self.classes = classes
+        self.matieres = matieres
+        self.index_matieres = {matiere: i for i, matiere in enumerate(matieres)}
+        self.notes = notes
+        self.masque = ~np.isnan(notes)
+
+    @classmethod
+    def depuis_documents(cls, documents: Iterable[Dict[str, Any]]) -> 'ClasseFrame':
+        """
+        Construit la structure à partir de documents MongoDB (_id, classe, notes)
+
+        Args:
+            documents: Documents étudiants, typiquement un curseur MongoDB
+
+        Returns:
+            La structure en colonnes
+        """
+        ids, classes = [], []
+        lignes, colonnes, valeurs = [], [], []
+        index_matieres = {}
+
+        for ligne, data in enumerate(documents):
+            ids.append(str(data["_id"]))
+            classes.append(data.get("classe"))
+            for matiere, note in (data.get("notes") or {}).items():
+                colonne = index_matieres.setdefault(matiere, len(index_matieres))
+                lignes.append(ligne)
+                colonnes.append(colonne)
+                valeurs.append(note)
+
+        notes = np.full((len(ids), len(index_matieres)), np.nan, dtype=np.float32)
+        if valeurs:
+            notes[np.array(lignes), np.array(colonnes)] = np.array(valeurs, dtype=np.float32)
+
+        return cls(
+            np.array(ids, dtype=object),
+            np.array(classes, dtype=object),
+            list(index_matieres),
+            notes
+        )
+
+    @classmethod
+    def depuis_etudiants(cls, etudiants: Iterable[Any]) -> 'ClasseFrame':
+        """
+        Construit la structure à partir d'objets Etudiant déjà chargés
+
+        Args:
+            etudiants: Les étudiants (avec leur _id), dans l'ordre des lignes
+
+        Returns:
+            La structure en colonnes
+        """
+        return cls.depuis_documents(
+            {"_id": etudiant._id, "classe": etudiant.classe, "notes": etudiant.notes} for etudiant in etudiants
+        )
+
+    def __len__(self) -> int:
+        """Nombre d'étudiants"""
+        return len(self.ids)
+
+    def filtrer_classe(self, classe: str) -> 'ClasseFrame':
+        """
+        Retourne la sous-structure des étudiants d'une classe
+
+        Args:
+            classe: La classe
+
+        Returns:
+            Une nouvelle structure (les matières sans aucune note dans la classe sont conservées)
+        """
+        selection = self.classes == classe
+        return ClasseFrame(self.ids[selection], self.classes[selection], self.matieres, self.notes[selection])
+
+    def _notes_float64(self) -> np.ndarray:
+        """Matrice des notes en float64, telles que saisies (NaN pour une note absente)"""
+        return np.round(self.notes.astype(np.float64), PRECISION_NOTES)
+
+    def nombre_notes(self) -> np.ndarray:
+        """Nombre de notes de chaque étudiant"""
+        return self.masque.sum(axis=1)
+
+    def moyennes(self) -> np.ndarray:
+        """Moyenne de chaque étudiant (0 s'il n'a aucune note, comme Etudiant.moyenne)"""
+        nombre = self.nombre_notes()
+        sommes = np.where(self.masque, self._notes_float64(), 0).sum(axis=1)
+        moyennes = np.divide(sommes, nombre, out=np.zeros(len(self), dtype=np.float64), where=nombre > 0)
+        return np.round(moyennes, PRECISION_MOYENNES)
+
+    def statistiques_matieres(self) -> Dict[str, Dict[str, float]]:
+        """
+        Statistiques de chaque matière sur les notes présentes
+
+        Returns:
+            Dictionnaire {matiere: {nombre, moyenne, ecart_type, min, max}}
+        """
+        notes = self._notes_float64()
+        nombre = self.masque.sum(axis=0)
+        with warnings.catch_warnings():
+            # Matière sans note dans la sélection: résultats NaN attendus
+            warnings.simplefilter("ignore", category=RuntimeWarning)
+            moyennes = np.nanmean(notes, axis=0)
+            ecarts_types = np.nanstd(notes, axis=0)
+            minimums = np.nanmin(notes, axis=0) if len(self) else np.full(len(self.matieres), np.nan)
+            maximums = np.nanmax(notes, axis=0) if len(self) else np.full(len(self.matieres), np.nan)
+
+        return {
+            matiere: {
+                "nombre": int(nombre[i]),
+                "moyenne": round(float(moyennes[i]), PRECISION_MOYENNES),
+                "ecart_type": round(float(ecarts_types[i]), PRECISION_MOYENNES),
+                "min": float(minimums[i]),
+                "max": float(maximums[i])
+            }
+            for i, matiere in enumerate(self.matieres)
+            if nombre[i] > 0
+        }
+
+    def rangs(self, moyennes: Optional[np.ndarray] = None) -> np.ndarray:
+        """
+        Rang de chaque étudiant par moyenne décroissante (1 = meilleur, ex aequo au même rang)
+
+        Args:
+            moyennes: Moyennes déjà calculées (optionnel)
+
+        Returns:
+            Tableau des rangs
+        """
+        if moyennes is None:
+            moyennes = self.moyennes()
+        triees = np.sort(moyennes)
+        # Rang = 1 + nombre d'étudiants ayant une moyenne strictement supérieure
+        return len(moyennes) - np.searchsorted(triees, moyennes, side="right") + 1
+
+    def ordre(self, moyennes: Optional[np.ndarray] = None) -> np.ndarray:
+        """
+        Indices des étudiants par moyenne décroissante (ordre des lignes entre ex aequo)
+
+        Args:
+            moyennes: Moyennes déjà calculées (optionnel)
+
+        Returns:
+            Tableau d'indices de lignes
+        """
+        if moyennes is None:
+            moyennes = self.moyennes()
+        return np.argsort(-moyennes, kind="stable")
+
+    def mentions(self, moyennes: Optional[np.ndarray] = None) -> np.ndarray:
+        """
+        Indice de mention de chaque étudiant dans NOMS_MENTIONS (-1 s'il n'a aucune note)
+
+        Args:
+            moyennes: Moyennes déjà calculées (optionnel)
+
+        Returns:
+            Tableau d'indices de mention
+        """
+        if moyennes is None:
+            moyennes = self.moyennes()
+        indices = np.digitize(moyennes, BORNES_MENTIONS[1:])
+        return np.where(self.nombre_notes() > 0, indices, -1)
+
+    def repartition_mentions(self) -> Dict[str, int]:
+        """Nombre d'étudiants (ayant des notes) par mention"""
+        mentions = self.mentions()
+        comptes = np.bincount(mentions[mentions >= 0], minlength=len(NOMS_MENTIONS))
+        return {nom: int(comptes[i]) for i, nom in enumerate(NOMS_MENTIONS)}
@@ -1,12 +1,54 @@
-from typing import Dict, List, Optional, Any
+from typing import Dict, List, Optional, Any, Mapping, Tuple
+from operator import attrgetter
+from types import MappingProxyType
 import json
 from bson import ObjectId
 
+# Valeur de Etudiant._modifications quand les notes ont été remplacées en bloc
+NOTES_REMPLACEES = object()
+
+def _champ_suivi(champ: str) -> property:
+    """
+    Propriété d'un champ simple: la lecture est directe, la première modification
+    retient d'abord les valeurs lues de tous les champs simples
+    """
+    attribut = "_" + champ
+    
+    def modifier(self, valeur: Any) -> None:
+        if self._origine is None:
+            self._origine = tuple(getattr(self, "_" + nom) for nom in self.CHAMPS_SIMPLES)
+        setattr(self, attribut, valeur)
+    
+    return property(attrgetter(attribut), modifier)
+
 class Etudiant:
-    """Classe représentant un étudiant"""
+    """
+    Classe représentant un étudiant
+    
+    La classe utilise __slots__ (pas de __dict__ par instance) et mémorise sa moyenne.
+    Les notes sont exposées en lecture seule: elles se modifient via ajouter_note /
+    supprimer_note (ou en réaffectant l'attribut notes), ce qui invalide la moyenne
+    mémorisée et retient la modification.
+    
+    L'étudiant retient aussi la version du document lu et les notes modifiées depuis,
+    ce qui permet de fusionner ses modifications avec celles d'un autre utilisateur
+    (contrôle de concurrence optimiste). Les valeurs lues ne sont copiées qu'à la
+    première modification: un étudiant en lecture seule n'alloue rien de plus.
+    """
+    
+    __slots__ = ("_nom", "_prenom", "_telephone", "_classe", "_notes", "_moyenne", "_id",
+                 "version", "_origine", "_modifications")
+    
+    # Champs dont les valeurs lues sont retenues pour détecter les modifications
+    CHAMPS_SIMPLES = ("nom", "prenom", "telephone", "classe")
+    
+    nom = _champ_suivi("nom")
+    prenom = _champ_suivi("prenom")
+    telephone = _champ_suivi("telephone")
+    classe = _champ_suivi("classe")
     
     def __init__(self, nom: str, prenom: str, telephone: str, classe: str, 
-                 notes: Dict[str, float] = None, _id: Optional[str] = None):
+                 notes: Dict[str, float] = None, _id: Optional[str] = None, version: int = 0):
         """
         Initialise un nouvel étudiant
         
@@ -17,20 +59,42 @@ class Etudiant:
             classe: La classe de l'étudiant
             notes: Dictionnaire des notes par matière
             _id: Identifiant MongoDB (optionnel)
+            version: Version du document MongoDB lu (0 pour un nouvel étudiant)
         """
-        self.nom = nom
-        self.prenom = prenom
-        self.telephone = telephone
-        self.classe = classe
+        self._nom = nom
+        self._prenom = prenom
+        self._telephone = telephone
+        self._classe = classe
         self.notes = notes or {}
         self._id = _id
+        self.marquer_enregistre(version)
+    
+    @property
+    def notes(self) -> Mapping[str, float]:
+        """
+        Notes par matière, en lecture seule (une modification sur place, qui échapperait
+        au suivi des modifications, lève TypeError)
+        """
+        if not isinstance(self._notes, dict):
+            # Notes mal formées (importation pas encore validée): valider_notes les rejettera
+            return self._notes
+        return MappingProxyType(self._notes)
+    
+    @notes.setter
+    def notes(self, notes: Mapping[str, float]) -> None:
+        """Remplace les notes et invalide la moyenne mémorisée"""
+        # Les notes lues d'un autre étudiant (vue en lecture seule) sont copiées
+        self._notes = dict(notes) if isinstance(notes, MappingProxyType) else notes
+        self._moyenne = None
+        # Remplacement complet: les modifications ne peuvent plus être fusionnées
+        self._modifications = NOTES_REMPLACEES
     
     @property
     def moyenne(self) -> float:
-        """Calcule la moyenne des notes de l'étudiant"""
-        if not self.notes:
-            return 0.0
-        return sum(self.notes.values()) / len(self.notes)
+        """Calcule la moyenne des notes de l'étudiant (mémorisée jusqu'à la prochaine modification)"""
+        if self._moyenne is None:
+            self._moyenne = sum(self._notes.values()) / len(self._notes) if self._notes else 0.0
+        return self._moyenne
     
     def ajouter_note(self, matiere: str, note: float) -> None:
         """
@@ -45,7 +109,84 @@ class Etudiant:
         """
         if not 0 <= note <= 20:
             raise ValueError("La note doit être comprise entre 0 et 20")
-        self.notes[matiere] = note
+        self._noter_modification(matiere, note)
+        self._notes[matiere] = note
+        self._moyenne = None
+    
+    def supprimer_note(self, matiere: str) -> None:
+        """
+        Supprime la note d'une matière
+        
+        Args:
+            matiere: Le nom de la matière
+        
+        Raises:
+            KeyError: Si l'étudiant n'a pas de note dans cette matière
+        """
+        self._noter_modification(matiere, None)
+        del self._notes[matiere]
+        self._moyenne = None
+    
+    def _noter_modification(self, matiere: str, note: Optional[float]) -> None:
+        """Retient la note lue et la nouvelle note d'une matière modifiée"""
+        if self._modifications is NOTES_REMPLACEES:
+            return
+        if self._modifications is None:
+            self._modifications = {}
+        ancienne = self._modifications[matiere][0] if matiere in self._modifications else self._notes.get(matiere)
+        self._modifications[matiere] = (ancienne, note)
+    
+    @property
+    def modifications(self) -> Optional[Dict[str, Tuple[Optional[float], Optional[float]]]]:
+        """
+        Notes modifiées depuis la lecture: {matière: (note lue, nouvelle note)}, None
+        pour une note supprimée; None si les notes ont été remplacées en bloc
+        """
+        if self._modifications is NOTES_REMPLACEES:
+            return None
+        return self._modifications or {}
+    
+    @property
+    def origine(self) -> Dict[str, Any]:
+        """Valeurs des champs simples telles qu'elles ont été lues"""
+        if self._origine is None:
+            return {champ: getattr(self, champ) for champ in self.CHAMPS_SIMPLES}
+        return dict(zip(self.CHAMPS_SIMPLES, self._origine))
+    
+    def est_modifie(self) -> bool:
+        """Indique si l'étudiant a pu être modifié depuis sa lecture (True si ses notes ont été remplacées en bloc)"""
+        if self._modifications is NOTES_REMPLACEES:
+            return True
+        if self._modifications and any(lue != nouvelle for lue, nouvelle in self._modifications.values()):
+            return True
+        return self._origine is not None and self._origine != tuple(getattr(self, champ) for champ in self.CHAMPS_SIMPLES)
+    
+    def marquer_enregistre(self, version: int) -> None:
+        """
+        Prend l'état courant comme état enregistré dans la version donnée
+        
+        Args:
+            version: La version du document MongoDB
+        """
+        self.version = version
+        self._origine = None
+        self._modifications = None
+    
+    def rebaser(self, notes: Dict[str, float], version: int, origine: Dict[str, Any]) -> None:
+        """
+        Prend pour base une version plus récente du document, en conservant les
+        modifications locales (déjà réappliquées sur les notes fournies)
+        
+        Args:
+            notes: Les notes fusionnées
+            version: La version du document
+            origine: Les champs simples de cette version
+        """
+        modifications = self._modifications
+        self.notes = notes
+        self._modifications = modifications
+        self.version = version
+        self._origine = tuple(origine.get(champ) for champ in self.CHAMPS_SIMPLES)
     
     def to_dict(self) -> Dict[str, Any]:
         """Convertit l'étudiant en dictionnaire pour MongoDB"""
@@ -54,7 +195,8 @@ class Etudiant:
             "prenom": self.prenom,
             "telephone": self.telephone,
             "classe": self.classe,
-            "notes": self.notes
+            "notes": self._notes,
+            "version": self.version
         }
         
         # N'inclure l'_id que s'il est défini
@@ -84,7 +226,8 @@ class Etudiant:
             telephone=data.get("telephone"),
             classe=data.get("classe"),
             notes=data.get("notes", {}),
-            _id=id_value
+            _id=id_value,
+            version=data.get("version") or 0
         )
     
     @classmethod
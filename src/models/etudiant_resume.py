@@ -0,0 +1,55 @@
+from typing import Dict, Any, Optional
+
+class EtudiantResume:
+    """
+    Vue allégée d'un étudiant pour les listes et les exports
+
+    Ne contient pas le détail des notes: la moyenne est calculée par MongoDB
+    (projection PROJECTION_RESUME) et lue telle quelle.
+    """
+
+    __slots__ = ("nom", "prenom", "telephone", "classe", "moyenne", "_id")
+
+    def __init__(self, nom: str, prenom: str, telephone: str, classe: str,
+                 moyenne: float = 0.0, _id: Optional[str] = None):
+        """
+        Initialise le résumé
+
+        Args:
+            nom: Le nom de l'étudiant
+            prenom: Le prénom de l'étudiant
+            telephone: Le numéro de téléphone
+            classe: La classe de l'étudiant
+            moyenne: La moyenne de l'étudiant
+            _id: Identifiant MongoDB (optionnel)
+        """
+        self.nom = nom
+        self.prenom = prenom
+        self.telephone = telephone
+        self.classe = classe
+        self.moyenne = moyenne
+        self._id = _id
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Convertit le résumé en dictionnaire"""
+        return {
+            "_id": self._id,
+            "nom": self.nom,
+            "prenom": self.prenom,
+            "telephone": self.telephone,
+            "classe": self.classe,
+            "moyenne": self.moyenne
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> 'EtudiantResume':
+        """Crée un résumé à partir d'un document MongoDB projeté avec PROJECTION_RESUME"""
+        return cls(
+            nom=data.get("nom"),
+            prenom=data.get("prenom"),
+            telephone=data.get("telephone"),
+            classe=data.get("classe"),
+            moyenne=float(data.get("moyenne") or 0.0),
+            _id=str(data["_id"]) if data.get("_id") is not None else None
+        )
+
@@ -1,6 +1,5 @@
 from typing import Dict, Optional, Any
 import json
-import bcrypt
 from enum import Enum
 
 class Role(Enum):
@@ -22,7 +21,7 @@ class Utilisateur:
             username: Nom d'utilisateur unique
             email: Email de l'utilisateur
             role: Rôle de l'utilisateur (admin, enseignant, étudiant)
-            password_hash: Hash du mot de passe (déjà hashé)
+            password_hash: Hash du mot de passe (déjà hashé, voir MotDePasseService)
             id_etudiant: ID de l'étudiant associé (si rôle étudiant)
             _id: Identifiant MongoDB (optionnel)
         """
@@ -33,46 +32,23 @@ class Utilisateur:
         self.id_etudiant = id_etudiant
         self._id = _id
     
-    def set_password(self, password: str) -> None:
-        """
-        Définit le mot de passe de l'utilisateur (hashé)
-        
-        Args:
-            password: Mot de passe en clair
-        """
-        password_bytes = password.encode('utf-8')
-        salt = bcrypt.gensalt()
-        self.password_hash = bcrypt.hashpw(password_bytes, salt).decode('utf-8')
-    
-    def check_password(self, password: str) -> bool:
-        """
-        Vérifie si le mot de passe correspond
-        
-        Args:
-            password: Mot de passe à vérifier
-            
-        Returns:
-            True si le mot de passe correspond, False sinon
-        """
-        password_bytes = password.encode('utf-8')
-        hash_bytes = self.password_hash.encode('utf-8')
-        return bcrypt.checkpw(password_bytes, hash_bytes)
-    
     def to_dict(self) -> Dict[str, Any]:
-        """Convertit l'utilisateur en dictionnaire pour MongoDB"""
-        return {
+        """Convertit l'utilisateur en dictionnaire pour MongoDB (sans _id tant qu'il n'est pas attribué)"""
+        data = {
             "username": self.username,
             "email": self.email,
             "role": self.role.value,
             "password_hash": self.password_hash,
-            "id_etudiant": self.id_etudiant,
-            "_id": self._id
+            "id_etudiant": self.id_etudiant
         }
+        if self._id:
+            data["_id"] = self._id
+        return data
     
     def to_json(self) -> str:
         """Convertit l'utilisateur en JSON pour Redis"""
         data = self.to_dict()
-        if data["_id"]:
+        if data.get("_id"):
             data["_id"] = str(data["_id"])
         return json.dumps(data)
     
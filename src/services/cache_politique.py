@@ -0,0 +1,73 @@
+import os
+import random
+from typing import Optional
+from dotenv import load_dotenv
+
+# Chargement des variables d'environnement
+load_dotenv()
+
+# Version du format JSON mis en cache pour chaque type d'entité. À incrémenter quand ce
+# format change: les clés changent d'espace et les anciennes entrées ne sont plus lues
+# (elles expirent d'elles-mêmes).
+VERSIONS_SCHEMA = {
+    "etudiant": 2,     # v2: champ "version" (concurrence optimiste)
+    "utilisateur": 1,
+}
+
+class PolitiqueCache:
+    """
+    Politique de cache d'un type d'entité: durée de vie, gigue et version de schéma
+
+    La durée de vie de chaque entrée est tirée dans [ttl - gigue, ttl + gigue] pour que
+    des entrées écrites ensemble (import, lot) n'expirent pas toutes au même instant.
+    Les entrées négatives (valeur d'index connue pour ne correspondre à aucune entité)
+    ont une durée de vie courte et fixe.
+    """
+
+    def __init__(self, ttl: int = 3600, gigue: float = 0.1, version_schema: int = 1, ttl_negatif: int = 60):
+        """
+        Initialise la politique
+
+        Args:
+            ttl: Durée de vie des entrées en secondes (0: pas d'expiration)
+            gigue: Variation relative maximale de la durée de vie (0.1 = ±10 %)
+            version_schema: Version du format des entrées
+            ttl_negatif: Durée de vie des entrées négatives en secondes (0: pas de cache négatif)
+        """
+        self.ttl = ttl
+        self.gigue = gigue
+        self.version_schema = version_schema
+        self.ttl_negatif = ttl_negatif
+
+    @classmethod
+    def depuis_env(cls, prefixe: str) -> 'PolitiqueCache':
+        """
+        Construit la politique d'un type d'entité à partir des variables d'environnement
+
+        CACHE_TTL_<PREFIXE> (ou CACHE_TTL) donne la durée de vie, CACHE_GIGUE la gigue et
+        CACHE_TTL_NEGATIF la durée de vie des entrées négatives.
+
+        Args:
+            prefixe: Préfixe des clés de l'entité (ex: "etudiant")
+
+        Returns:
+            La politique
+        """
+        ttl = os.getenv(f"CACHE_TTL_{prefixe.upper()}", os.getenv('CACHE_TTL', 3600))
+        return cls(
+            ttl=int(ttl),
+            gigue=float(os.getenv('CACHE_GIGUE', 0.1)),
+            version_schema=VERSIONS_SCHEMA.get(prefixe, 1),
+            ttl_negatif=int(os.getenv('CACHE_TTL_NEGATIF', 60))
+        )
+
+    def duree(self) -> Optional[int]:
+        """
+        Tire la durée de vie d'une entrée
+
+        Returns:
+            La durée en secondes, ou None si les entrées n'expirent pas
+        """
+        if self.ttl <= 0:
+            return None
+        return max(1, round(self.ttl * (1 + random.uniform(-self.gigue, self.gigue))))
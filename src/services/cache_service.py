@@ -0,0 +1,449 @@
+import os
+import json
+import time
+import uuid
+from collections import Counter
+from typing import List, Dict, Any, Optional, Iterable, Tuple, Callable, TypeVar
+from dotenv import load_dotenv
+
+from src.config.database import Database
+from src.services.cache_politique import PolitiqueCache
+from src.utils.cache_lru import CacheLRU
+from src.utils.logger import Logger
+
+# Chargement des variables d'environnement
+load_dotenv()
+
+T = TypeVar('T')
+
+# Valeur d'un index secondaire dont la valeur ne correspond à aucune entité (cache négatif).
+# Écrite à la place de l'ID, elle est remplacée par l'écriture de l'index lors d'un ajout.
+MARQUEUR_ABSENT = "!absent"
+
+# Chargement unique (single-flight): durée de vie du verrou d'un chargement, attente
+# maximale des autres lecteurs et intervalle entre deux relectures du cache
+VERROU_CHARGEMENT_MS = 5000
+ATTENTE_CHARGEMENT = 2.0
+INTERVALLE_ATTENTE = 0.05
+
+# Écrit une entité sauf si Redis en contient déjà une version plus récente
+# KEYS[1]: clé de l'entité, ARGV[1]: JSON, ARGV[2]: version, ARGV[3]: durée de vie (0: aucune)
+SCRIPT_SI_PLUS_RECENT = """
+local actuel = redis.call('GET', KEYS[1])
+if actuel then
+    local ok, donnees = pcall(cjson.decode, actuel)
+    if ok and type(donnees) == 'table' and tonumber(donnees['version'] or 0) > tonumber(ARGV[2]) then
+        return 0
+    end
+end
+if tonumber(ARGV[3]) > 0 then
+    redis.call('SET', KEYS[1], ARGV[1], 'EX', ARGV[3])
+else
+    redis.call('SET', KEYS[1], ARGV[1])
+end
+return 1
+"""
+
+# Libère un verrou seulement s'il appartient encore à celui qui l'a pris
+# KEYS[1]: clé du verrou, ARGV[1]: jeton
+SCRIPT_LIBERER_VERROU = """
+if redis.call('GET', KEYS[1]) == ARGV[1] then
+    return redis.call('DEL', KEYS[1])
+end
+return 0
+"""
+
+class CacheService:
+    """
+    Passerelle vers le cache Redis d'un type d'entité
+
+    Les entités sont stockées sous "<prefixe>:v<schéma>:<id>" et leurs index secondaires
+    sous "<prefixe>:v<schéma>:<champ>:<valeur>" (qui contiennent l'ID), avec la durée de
+    vie et la version de schéma de leur PolitiqueCache. Les opérations liées sont
+    regroupées en une seule commande (MGET, DEL multi-clés) ou un seul pipeline.
+    
+    Un cache local (LRU + TTL), partagé par toutes les instances du processus, évite de
+    relire Redis pour les entités lues récemment. Il est mis à jour par les écritures
+    du processus et, si CACHE_L1_PUBSUB=true, invalidé par les messages publiés par
+    les autres instances de l'application sur le canal Redis CANAL_INVALIDATION.
+    """
+    
+    CANAL_INVALIDATION = "cache:invalidation"
+    
+    _cache_local = None
+    _origine = uuid.uuid4().hex  # Identifie ce processus dans les messages d'invalidation
+    _abonnement = None
+    _metriques: Dict[str, Counter] = {}  # Compteurs du processus par type d'entité
+    
+    @staticmethod
+    def get_cache_local() -> CacheLRU:
+        """Récupère le cache local du processus (créé et abonné aux invalidations au premier appel)"""
+        if CacheService._cache_local is None:
+            CacheService._cache_local = CacheLRU(
+                taille_max=int(os.getenv('CACHE_L1_TAILLE', 1000)),
+                ttl=float(os.getenv('CACHE_L1_TTL', 30))
+            )
+            if os.getenv('CACHE_L1_PUBSUB', 'false').lower() == 'true':
+                CacheService._abonner_invalidations()
+        return CacheService._cache_local
+    
+    @staticmethod
+    def _abonner_invalidations() -> None:
+        """Écoute dans un thread les invalidations publiées par les autres processus"""
+        def traiter(message):
+            invalidation = json.loads(message["data"])
+            if invalidation["origine"] != CacheService._origine:
+                CacheService._cache_local.supprimer(*invalidation["cles"])
+        
+        try:
+            pubsub = Database.get_redis_connection().pubsub(ignore_subscribe_messages=True)
+            pubsub.subscribe(**{CacheService.CANAL_INVALIDATION: traiter})
+            CacheService._abonnement = pubsub.run_in_thread(sleep_time=1, daemon=True)
+        except Exception as e:
+            Logger.get_instance().error(f"Impossible de s'abonner aux invalidations du cache: {e}")
+
+    def __init__(self, prefixe: str, politique: Optional[PolitiqueCache] = None, client_redis=None):
+        """
+        Initialise la passerelle
+
+        Args:
+            prefixe: Préfixe des clés de l'entité (ex: "etudiant")
+            politique: Durée de vie et version de schéma (par défaut, selon l'environnement)
+            client_redis: Client Redis (par défaut, la connexion partagée de l'application)
+        """
+        self.redis = client_redis or Database.get_redis_connection()
+        self.prefixe = prefixe
+        self.politique = politique or PolitiqueCache.depuis_env(prefixe)
+        self.espace = f"{prefixe}:v{self.politique.version_schema}"
+        self.local = CacheService.get_cache_local()
+        self.metriques = CacheService._metriques.setdefault(prefixe, Counter())
+        self.publier_invalidations = os.getenv('CACHE_L1_PUBSUB', 'false').lower() == 'true'
+        self._script_si_plus_recent = self.redis.register_script(SCRIPT_SI_PLUS_RECENT)
+        self._script_liberer_verrou = self.redis.register_script(SCRIPT_LIBERER_VERROU)
+
+    def cle(self, objet_id: str) -> str:
+        """Retourne la clé d'une entité"""
+        return f"{self.espace}:{objet_id}"
+
+    def cle_index(self, champ: str, valeur: str) -> str:
+        """Retourne la clé d'un index secondaire"""
+        return f"{self.espace}:{champ}:{valeur}"
+
+    def cles_entite(self, objet_id: str, index: Optional[Dict[str, str]] = None) -> List[str]:
+        """Retourne la clé d'une entité suivie de celles de ses index secondaires"""
+        return [self.cle(objet_id)] + [self.cle_index(champ, valeur) for champ, valeur in (index or {}).items()]
+
+    def valeurs_lot(self, entrees: Iterable[Tuple[str, str, Optional[Dict[str, str]]]]) -> Dict[str, str]:
+        """Construit les valeurs {clé: valeur} d'entités (id, JSON, index) et de leurs index secondaires"""
+        valeurs = {}
+        for objet_id, donnees_json, index in entrees:
+            valeurs[self.cle(objet_id)] = donnees_json
+            for champ, valeur in (index or {}).items():
+                valeurs[self.cle_index(champ, valeur)] = objet_id
+        return valeurs
+
+    def index_versionnes(self, entrees: List[Tuple[str, str, int, Optional[Dict[str, str]]]]) -> Dict[str, str]:
+        """Construit les index secondaires {clé: id} d'entités versionnées"""
+        return {
+            self.cle_index(champ, valeur): objet_id
+            for objet_id, _, _, index in entrees
+            for champ, valeur in (index or {}).items()
+        }
+
+    def arguments_versionne(self, donnees_json: str, version: int) -> List[Any]:
+        """Construit les arguments de SCRIPT_SI_PLUS_RECENT"""
+        return [donnees_json, version, self.politique.duree() or 0]
+
+    def retenir(self, valeurs: Dict[str, Optional[str]]) -> None:
+        """Recopie dans le cache local des valeurs écrites ou lues dans Redis"""
+        for cle, valeur in valeurs.items():
+            self.local.definir(cle, valeur)
+
+    def retenir_versionnes(self, entrees: List[Tuple[str, str, int, Optional[Dict[str, str]]]],
+                           index_cles: Dict[str, str], ecrits: List[int]) -> None:
+        """Recopie dans le cache local les entités versionnées effectivement écrites et leurs index"""
+        self.retenir({
+            self.cle(objet_id): donnees_json
+            for (objet_id, donnees_json, _, _), ecrit in zip(entrees, ecrits) if ecrit
+        })
+        self.retenir(index_cles)
+
+    def noter_lectures(self, valeurs: List[Optional[str]]) -> None:
+        """Compte les hits et les misses d'une lecture"""
+        manquees = sum(valeur is None for valeur in valeurs)
+        self.metriques["hits"] += len(valeurs) - manquees
+        self.metriques["misses"] += manquees
+
+    def entree_index(self, champ: str, valeur: str, donnees_json: Optional[str]) -> Optional[str]:
+        """
+        Contrôle l'entité pointée par un index secondaire
+
+        Returns:
+            Le JSON, MARQUEUR_ABSENT, ou None si l'index est obsolète (l'entité n'a plus
+            cette valeur) ou ne pointe vers rien
+        """
+        if donnees_json == MARQUEUR_ABSENT:
+            self.metriques["hits_negatifs"] += 1
+            return MARQUEUR_ABSENT
+        if donnees_json and json.loads(donnees_json).get(champ) != valeur:
+            return None
+        return donnees_json
+
+    def message_invalidation(self, cles: List[str]) -> str:
+        """Construit le message publié sur CANAL_INVALIDATION"""
+        return json.dumps({"origine": self._origine, "cles": cles})
+
+    def ecrire(self, valeurs: Dict[str, str], ex: Optional[int] = None) -> None:
+        """
+        Écrit plusieurs clés en un seul aller-retour
+
+        Args:
+            valeurs: Dictionnaire {clé: valeur}
+            ex: Durée de vie en secondes (par défaut, celle de la politique, tirée par clé)
+        """
+        if not valeurs:
+            return
+
+        if ex is None and self.politique.ttl <= 0:
+            self.redis.mset(valeurs)
+        else:
+            # MSET n'accepte pas de TTL: SET ... EX groupés dans un pipeline
+            pipeline = self.redis.pipeline(transaction=False)
+            for cle, valeur in valeurs.items():
+                pipeline.set(cle, valeur, ex=ex if ex is not None else self.politique.duree())
+            pipeline.execute()
+
+        self._invalider_local(list(valeurs))
+
+    def mettre_en_cache(self, objet_id: str, donnees_json: str,
+                        index: Optional[Dict[str, str]] = None, ex: Optional[int] = None) -> None:
+        """
+        Met en cache une entité et ses index secondaires en un seul aller-retour
+
+        Args:
+            objet_id: L'ID de l'entité
+            donnees_json: L'entité sérialisée en JSON
+            index: Index secondaires {champ: valeur} pointant vers l'ID
+            ex: Durée de vie en secondes (par défaut, celle de la politique)
+        """
+        self.mettre_en_cache_lot([(objet_id, donnees_json, index)], ex)
+
+    def mettre_en_cache_lot(self, entrees: Iterable[Tuple[str, str, Optional[Dict[str, str]]]],
+                            ex: Optional[int] = None) -> None:
+        """
+        Met en cache plusieurs entités et leurs index secondaires en un seul aller-retour
+
+        Args:
+            entrees: Triplets (id, JSON, index secondaires)
+            ex: Durée de vie en secondes (par défaut, celle de la politique)
+        """
+        valeurs = self.valeurs_lot(entrees)
+        self.ecrire(valeurs, ex)
+
+        # Les écritures du processus alimentent directement le cache local
+        self.retenir(valeurs)
+
+    def mettre_en_cache_versionne(self, entrees: Iterable[Tuple[str, str, int, Optional[Dict[str, str]]]]) -> None:
+        """
+        Met en cache des entités versionnées en un seul aller-retour, sans jamais
+        remplacer une version plus récente écrite par un autre processus
+
+        Args:
+            entrees: Quadruplets (id, JSON, version, index secondaires)
+        """
+        entrees = list(entrees)
+        if not entrees:
+            return
+
+        pipeline = self.redis.pipeline(transaction=False)
+        index_cles = self.index_versionnes(entrees)
+        for objet_id, donnees_json, version, _ in entrees:
+            self._script_si_plus_recent(
+                keys=[self.cle(objet_id)], args=self.arguments_versionne(donnees_json, version), client=pipeline
+            )
+        for cle, valeur in index_cles.items():
+            pipeline.set(cle, valeur, ex=self.politique.duree())
+        ecrits = pipeline.execute()
+
+        self._invalider_local([self.cle(objet_id) for objet_id, _, _, _ in entrees] + list(index_cles))
+        self.retenir_versionnes(entrees, index_cles, ecrits)
+
+    def _lire(self, cle: str) -> Optional[str]:
+        """Lit une clé dans le cache local, puis dans Redis"""
+        valeur = self.local.obtenir(cle)
+        if valeur is None:
+            valeur = self.redis.get(cle)
+            self.local.definir(cle, valeur)
+        self.noter_lectures([valeur])
+        return valeur
+
+    def obtenir(self, objet_id: str) -> Optional[str]:
+        """Retourne le JSON d'une entité, ou None si elle n'est pas en cache"""
+        return self._lire(self.cle(objet_id))
+
+    def obtenir_plusieurs(self, objet_ids: List[str]) -> List[Optional[str]]:
+        """
+        Retourne le JSON de plusieurs entités en un seul MGET
+
+        Args:
+            objet_ids: Les IDs des entités
+
+        Returns:
+            Liste alignée sur objet_ids (None pour les entités absentes du cache)
+        """
+        if not objet_ids:
+            return []
+
+        cles = [self.cle(objet_id) for objet_id in objet_ids]
+        valeurs = [self.local.obtenir(cle) for cle in cles]
+
+        # Un seul MGET pour les entités absentes du cache local
+        absentes = [i for i, valeur in enumerate(valeurs) if valeur is None]
+        if absentes:
+            lues = dict(zip([cles[i] for i in absentes], self.redis.mget([cles[i] for i in absentes])))
+            self.retenir(lues)
+            for i in absentes:
+                valeurs[i] = lues[cles[i]]
+
+        self.noter_lectures(valeurs)
+        return valeurs
+
+    def obtenir_id(self, champ: str, valeur: str) -> Optional[str]:
+        """Retourne l'ID pointé par un index secondaire"""
+        return self._lire(self.cle_index(champ, valeur))
+
+    def obtenir_par_index(self, champ: str, valeur: str) -> Optional[str]:
+        """
+        Retourne le JSON de l'entité pointée par un index secondaire
+
+        Returns:
+            Le JSON, MARQUEUR_ABSENT si la valeur est connue pour n'exister pas, ou None
+            si le cache ne sait pas (absente, ou index obsolète: l'entité n'a plus cette valeur)
+        """
+        objet_id = self.obtenir_id(champ, valeur)
+        donnees_json = self.obtenir(objet_id) if objet_id and objet_id != MARQUEUR_ABSENT else objet_id
+        return self.entree_index(champ, valeur, donnees_json)
+
+    def marquer_absent(self, champ: str, valeur: str) -> str:
+        """
+        Retient pour une courte durée qu'aucune entité n'a cette valeur d'index
+
+        L'écriture est faite avec NX: elle n'écrase pas l'index d'une entité ajoutée
+        entre la lecture MongoDB et cet appel. L'ajout d'une entité écrit son index et
+        remplace le marqueur.
+
+        Args:
+            champ: Le champ indexé (ex: "telephone")
+            valeur: La valeur introuvable
+
+        Returns:
+            MARQUEUR_ABSENT
+        """
+        if self.politique.ttl_negatif > 0:
+            cle = self.cle_index(champ, valeur)
+            if self.redis.set(cle, MARQUEUR_ABSENT, nx=True, ex=self.politique.ttl_negatif):
+                self.local.definir(cle, MARQUEUR_ABSENT)
+        return MARQUEUR_ABSENT
+
+    def charger_une_fois(self, cle: str, lire: Callable[[], Optional[T]], charger: Callable[[], Optional[T]]) -> Optional[T]:
+        """
+        Charge une entrée absente du cache une seule fois pour tous les lecteurs (single-flight)
+
+        Le premier lecteur qui rate la clé prend un verrou Redis (SET NX PX) et appelle
+        charger, qui lit MongoDB et remplit le cache. Les autres relisent le cache tant
+        que le verrou est tenu (au plus ATTENTE_CHARGEMENT secondes) au lieu d'interroger
+        MongoDB en même temps, puis chargent eux-mêmes si l'entrée n'est pas apparue.
+
+        Args:
+            cle: La clé manquante (le verrou est "<cle>:chargement")
+            lire: Relit l'entrée dans le cache (None si absente)
+            charger: Charge l'entrée depuis MongoDB et la met en cache
+
+        Returns:
+            Le résultat de lire ou de charger
+        """
+        verrou = f"{cle}:chargement"
+        jeton = uuid.uuid4().hex
+        if self.redis.set(verrou, jeton, nx=True, px=VERROU_CHARGEMENT_MS):
+            self.metriques["chargements"] += 1
+            try:
+                return charger()
+            finally:
+                self._script_liberer_verrou(keys=[verrou], args=[jeton])
+
+        self.metriques["attentes"] += 1
+        limite = time.monotonic() + ATTENTE_CHARGEMENT
+        while time.monotonic() < limite:
+            time.sleep(INTERVALLE_ATTENTE)
+            valeur = lire()
+            if valeur is not None:
+                return valeur
+            if not self.redis.exists(verrou):
+                break
+
+        self.metriques["chargements"] += 1
+        return charger()
+
+    def invalider(self, objet_id: str, index: Optional[Dict[str, str]] = None) -> None:
+        """
+        Supprime une entité et ses index secondaires en une seule commande DEL
+
+        Args:
+            objet_id: L'ID de l'entité
+            index: Index secondaires {champ: valeur} à supprimer
+        """
+        cles = self.cles_entite(objet_id, index)
+        self.redis.delete(*cles)
+        self._invalider_local(cles)
+        self.metriques["invalidations"] += 1
+
+    def invalider_index(self, index: Dict[str, str]) -> None:
+        """
+        Supprime des index secondaires devenus obsolètes (ex: ancien téléphone)
+
+        Args:
+            index: Index secondaires {champ: ancienne valeur}
+        """
+        cles = [self.cle_index(champ, valeur) for champ, valeur in index.items()]
+        if cles:
+            self.redis.delete(*cles)
+            self._invalider_local(cles)
+            self.metriques["invalidations"] += 1
+
+    def _invalider_local(self, cles: List[str]) -> None:
+        """Retire des clés du cache local et, si activé, des caches locaux des autres processus"""
+        self.local.supprimer(*cles)
+        if self.publier_invalidations:
+            self.redis.publish(self.CANAL_INVALIDATION, self.message_invalidation(cles))
+
+    def statistiques_locales(self) -> Dict[str, Any]:
+        """Retourne les compteurs du cache local (hits, misses, évictions...)"""
+        return self.local.statistiques()
+
+    def statistiques(self) -> Dict[str, Any]:
+        """
+        Retourne les métriques du cache pour ce type d'entité
+
+        Returns:
+            Dictionnaire {"entite": compteurs du processus (hits, misses, hits_negatifs,
+            chargements, attentes, invalidations, taux_hits), "local": compteurs du cache local,
+            "redis": compteurs du serveur (évictions, expirations, hits, misses)}
+        """
+        metriques = {
+            champ: self.metriques[champ]
+            for champ in ("hits", "misses", "hits_negatifs", "chargements", "attentes", "invalidations")
+        }
+        total = metriques["hits"] + metriques["misses"]
+        metriques["taux_hits"] = metriques["hits"] / total if total else 0.0
+
+        info = self.redis.info("stats")
+        return {
+            "entite": metriques,
+            "local": self.statistiques_locales(),
+            "redis": {
+                "evictions": info.get("evicted_keys", 0),
+                "expirations": info.get("expired_keys", 0),
+                "hits": info.get("keyspace_hits", 0),
+                "misses": info.get("keyspace_misses", 0)
+            }
+        }
@@ -0,0 +1,198 @@
+import time
+import uuid
+import asyncio
+from typing import List, Dict, Optional, Iterable, Tuple, Callable, Awaitable, TypeVar
+
+from src.services.cache_politique import PolitiqueCache
+from src.services.cache_service import (
+    CacheService, MARQUEUR_ABSENT, VERROU_CHARGEMENT_MS, ATTENTE_CHARGEMENT, INTERVALLE_ATTENTE
+)
+
+T = TypeVar('T')
+
+class CacheServiceAsync:
+    """
+    Version asyncio de CacheService (mêmes clés, même politique, même cache local)
+
+    Les clés, les valeurs écrites, le cache local et les métriques sont ceux d'un
+    CacheService lié au client redis.asyncio: seules les commandes Redis sont
+    attendues (await) au lieu d'être bloquantes.
+    """
+
+    def __init__(self, prefixe: str, client_redis, politique: Optional[PolitiqueCache] = None):
+        """
+        Initialise la passerelle
+
+        Args:
+            prefixe: Préfixe des clés de l'entité (ex: "etudiant")
+            client_redis: Client redis.asyncio
+            politique: Durée de vie et version de schéma (par défaut, selon l'environnement)
+        """
+        self.cache = CacheService(prefixe, politique, client_redis=client_redis)
+        self.redis = client_redis
+        self.politique = self.cache.politique
+        self.local = self.cache.local
+        self.metriques = self.cache.metriques
+
+    def cle(self, objet_id: str) -> str:
+        """Retourne la clé d'une entité"""
+        return self.cache.cle(objet_id)
+
+    def cle_index(self, champ: str, valeur: str) -> str:
+        """Retourne la clé d'un index secondaire"""
+        return self.cache.cle_index(champ, valeur)
+
+    async def ecrire(self, valeurs: Dict[str, str], ex: Optional[int] = None) -> None:
+        """Écrit plusieurs clés en un seul aller-retour (voir CacheService.ecrire)"""
+        if not valeurs:
+            return
+
+        if ex is None and self.politique.ttl <= 0:
+            await self.redis.mset(valeurs)
+        else:
+            pipeline = self.redis.pipeline(transaction=False)
+            for cle, valeur in valeurs.items():
+                pipeline.set(cle, valeur, ex=ex if ex is not None else self.politique.duree())
+            await pipeline.execute()
+
+        await self._invalider_local(list(valeurs))
+
+    async def mettre_en_cache(self, objet_id: str, donnees_json: str,
+                              index: Optional[Dict[str, str]] = None, ex: Optional[int] = None) -> None:
+        """Met en cache une entité et ses index secondaires en un seul aller-retour"""
+        await self.mettre_en_cache_lot([(objet_id, donnees_json, index)], ex)
+
+    async def mettre_en_cache_lot(self, entrees: Iterable[Tuple[str, str, Optional[Dict[str, str]]]],
+                                  ex: Optional[int] = None) -> None:
+        """Met en cache plusieurs entités (id, JSON, index) et leurs index secondaires en un seul aller-retour"""
+        valeurs = self.cache.valeurs_lot(entrees)
+        await self.ecrire(valeurs, ex)
+        self.cache.retenir(valeurs)
+
+    async def mettre_en_cache_versionne(self, entrees: Iterable[Tuple[str, str, int, Optional[Dict[str, str]]]]) -> None:
+        """
+        Met en cache des entités versionnées (id, JSON, version, index) en un seul
+        aller-retour, sans jamais remplacer une version plus récente
+        """
+        entrees = list(entrees)
+        if not entrees:
+            return
+
+        pipeline = self.redis.pipeline(transaction=False)
+        index_cles = self.cache.index_versionnes(entrees)
+        for objet_id, donnees_json, version, _ in entrees:
+            await self.cache._script_si_plus_recent(
+                keys=[self.cle(objet_id)], args=self.cache.arguments_versionne(donnees_json, version), client=pipeline
+            )
+        for cle, valeur in index_cles.items():
+            pipeline.set(cle, valeur, ex=self.politique.duree())
+        ecrits = await pipeline.execute()
+
+        await self._invalider_local([self.cle(objet_id) for objet_id, _, _, _ in entrees] + list(index_cles))
+        self.cache.retenir_versionnes(entrees, index_cles, ecrits)
+
+    async def _lire(self, cle: str) -> Optional[str]:
+        """Lit une clé dans le cache local, puis dans Redis"""
+        valeur = self.local.obtenir(cle)
+        if valeur is None:
+            valeur = await self.redis.get(cle)
+            self.local.definir(cle, valeur)
+        self.cache.noter_lectures([valeur])
+        return valeur
+
+    async def obtenir(self, objet_id: str) -> Optional[str]:
+        """Retourne le JSON d'une entité, ou None si elle n'est pas en cache"""
+        return await self._lire(self.cle(objet_id))
+
+    async def obtenir_plusieurs(self, objet_ids: List[str]) -> List[Optional[str]]:
+        """Retourne le JSON de plusieurs entités en un seul MGET (None pour les entités absentes du cache)"""
+        if not objet_ids:
+            return []
+
+        cles = [self.cle(objet_id) for objet_id in objet_ids]
+        valeurs = [self.local.obtenir(cle) for cle in cles]
+
+        absentes = [i for i, valeur in enumerate(valeurs) if valeur is None]
+        if absentes:
+            lues = dict(zip([cles[i] for i in absentes], await self.redis.mget([cles[i] for i in absentes])))
+            self.cache.retenir(lues)
+            for i in absentes:
+                valeurs[i] = lues[cles[i]]
+
+        self.cache.noter_lectures(valeurs)
+        return valeurs
+
+    async def obtenir_id(self, champ: str, valeur: str) -> Optional[str]:
+        """Retourne l'ID pointé par un index secondaire"""
+        return await self._lire(self.cle_index(champ, valeur))
+
+    async def obtenir_par_index(self, champ: str, valeur: str) -> Optional[str]:
+        """Retourne le JSON de l'entité pointée par un index secondaire, MARQUEUR_ABSENT ou None"""
+        objet_id = await self.obtenir_id(champ, valeur)
+        donnees_json = await self.obtenir(objet_id) if objet_id and objet_id != MARQUEUR_ABSENT else objet_id
+        return self.cache.entree_index(champ, valeur, donnees_json)
+
+    async def marquer_absent(self, champ: str, valeur: str) -> str:
+        """Retient pour une courte durée qu'aucune entité n'a cette valeur d'index (SET NX)"""
+        if self.politique.ttl_negatif > 0:
+            cle = self.cle_index(champ, valeur)
+            if await self.redis.set(cle, MARQUEUR_ABSENT, nx=True, ex=self.politique.ttl_negatif):
+                self.local.definir(cle, MARQUEUR_ABSENT)
+        return MARQUEUR_ABSENT
+
+    async def charger_une_fois(self, cle: str, lire: Callable[[], Awaitable[Optional[T]]],
+                               charger: Callable[[], Awaitable[Optional[T]]]) -> Optional[T]:
+        """
+        Charge une entrée absente du cache une seule fois pour tous les lecteurs
+        (même verrou Redis que CacheService.charger_une_fois)
+
+        Args:
+            cle: La clé manquante (le verrou est "<cle>:chargement")
+            lire: Coroutine relisant l'entrée dans le cache (None si absente)
+            charger: Coroutine chargeant l'entrée depuis MongoDB et la mettant en cache
+
+        Returns:
+            Le résultat de lire ou de charger
+        """
+        verrou = f"{cle}:chargement"
+        jeton = uuid.uuid4().hex
+        if await self.redis.set(verrou, jeton, nx=True, px=VERROU_CHARGEMENT_MS):
+            self.metriques["chargements"] += 1
+            try:
+                return await charger()
+            finally:
+                await self.cache._script_liberer_verrou(keys=[verrou], args=[jeton])
+
+        self.metriques["attentes"] += 1
+        limite = time.monotonic() + ATTENTE_CHARGEMENT
+        while time.monotonic() < limite:
+            await asyncio.sleep(INTERVALLE_ATTENTE)
+            valeur = await lire()
+            if valeur is not None:
+                return valeur
+            if not await self.redis.exists(verrou):
+                break
+
+        self.metriques["chargements"] += 1
+        return await charger()
+
+    async def invalider(self, objet_id: str, index: Optional[Dict[str, str]] = None) -> None:
+        """Supprime une entité et ses index secondaires {champ: valeur} en une seule commande DEL"""
+        cles = self.cache.cles_entite(objet_id, index)
+        await self.redis.delete(*cles)
+        await self._invalider_local(cles)
+        self.metriques["invalidations"] += 1
+
+    async def invalider_index(self, index: Dict[str, str]) -> None:
+        """Supprime des index secondaires devenus obsolètes {champ: ancienne valeur}"""
+        cles = [self.cle_index(champ, valeur) for champ, valeur in index.items()]
+        if cles:
+            await self.redis.delete(*cles)
+            await self._invalider_local(cles)
+            self.metriques["invalidations"] += 1
+
+    async def _invalider_local(self, cles: List[str]) -> None:
+        """Retire des clés du cache local et, si activé, des caches locaux des autres processus"""
+        self.local.supprimer(*cles)
+        if self.cache.publier_invalidations:
+            await self.redis.publish(CacheService.CANAL_INVALIDATION, self.cache.message_invalidation(cles))
@@ -0,0 +1,228 @@
+from typing import List, Dict, Any, Optional, Tuple, Iterable
+
+from src.models.etudiant import Etudiant
+from src.config.database import Database
+from src.utils.logger import Logger
+
+class ClassementService:
+    """
+    Service de classement des étudiants maintenu dans des sorted sets Redis
+
+    À moyenne égale, ZREVRANGE ordonne les étudiants par ID décroissant: les requêtes
+    MongoDB de repli trient de même ({"moyenne": -1, "_id": -1}), pour que le classement
+    ne change pas selon sa source. Un étudiant sans classe ne figure que dans le
+    classement global.
+    """
+
+    CLE_GLOBALE = "classement:global"
+    CLE_CLASSES = "classement:classes"        # Hash id étudiant -> classe
+    CLE_INITIALISE = "classement:initialise"  # Présente une fois le classement reconstruit
+    PREFIXE_CLASSE = "classement:classe:"
+    PREFIXE_TEMPORAIRE = "classement_tmp:"
+
+    def __init__(self):
+        """Initialise le service avec la connexion Redis"""
+        self.redis = Database.get_redis_connection()
+        self.logger = Logger.get_instance()
+
+    @classmethod
+    def _cle(cls, classe: Optional[str] = None) -> str:
+        """Retourne la clé du sorted set global ou de celui d'une classe"""
+        return cls.CLE_GLOBALE if classe is None else f"{cls.PREFIXE_CLASSE}{classe}"
+
+    @classmethod
+    def _ecrire_score(cls, pipeline, etudiant: Etudiant) -> None:
+        """Ajoute au pipeline le score d'un étudiant dans le classement global et celui de sa classe"""
+        pipeline.zadd(cls.CLE_GLOBALE, {etudiant._id: etudiant.moyenne})
+        if etudiant.classe is not None:
+            pipeline.zadd(cls._cle(etudiant.classe), {etudiant._id: etudiant.moyenne})
+
+    @classmethod
+    def _ecrire(cls, pipeline, etudiant: Etudiant, ancienne_classe: Optional[str] = None) -> None:
+        """Ajoute au pipeline la classe et le score d'un étudiant (retiré de son ancienne classe)"""
+        if ancienne_classe is not None and ancienne_classe != etudiant.classe:
+            pipeline.zrem(cls._cle(ancienne_classe), etudiant._id)
+        if etudiant.classe is None:
+            pipeline.hdel(cls.CLE_CLASSES, etudiant._id)
+            pipeline.zadd(cls.CLE_GLOBALE, {etudiant._id: etudiant.moyenne})
+            return
+        pipeline.hset(cls.CLE_CLASSES, etudiant._id, etudiant.classe)
+        cls._ecrire_score(pipeline, etudiant)
+
+    @classmethod
+    def _retirer(cls, pipeline, etudiant_id: str, classe: Optional[str]) -> None:
+        """Ajoute au pipeline le retrait d'un étudiant du classement"""
+        pipeline.zrem(cls.CLE_GLOBALE, etudiant_id)
+        if classe is not None:
+            pipeline.zrem(cls._cle(classe), etudiant_id)
+        pipeline.hdel(cls.CLE_CLASSES, etudiant_id)
+
+    def mettre_a_jour(self, etudiant: Etudiant) -> None:
+        """
+        Met à jour le score d'un étudiant dans le classement global et celui de sa classe
+
+        Args:
+            etudiant: L'étudiant (avec un ID)
+        """
+        ancienne_classe = self.redis.hget(self.CLE_CLASSES, etudiant._id)
+
+        pipeline = self.redis.pipeline()
+        self._ecrire(pipeline, etudiant, ancienne_classe)
+        pipeline.execute()
+
+    def ajouter_lot(self, etudiants: Iterable[Etudiant]) -> None:
+        """
+        Ajoute des étudiants nouvellement créés au classement en un seul aller-retour
+
+        Args:
+            etudiants: Les étudiants (avec un ID)
+        """
+        pipeline = self.redis.pipeline(transaction=False)
+        for etudiant in etudiants:
+            self._ecrire(pipeline, etudiant)
+        pipeline.execute()
+
+    def mettre_a_jour_scores(self, etudiants: Iterable[Etudiant]) -> None:
+        """
+        Met à jour le score d'étudiants dont la classe n'a pas changé en un seul aller-retour
+
+        Args:
+            etudiants: Les étudiants (avec un ID)
+        """
+        pipeline = self.redis.pipeline(transaction=False)
+        for etudiant in etudiants:
+            self._ecrire_score(pipeline, etudiant)
+        pipeline.execute()
+
+    def supprimer(self, etudiant_id: str) -> None:
+        """
+        Retire un étudiant du classement
+
+        Args:
+            etudiant_id: L'ID de l'étudiant
+        """
+        classe = self.redis.hget(self.CLE_CLASSES, etudiant_id)
+
+        pipeline = self.redis.pipeline()
+        self._retirer(pipeline, etudiant_id, classe)
+        pipeline.execute()
+
+    def est_initialise(self) -> bool:
+        """Indique si le classement a été construit à partir de MongoDB"""
+        return bool(self.redis.exists(self.CLE_INITIALISE))
+
+    def top(self, limit: int = 10, classe: Optional[str] = None, skip: int = 0) -> Optional[List[Tuple[str, float]]]:
+        """
+        Retourne les meilleurs étudiants du classement
+
+        Args:
+            limit: Nombre d'étudiants à retourner
+            classe: Restreint le classement à une classe (optionnel)
+            skip: Nombre d'étudiants à sauter
+
+        Returns:
+            Liste de couples (id, moyenne), ou None si le classement n'est pas initialisé
+        """
+        if not self.est_initialise():
+            return None
+        return self.redis.zrevrange(self._cle(classe), skip, skip + limit - 1, withscores=True)
+
+    def rang(self, etudiant_id: str, classe: Optional[str] = None) -> Optional[int]:
+        """
+        Retourne le rang d'un étudiant (1 = meilleure moyenne)
+
+        Args:
+            etudiant_id: L'ID de l'étudiant
+            classe: Rang dans la classe plutôt que dans l'établissement (optionnel)
+
+        Returns:
+            Le rang, ou None si l'étudiant n'est pas classé ou si le classement n'est pas initialisé
+        """
+        if not self.est_initialise():
+            return None
+        rang = self.redis.zrevrank(self._cle(classe), etudiant_id)
+        return None if rang is None else rang + 1
+
+    def entre(self, minimum: float, maximum: float, classe: Optional[str] = None,
+              limit: int = 100) -> Optional[List[Tuple[str, float]]]:
+        """
+        Retourne les étudiants dont la moyenne est dans [minimum, maximum[
+
+        Args:
+            minimum: Moyenne minimale (incluse)
+            maximum: Moyenne maximale (exclue)
+            classe: Restreint la recherche à une classe (optionnel)
+            limit: Nombre maximal d'étudiants
+
+        Returns:
+            Liste de couples (id, moyenne) par moyenne décroissante, ou None si le
+            classement n'est pas initialisé
+        """
+        if not self.est_initialise():
+            return None
+        return self.redis.zrevrangebyscore(
+            self._cle(classe), f"({maximum}", minimum, start=0, num=limit, withscores=True
+        )
+
+    def reconstruire(self, documents: Iterable[Dict[str, Any]], taille_lot: int = 1000) -> int:
+        """
+        Reconstruit le classement à partir de MongoDB (après une perte du cache par exemple)
+
+        Les sorted sets sont construits sous des clés temporaires puis renommés, de sorte
+        que le classement existant reste consultable pendant la reconstruction. Les
+        étudiants sans classe ne sont ajoutés qu'au classement global.
+
+        Args:
+            documents: Documents {"_id", "classe", "moyenne"} de tous les étudiants
+            taille_lot: Nombre d'étudiants écrits par pipeline
+
+        Returns:
+            Le nombre d'étudiants classés
+        """
+        tmp_globale = f"{self.PREFIXE_TEMPORAIRE}{self.CLE_GLOBALE}"
+        tmp_classes = f"{self.PREFIXE_TEMPORAIRE}{self.CLE_CLASSES}"
+        self.redis.delete(tmp_globale, tmp_classes)
+
+        classes = set()
+        nombre = 0
+        pipeline = self.redis.pipeline(transaction=False)
+
+        for data in documents:
+            etudiant_id = str(data["_id"])
+            classe = data.get("classe")
+            pipeline.zadd(tmp_globale, {etudiant_id: data["moyenne"]})
+            if classe is not None:
+                if classe not in classes:
+                    classes.add(classe)
+                    pipeline.delete(f"{self.PREFIXE_TEMPORAIRE}{self._cle(classe)}")
+                pipeline.hset(tmp_classes, etudiant_id, classe)
+                pipeline.zadd(f"{self.PREFIXE_TEMPORAIRE}{self._cle(classe)}", {etudiant_id: data["moyenne"]})
+            nombre += 1
+
+            if nombre % taille_lot == 0:
+                pipeline.execute()
+
+        pipeline.execute()
+
+        # Remplacer atomiquement l'ancien classement par le nouveau
+        anciennes_cles = set(self.redis.scan_iter(match=f"{self.PREFIXE_CLASSE}*"))
+        nouvelles_cles = {self._cle(classe) for classe in classes}
+
+        transaction = self.redis.pipeline()
+        for cle in anciennes_cles - nouvelles_cles:
+            transaction.delete(cle)
+        if nombre:
+            transaction.rename(tmp_globale, self.CLE_GLOBALE)
+            if classes:
+                transaction.rename(tmp_classes, self.CLE_CLASSES)
+            else:
+                transaction.delete(self.CLE_CLASSES)
+            for cle in nouvelles_cles:
+                transaction.rename(f"{self.PREFIXE_TEMPORAIRE}{cle}", cle)
+        else:
+            transaction.delete(self.CLE_GLOBALE, self.CLE_CLASSES)
+        transaction.set(self.CLE_INITIALISE, 1)
+        transaction.execute()
+
+        self.logger.info(f"Classement reconstruit: {nombre} étudiant(s), {len(classes)} classe(s)")
+        return nombre
@@ -0,0 +1,53 @@
+from typing import List, Optional, Tuple, Iterable
+
+from src.models.etudiant import Etudiant
+from src.services.classement_service import ClassementService
+
+class ClassementServiceAsync:
+    """
+    Version asyncio de ClassementService (mêmes sorted sets Redis, mêmes écritures)
+
+    La reconstruction du classement reste une opération de maintenance synchrone.
+    """
+
+    def __init__(self, client_redis):
+        """
+        Initialise le service
+
+        Args:
+            client_redis: Client redis.asyncio
+        """
+        self.redis = client_redis
+
+    async def mettre_a_jour(self, etudiant: Etudiant) -> None:
+        """Met à jour le score d'un étudiant dans le classement global et celui de sa classe"""
+        ancienne_classe = await self.redis.hget(ClassementService.CLE_CLASSES, etudiant._id)
+
+        pipeline = self.redis.pipeline()
+        ClassementService._ecrire(pipeline, etudiant, ancienne_classe)
+        await pipeline.execute()
+
+    async def ajouter_lot(self, etudiants: Iterable[Etudiant]) -> None:
+        """Ajoute des étudiants nouvellement créés au classement en un seul aller-retour"""
+        pipeline = self.redis.pipeline(transaction=False)
+        for etudiant in etudiants:
+            ClassementService._ecrire(pipeline, etudiant)
+        await pipeline.execute()
+
+    async def supprimer(self, etudiant_id: str) -> None:
+        """Retire un étudiant du classement"""
+        classe = await self.redis.hget(ClassementService.CLE_CLASSES, etudiant_id)
+
+        pipeline = self.redis.pipeline()
+        ClassementService._retirer(pipeline, etudiant_id, classe)
+        await pipeline.execute()
+
+    async def est_initialise(self) -> bool:
+        """Indique si le classement a été construit à partir de MongoDB"""
+        return bool(await self.redis.exists(ClassementService.CLE_INITIALISE))
+
+    async def top(self, limit: int = 10, classe: Optional[str] = None, skip: int = 0) -> Optional[List[Tuple[str, float]]]:
+        """Retourne les meilleurs étudiants (id, moyenne), ou None si le classement n'est pas initialisé"""
+        if not await self.est_initialise():
+            return None
+        return await self.redis.zrevrange(ClassementService._cle(classe), skip, skip + limit - 1, withscores=True)
@@ -0,0 +1,45 @@
+"""Expressions MongoDB et règles de calcul partagées par les services liés aux étudiants"""
+
+# Champs d'un document étudiant utilisés par l'application
+PROJECTION_ETUDIANT = {"nom": 1, "prenom": 1, "telephone": 1, "classe": 1, "notes": 1, "version": 1}
+
+# Expression d'agrégation calculant la moyenne à partir de l'objet notes
+# (0 si aucune note, comme la propriété Etudiant.moyenne)
+EXPRESSION_MOYENNE = {
+    "$ifNull": [
+        {"$avg": {"$map": {
+            "input": {"$objectToArray": {"$ifNull": ["$notes", {}]}},
+            "in": "$$this.v"
+        }}},
+        0.0
+    ]
+}
+
+# Projection des listes et exports: champs affichés et moyenne calculée par MongoDB,
+# sans transférer le détail des notes
+PROJECTION_RESUME = {"nom": 1, "prenom": 1, "telephone": 1, "classe": 1, "moyenne": EXPRESSION_MOYENNE}
+
+# Bornes inférieures des mentions (la dernière borne exclut 21, au-dessus de toute moyenne)
+MENTIONS = {
+    0: "insuffisant",
+    10: "passable",
+    12: "assez_bien",
+    14: "bien",
+    16: "tres_bien"
+}
+
+def mention_pour(moyenne: float) -> str:
+    """
+    Retourne la clé de mention correspondant à une moyenne
+    
+    Args:
+        moyenne: La moyenne entre 0 et 20
+        
+    Returns:
+        La clé de mention (insuffisant, passable, assez_bien, bien, tres_bien)
+    """
+    mention = MENTIONS[0]
+    for borne, cle in MENTIONS.items():
+        if moyenne >= borne:
+            mention = cle
+    return mention
@@ -0,0 +1,154 @@
+"""Documents MongoDB des étudiants et étapes d'importation partagées par les services synchrone et asyncio"""
+from collections.abc import Mapping
+from typing import Dict, Any, List, Iterable, Iterator, Tuple
+
+from src.models.etudiant import Etudiant
+from src.services.etudiant.recherche import champs_recherche
+
+def document_etudiant(etudiant: Etudiant) -> Dict[str, Any]:
+    """Construit le document MongoDB d'un étudiant, avec ses champs de recherche normalisés"""
+    document = etudiant.to_dict()
+    document["recherche"] = champs_recherche(etudiant.nom, etudiant.prenom, etudiant.classe)
+    return document
+
+def donnees_mise_a_jour(etudiant: Etudiant) -> Dict[str, Any]:
+    """Construit les champs écrits par la mise à jour d'un étudiant"""
+    return {
+        "nom": etudiant.nom,
+        "prenom": etudiant.prenom,
+        "telephone": etudiant.telephone,
+        "classe": etudiant.classe,
+        "notes": dict(etudiant.notes),
+        "recherche": champs_recherche(etudiant.nom, etudiant.prenom, etudiant.classe)
+    }
+
+def valider_matiere(matiere: str) -> None:
+    """
+    Valide un nom de matière
+
+    Le nom sert de composant de chemin MongoDB ("notes.<matiere>" dans les étudiants,
+    "matieres.<matiere>.somme" dans les statistiques de classe): un point ou un "$"
+    initial y créerait un autre champ ou un opérateur.
+
+    Raises:
+        ValueError: Si le nom est vide, contient un point ou commence par "$"
+    """
+    if not isinstance(matiere, str) or not matiere or "." in matiere or matiere.startswith("$"):
+        raise ValueError(f"Nom de matière invalide: '{matiere}' (ni point, ni '$' initial)")
+
+def valider_notes(notes: Dict[str, float]) -> None:
+    """
+    Valide les notes d'un étudiant avant écriture
+
+    Raises:
+        ValueError: Si les notes ne forment pas un objet {matière: note}, ou si un nom de
+            matière ou une note (nombre entre 0 et 20, booléens exclus) est invalide
+    """
+    if not isinstance(notes, Mapping):
+        raise ValueError(f"Notes invalides: objet {{matière: note}} attendu, reçu {type(notes).__name__}")
+    
+    for matiere, note in notes.items():
+        valider_matiere(matiere)
+        if isinstance(note, bool) or not isinstance(note, (int, float)) or not 0 <= note <= 20:
+            raise ValueError(f"Note invalide pour {matiere}: {note}")
+
+def valider_etudiant(etudiant: Etudiant) -> None:
+    """
+    Valide les données d'un étudiant avant insertion
+
+    Raises:
+        ValueError: Si un champ obligatoire manque ou n'est pas un texte, ou si une note est invalide
+    """
+    for champ in ("nom", "prenom", "telephone", "classe"):
+        valeur = getattr(etudiant, champ)
+        if not valeur:
+            raise ValueError(f"Le champ '{champ}' est obligatoire")
+        if not isinstance(valeur, str):
+            raise ValueError(f"Le champ '{champ}' doit être un texte")
+
+    valider_notes(etudiant.notes)
+
+def lots_a_inserer(etudiants: Iterable[Etudiant], rapport: Dict[str, List], taille_lot: int) -> Iterator[List[Etudiant]]:
+    """
+    Valide des étudiants à importer et les regroupe en lots au fil de la lecture
+
+    Les étudiants invalides et les doublons de téléphone internes à l'importation sont
+    inscrits au rapport. Seul le lot en cours est gardé en mémoire (avec l'ensemble
+    des téléphones déjà vus).
+
+    Args:
+        etudiants: Les étudiants à ajouter (itérable, éventuellement un générateur)
+        rapport: Le rapport d'importation à compléter
+        taille_lot: Nombre d'étudiants par lot
+
+    Returns:
+        Les lots, sans téléphone en commun
+    """
+    telephones_vus = set()
+    lot = []
+
+    for etudiant in etudiants:
+        try:
+            valider_etudiant(etudiant)
+        except ValueError as e:
+            rapport["invalides"].append({"telephone": etudiant.telephone, "erreur": str(e)})
+            continue
+
+        if etudiant.telephone in telephones_vus:
+            rapport["doublons"].append(etudiant.telephone)
+            continue
+
+        telephones_vus.add(etudiant.telephone)
+        lot.append(etudiant)
+
+        if len(lot) >= taille_lot:
+            yield lot
+            lot = []
+
+    if lot:
+        yield lot
+
+def retirer_existants(lot: List[Etudiant], existants: set, rapport: Dict[str, List]) -> List[Etudiant]:
+    """Retire d'un lot les étudiants dont le téléphone est déjà en base et les inscrit comme doublons"""
+    a_inserer = []
+    for etudiant in lot:
+        if etudiant.telephone in existants:
+            rapport["doublons"].append(etudiant.telephone)
+        else:
+            a_inserer.append(etudiant)
+    return a_inserer
+
+def noter_insertion(a_inserer: List[Etudiant], documents: List[Dict[str, Any]], erreurs: List[Dict[str, Any]],
+                    rapport: Dict[str, List]) -> Tuple[List[Etudiant], List[Dict[str, Any]]]:
+    """
+    Inscrit au rapport le résultat d'un insert_many non ordonné
+
+    Args:
+        a_inserer: Les étudiants envoyés
+        documents: Leurs documents (avec l'_id renseigné par insert_many)
+        erreurs: Les "writeErrors" d'une BulkWriteError (vide si tout a été inséré)
+        rapport: Le rapport d'importation à compléter
+
+    Returns:
+        Les étudiants insérés (avec leur ID) et leurs documents
+    """
+    index_en_erreur = set()
+    for erreur in erreurs:
+        index = erreur["index"]
+        index_en_erreur.add(index)
+        telephone = a_inserer[index].telephone
+        if erreur.get("code") == 11000:
+            # Doublon inséré entre-temps par un autre processus
+            rapport["doublons"].append(telephone)
+        else:
+            rapport["invalides"].append({"telephone": telephone, "erreur": erreur.get("errmsg", "")})
+
+    inseres, documents_inseres = [], []
+    for index, (etudiant, document) in enumerate(zip(a_inserer, documents)):
+        if index in index_en_erreur:
+            continue
+        etudiant._id = str(document["_id"])
+        inseres.append(etudiant)
+        documents_inseres.append(document)
+        rapport["inseres"].append(etudiant._id)
+    return inseres, documents_inseres
@@ -1,18 +1,71 @@
-import json
-from typing import List, Dict, Any, Optional, Union
+import re
+from typing import List, Dict, Any, Optional, Union, Iterable, Iterator, Tuple
 from bson import ObjectId
+from pymongo import ReturnDocument, UpdateOne, ASCENDING, DESCENDING
+from pymongo.errors import DuplicateKeyError, BulkWriteError
 
 from src.models.etudiant import Etudiant
+from src.models.etudiant_resume import EtudiantResume
+from src.models.classe_frame import ClasseFrame
 from src.config.database import Database
+from src.config.indexes import IndexManager
+from src.services.cache_service import CacheService, MARQUEUR_ABSENT
+from src.services.classement_service import ClassementService
+from src.services.etudiant.agregation import PROJECTION_ETUDIANT, PROJECTION_RESUME, EXPRESSION_MOYENNE
+from src.services.etudiant.statistiques_classe_service import StatistiquesClasseService
+from src.services.notification_service import NotificationService
+from src.services.etudiant.versions import MAX_TENTATIVES, filtre_version, rebaser
+from src.services.etudiant.documents import (
+    document_etudiant, donnees_mise_a_jour, lots_a_inserer, retirer_existants, noter_insertion,
+    valider_matiere, valider_notes
+)
+from src.utils.exception.exceptions import VersionConflictError
+from src.services.etudiant.recherche import (
+    CHAMPS_PREFIXE, SEUIL_TRIGRAMMES, normaliser, renseigner_champs_recherche, trigrammes
+)
+
+# Clés de tri de la pagination par curseur (la dernière clé, _id, départage les ex aequo)
+TRIS_PAGINATION = {
+    "id": ["_id"],
+    "classe": ["classe", "nom", "_id"],
+}
 
 class EtudiantService:
     """Service de gestion des étudiants"""
     
+    # Les champs de recherche des étudiants existants sont vérifiés une fois par processus
+    _recherche_verifiee = False
+    
     def __init__(self):
         """Initialise le service avec les connexions aux bases de données"""
         self.db = Database.get_db()
         self.redis = Database.get_redis_connection()
+        self.cache = CacheService("etudiant")
         self.collection = self.db.etudiants
+        self.classement = ClassementService()
+        self.statistiques_classe = StatistiquesClasseService()
+        
+        if not EtudiantService._recherche_verifiee:
+            self._assurer_champs_recherche()
+    
+    def _assurer_champs_recherche(self) -> None:
+        """
+        Renseigne les champs de recherche des étudiants qui n'en ont pas encore
+        
+        Sans eux, la recherche par préfixe et la recherche approximative ignoreraient les
+        étudiants enregistrés avant leur introduction. Un échec est journalisé sans empêcher
+        l'utilisation du service; la vérification est alors retentée au prochain service créé
+        (ou à la demande par Maintenance > Indexer la recherche).
+        """
+        from src.utils.logger import Logger
+        logger = Logger.get_instance()
+        try:
+            nombre = renseigner_champs_recherche(self.collection)
+            if nombre:
+                logger.info(f"Champs de recherche renseignés pour {nombre} étudiant(s)")
+            EtudiantService._recherche_verifiee = True
+        except Exception as e:
+            logger.error(f"Erreur lors du renseignement des champs de recherche: {e}")
     
     def ajouter_etudiant(self, etudiant: Etudiant) -> str:
         """
@@ -25,22 +78,81 @@ class EtudiantService:
             L'ID de l'étudiant créé
             
         Raises:
-            ValueError: Si le numéro de téléphone existe déjà
+            ValueError: Si une matière ou une note est invalide, ou si le numéro de téléphone existe déjà
         """
-        # Vérifier si le téléphone existe déjà
-        if self.collection.find_one({"telephone": etudiant.telephone}):
-            raise ValueError(f"Un étudiant avec le numéro {etudiant.telephone} existe déjà")
+        valider_notes(etudiant.notes)
         
-        # Insérer dans MongoDB
-        result = self.collection.insert_one(etudiant.to_dict())
+        # Insérer dans MongoDB (l'unicité du téléphone est garantie par l'index unique)
+        document = document_etudiant(etudiant)
+        try:
+            result = self.collection.insert_one(document)
+        except DuplicateKeyError:
+            raise ValueError(f"Un étudiant avec le numéro {etudiant.telephone} existe déjà")
+        self.statistiques_classe.appliquer(None, document)
         etudiant._id = str(result.inserted_id)
         
         # Ajouter dans Redis
-        self.redis.set(f"etudiant:{etudiant._id}", etudiant.to_json())
-        self.redis.set(f"etudiant:telephone:{etudiant.telephone}", etudiant._id)
+        self.cache.mettre_en_cache(etudiant._id, etudiant.to_json(), {"telephone": etudiant.telephone})
+        self.classement.mettre_a_jour(etudiant)
         
         return etudiant._id
     
+    def ajouter_etudiants_en_masse(self, etudiants: Iterable[Etudiant], taille_lot: int = 1000) -> Dict[str, List]:
+        """
+        Ajoute un grand nombre d'étudiants par lots (insert_many)
+        
+        Les doublons de téléphone sont détectés en une passe: un ensemble en mémoire
+        pour les doublons internes au lot importé, puis une seule requête $in par lot
+        pour ceux déjà présents en base.
+        
+        Args:
+            etudiants: Les étudiants à ajouter (itérable, éventuellement un générateur)
+            taille_lot: Nombre d'étudiants insérés par requête
+            
+        Returns:
+            Rapport {"inseres": [ids], "doublons": [téléphones], "invalides": [{"telephone", "erreur"}]}
+        """
+        rapport = {"inseres": [], "doublons": [], "invalides": []}
+        for lot in lots_a_inserer(etudiants, rapport, taille_lot):
+            self._inserer_lot(lot, rapport)
+        return rapport
+    
+    def _inserer_lot(self, lot: List[Etudiant], rapport: Dict[str, List]) -> None:
+        """
+        Insère un lot d'étudiants et met à jour le rapport et le cache Redis
+        
+        Args:
+            lot: Les étudiants du lot (sans doublon interne)
+            rapport: Le rapport d'importation à compléter
+        """
+        # Une seule requête pour détecter les téléphones déjà présents en base
+        telephones = [etudiant.telephone for etudiant in lot]
+        existants = {
+            data["telephone"]
+            for data in self.collection.find({"telephone": {"$in": telephones}}, {"telephone": 1})
+        }
+        
+        a_inserer = retirer_existants(lot, existants, rapport)
+        if not a_inserer:
+            return
+        
+        # insert_many renseigne l'_id de chaque document avant l'envoi
+        documents = [document_etudiant(etudiant) for etudiant in a_inserer]
+        erreurs = []
+        try:
+            self.collection.insert_many(documents, ordered=False)
+        except BulkWriteError as e:
+            erreurs = e.details.get("writeErrors", [])
+        inseres, documents_inseres = noter_insertion(a_inserer, documents, erreurs, rapport)
+        
+        # Alimenter Redis en un seul aller-retour pour tout le lot
+        if inseres:
+            self.cache.mettre_en_cache_lot(
+                (etudiant._id, etudiant.to_json(), {"telephone": etudiant.telephone}) for etudiant in inseres
+            )
+            self.classement.ajouter_lot(inseres)
+            self.statistiques_classe.ajouter_lot(documents_inseres)
+    
     def obtenir_etudiant(self, etudiant_id: str) -> Optional[Etudiant]:
         """
         Récupère un étudiant par son ID
@@ -53,37 +165,26 @@ class EtudiantService:
         """
         try:
             # Essayer d'abord Redis
-            etudiant_json = self.redis.get(f"etudiant:{etudiant_id}")
-            if etudiant_json:
-                etudiant = Etudiant.from_json(etudiant_json)
-                # Vérifier que l'ID est défini correctement
-                if not etudiant._id:
-                    etudiant._id = etudiant_id
-                return etudiant
-            
-            # Sinon, chercher dans MongoDB
-            try:
-                object_id = ObjectId(etudiant_id)
-                data = self.collection.find_one({"_id": object_id})
-            except Exception:
-                # Si l'ID n'est pas un ObjectId valide, retourner None
-                from src.utils.logger import Logger
-                logger = Logger.get_instance()
-                logger.error(f"ID d'étudiant invalide: {etudiant_id}")
-                return None
-                
-            if not data:
-                return None
-            
-            # S'assurer que l'ID est correctement inclus dans les données
-            data["_id"] = etudiant_id
+            etudiant_json = self.cache.obtenir(etudiant_id)
+            if not etudiant_json:
+                if not ObjectId.is_valid(etudiant_id):
+                    from src.utils.logger import Logger
+                    Logger.get_instance().error(f"ID d'étudiant invalide: {etudiant_id}")
+                    return None
                 
-            # Créer l'objet étudiant
-            etudiant = Etudiant.from_dict(data)
-            
-            # Mettre en cache dans Redis
-            self.redis.set(f"etudiant:{etudiant._id}", etudiant.to_json())
+                # Sinon, chercher dans MongoDB (un seul lecteur à la fois pour cette clé)
+                etudiant_json = self.cache.charger_une_fois(
+                    self.cache.cle(etudiant_id),
+                    lambda: self.cache.obtenir(etudiant_id),
+                    lambda: self._charger_etudiant({"_id": ObjectId(etudiant_id)})
+                )
+                if not etudiant_json:
+                    return None
             
+            etudiant = Etudiant.from_json(etudiant_json)
+            # Vérifier que l'ID est défini correctement
+            if not etudiant._id:
+                etudiant._id = etudiant_id
             return etudiant
             
         except Exception as e:
@@ -104,40 +205,21 @@ class EtudiantService:
             L'étudiant trouvé ou None si aucun étudiant n'est trouvé
         """
         try:
-            # Vérifier d'abord dans Redis
-            etudiant_id = self.redis.get(f"etudiant:telephone:{telephone}")
-            if etudiant_id:
-                return self.obtenir_etudiant(etudiant_id)
-            
-            # Sinon, chercher dans MongoDB
-            data = self.collection.find_one({"telephone": telephone})
-            if not data:
-                return None
-                
-            # S'assurer que l'ID est correctement inclus dans les données
-            if "_id" in data and data["_id"] is not None:
-                data["_id"] = str(data["_id"])
-            else:
-                # Log une erreur si l'ID est manquant
-                from src.utils.logger import Logger
-                logger = Logger.get_instance()
-                logger.error(f"Étudiant trouvé avec téléphone {telephone} mais sans ID valide dans la base de données")
-                return None
-                
-            etudiant = Etudiant.from_dict(data)
+            # Vérifier d'abord dans Redis (index téléphone -> ID, puis étudiant)
+            etudiant_json = self.cache.obtenir_par_index("telephone", telephone)
+            if not etudiant_json:
+                # Sinon, chercher dans MongoDB (un seul lecteur à la fois pour ce téléphone)
+                etudiant_json = self.cache.charger_une_fois(
+                    self.cache.cle_index("telephone", telephone),
+                    lambda: self.cache.obtenir_par_index("telephone", telephone),
+                    lambda: self._charger_par_telephone(telephone)
+                )
             
-            # Vérifier que l'étudiant a bien un ID avant de le mettre en cache
-            if not etudiant._id:
-                from src.utils.logger import Logger
-                logger = Logger.get_instance()
-                logger.error(f"Impossible de créer un étudiant avec un ID valide à partir des données: {data}")
+            # Téléphone inconnu (éventuellement connu comme tel par le cache négatif)
+            if not etudiant_json or etudiant_json == MARQUEUR_ABSENT:
                 return None
             
-            # Mettre en cache dans Redis
-            self.redis.set(f"etudiant:{etudiant._id}", etudiant.to_json())
-            self.redis.set(f"etudiant:telephone:{telephone}", etudiant._id)
-            
-            return etudiant
+            return Etudiant.from_json(etudiant_json)
             
         except Exception as e:
             # Log l'erreur
@@ -146,80 +228,420 @@ class EtudiantService:
             logger.error(f"Erreur lors de la récupération de l'étudiant par téléphone {telephone}: {e}")
             return None
     
-    def rechercher_etudiants(self, critere: Dict[str, Any]) -> List[Etudiant]:
+    def _charger_par_telephone(self, telephone: str) -> str:
+        """Lit un étudiant par téléphone dans MongoDB; s'il n'existe pas, l'inscrit au cache négatif"""
+        return self._charger_etudiant({"telephone": telephone}) or self.cache.marquer_absent("telephone", telephone)
+    
+    def _charger_etudiant(self, filtre: Dict[str, Any]) -> Optional[str]:
+        """
+        Lit un étudiant dans MongoDB et le met en cache avec son index téléphone
+        
+        La mise en cache est conditionnée à la version: un lecteur lent ne remplace pas
+        l'entrée plus récente écrite entre-temps par une mise à jour.
+        
+        Returns:
+            Le JSON de l'étudiant, ou None s'il n'existe pas
+        """
+        data = self.collection.find_one(filtre, PROJECTION_ETUDIANT)
+        if not data:
+            return None
+        
+        etudiant = Etudiant.from_dict(data)
+        etudiant_json = etudiant.to_json()
+        self.cache.mettre_en_cache_versionne(
+            [(etudiant._id, etudiant_json, etudiant.version, {"telephone": etudiant.telephone})]
+        )
+        return etudiant_json
+    
+    def rechercher_etudiants(self, critere: Dict[str, Any],
+                             projection: Optional[Dict[str, Any]] = None) -> List[Etudiant]:
         """
         Recherche des étudiants selon différents critères
         
         Args:
             critere: Dictionnaire des critères de recherche
+            projection: Champs à récupérer (par défaut, ceux d'un Etudiant)
             
         Returns:
             Liste des étudiants correspondants
         """
-        resultats = self.collection.find(critere)
+        resultats = self.collection.find(critere, projection or PROJECTION_ETUDIANT)
         etudiants = [Etudiant.from_dict(data) for data in resultats]
         
         return etudiants
     
-    def lister_etudiants(self) -> List[Etudiant]:
+    def rechercher_resumes(self, critere: Optional[Dict[str, Any]] = None) -> List[EtudiantResume]:
+        """
+        Recherche des étudiants sans le détail de leurs notes
+        
+        La moyenne est calculée par MongoDB dans la projection: seuls les champs
+        affichés dans les listes et les exports sont transférés.
+        
+        Args:
+            critere: Critères de recherche (si None, tous les étudiants)
+            
+        Returns:
+            Liste des résumés des étudiants correspondants
+        """
+        resultats = self.collection.find(critere or {}, PROJECTION_RESUME)
+        return [EtudiantResume.from_dict(data) for data in resultats]
+    
+    def rechercher_par_prefixe(self, champ: str, texte: str, limit: int = 50) -> List[EtudiantResume]:
+        """
+        Recherche les étudiants dont un champ commence par un texte
+        
+        La comparaison porte sur la version normalisée du champ (minuscules, sans
+        accents): l'expression régulière ancrée (^...) est résolue par l'index.
+        Contrairement à l'ancienne recherche par sous-chaîne, un texte situé au milieu
+        du champ ne correspond pas ("1" ne trouve plus la classe "L1"); la recherche
+        approximative couvre les noms et prénoms mal orthographiés.
+        
+        Args:
+            champ: Le champ recherché ("nom", "prenom" ou "classe")
+            texte: Le début du champ, tel que saisi
+            limit: Nombre maximal de résultats
+            
+        Returns:
+            Liste des résumés des étudiants correspondants, triés par ce champ
+        """
+        if champ not in CHAMPS_PREFIXE:
+            raise ValueError(f"Champ de recherche inconnu: {champ}")
+        
+        cle = f"recherche.{champ}"
+        resultats = (
+            self.collection.find({cle: {"$regex": f"^{re.escape(normaliser(texte))}"}}, PROJECTION_RESUME)
+            .sort([(cle, ASCENDING), ("_id", ASCENDING)])
+            .limit(limit)
+        )
+        return [EtudiantResume.from_dict(data) for data in resultats]
+    
+    def rechercher_approximatif(self, texte: str, limit: int = 20) -> List[EtudiantResume]:
+        """
+        Recherche les étudiants par nom et prénom en tolérant les fautes de frappe
+        
+        Les candidats partageant au moins un trigramme avec la saisie sont trouvés par
+        l'index multiclé sur recherche.trigrammes, puis classés par similarité
+        (trigrammes communs / trigrammes distincts des deux textes).
+        
+        Args:
+            texte: Le nom et/ou le prénom saisis
+            limit: Nombre maximal de résultats
+            
+        Returns:
+            Liste des résumés des étudiants les plus proches, du plus au moins pertinent
+        """
+        trigrammes_saisie = trigrammes(texte)
+        if not trigrammes_saisie:
+            return []
+        
+        communs = {"$size": {"$setIntersection": ["$recherche.trigrammes", trigrammes_saisie]}}
+        resultats = self.collection.aggregate([
+            {"$match": {"recherche.trigrammes": {"$in": trigrammes_saisie}}},
+            {"$addFields": {"communs": communs}},
+            {"$match": {"communs": {"$gte": max(1, round(len(trigrammes_saisie) * SEUIL_TRIGRAMMES))}}},
+            {"$addFields": {"score": {"$divide": [
+                "$communs",
+                {"$subtract": [{"$add": [{"$size": "$recherche.trigrammes"}, len(trigrammes_saisie)]}, "$communs"]}
+            ]}}},
+            {"$sort": {"score": -1, "_id": 1}},
+            {"$limit": limit},
+            {"$project": PROJECTION_RESUME}
+        ])
+        return [EtudiantResume.from_dict(data) for data in resultats]
+    
+    def indexer_recherche(self, taille_lot: int = 1000) -> int:
+        """
+        Renseigne les champs de recherche des étudiants enregistrés avant leur introduction
+        
+        Ce renseignement est fait à la création du premier service du processus; cette
+        méthode le relance à la demande, par exemple après un échec.
+        
+        Args:
+            taille_lot: Nombre de mises à jour envoyées par requête
+            
+        Returns:
+            Le nombre d'étudiants indexés
+        """
+        return renseigner_champs_recherche(self.collection, taille_lot)
+    
+    def rapport_utilisation_index(self) -> List[Dict[str, Any]]:
+        """
+        Rapporte l'utilisation des index déclarés des étudiants et des utilisateurs
+        
+        Returns:
+            Liste de dictionnaires (collection, index, nombre d'utilisations, depuis)
+        """
+        return IndexManager(self.db).rapport_utilisation()
+    
+    def lister_etudiants(self, projection: Optional[Dict[str, Any]] = None) -> List[Etudiant]:
         """
         Liste tous les étudiants
         
+        Args:
+            projection: Champs à récupérer (par défaut, ceux d'un Etudiant)
+        
         Returns:
             Liste de tous les étudiants
         """
-        resultats = self.collection.find()
-        return [Etudiant.from_dict(data) for data in resultats]
+        return self.rechercher_etudiants({}, projection)
+    
+    def lister_etudiants_page(self, taille_page: int = 20, apres: Optional[Tuple] = None,
+                              avant: Optional[Tuple] = None, tri: str = "id",
+                              critere: Optional[Dict[str, Any]] = None,
+                              projection: Optional[Dict[str, int]] = None) -> Dict[str, Any]:
+        """
+        Retourne une page d'étudiants par pagination par curseur (keyset)
+        
+        Au lieu de sauter les documents précédents (skip), la requête reprend après
+        (ou avant) les valeurs des clés de tri d'un étudiant de bord de page, ce qui
+        garde un coût constant quel que soit le rang de la page.
+        
+        Args:
+            taille_page: Nombre d'étudiants par page
+            apres: Curseur de fin de la page précédente (page suivante)
+            avant: Curseur de début de la page suivante (page précédente)
+            tri: Ordre de parcours, clé de TRIS_PAGINATION ("id" ou "classe")
+            critere: Critères de filtrage (si None, tous les étudiants)
+            projection: Champs à récupérer (par défaut, ceux d'un Etudiant)
+            
+        Returns:
+            Dictionnaire {etudiants, debut, fin, page_precedente, page_suivante} où debut et
+            fin sont les curseurs des étudiants de bord de page
+        """
+        if tri not in TRIS_PAGINATION:
+            raise ValueError(f"Tri de pagination inconnu: {tri}")
+        
+        cles = TRIS_PAGINATION[tri]
+        projection = dict(projection or PROJECTION_ETUDIANT)
+        projection.update({cle: 1 for cle in cles})
+        
+        # En arrière, on parcourt l'index dans l'ordre inverse puis on remet la page à l'endroit
+        en_arriere = avant is not None
+        curseur = avant if en_arriere else apres
+        sens = DESCENDING if en_arriere else ASCENDING
+        
+        filtres = [critere] if critere else []
+        if curseur is not None:
+            filtres.append(self._condition_curseur(cles, curseur, "$lt" if en_arriere else "$gt"))
+        requete = {"$and": filtres} if len(filtres) > 1 else (filtres[0] if filtres else {})
+        
+        # Un document de plus indique s'il reste une page dans le sens du parcours
+        documents = list(
+            self.collection.find(requete, projection)
+            .sort([(cle, sens) for cle in cles])
+            .limit(taille_page + 1)
+        )
+        encore = len(documents) > taille_page
+        documents = documents[:taille_page]
+        if en_arriere:
+            documents.reverse()
+        
+        return {
+            "etudiants": [Etudiant.from_dict(data) for data in documents],
+            "debut": tuple(documents[0].get(cle) for cle in cles) if documents else None,
+            "fin": tuple(documents[-1].get(cle) for cle in cles) if documents else None,
+            "page_precedente": encore if en_arriere else apres is not None,
+            "page_suivante": True if en_arriere else encore
+        }
+    
+    @staticmethod
+    def _condition_curseur(cles: List[str], valeurs: Tuple, operateur: str) -> Dict[str, Any]:
+        """
+        Construit le filtre "clés de tri après (ou avant) le curseur"
+        
+        Pour (classe, nom, _id) et $gt: classe > c, ou classe = c et nom > n,
+        ou classe = c, nom = n et _id > i.
+        
+        Une classe ou un nom absent (null) est trié avant toute valeur, mais $gt et $lt
+        ne comparent pas null aux chaînes: ces cas sont traduits explicitement.
+        """
+        valeurs = list(valeurs)
+        if cles[-1] == "_id" and not isinstance(valeurs[-1], ObjectId):
+            valeurs[-1] = ObjectId(valeurs[-1])
+        
+        conditions = []
+        for i, cle in enumerate(cles):
+            comparaison = EtudiantService._comparaison(cle, operateur, valeurs[i])
+            if comparaison is None:
+                continue
+            egalites = {cles[j]: valeurs[j] for j in range(i)}
+            conditions.append({"$and": [egalites, comparaison]} if egalites else comparaison)
+        
+        if not conditions:
+            # Rien n'est trié avant null: aucun document ne précède le curseur
+            return {"_id": {"$exists": False}}
+        return conditions[0] if len(conditions) == 1 else {"$or": conditions}
+    
+    @staticmethod
+    def _comparaison(cle: str, operateur: str, valeur: Any) -> Optional[Dict[str, Any]]:
+        """
+        Construit le filtre "cle après (ou avant) valeur" dans l'ordre de tri MongoDB
+        
+        Returns:
+            Le filtre, ou None si aucune valeur n'est avant null
+        """
+        if valeur is None:
+            return {cle: {"$ne": None}} if operateur == "$gt" else None
+        if operateur == "$lt":
+            return {"$or": [{cle: {"$lt": valeur}}, {cle: None}]}
+        return {cle: {operateur: valeur}}
+    
+    def iterer_etudiants(self, critere: Optional[Dict[str, Any]] = None,
+                         taille_lot: int = 1000) -> Iterator[Etudiant]:
+        """
+        Parcourt les étudiants via un curseur MongoDB sans les charger tous en mémoire
+        
+        Args:
+            critere: Critères de filtrage (si None, tous les étudiants)
+            taille_lot: Nombre de documents récupérés par aller-retour réseau
+            
+        Returns:
+            Un itérateur sur les étudiants
+        """
+        curseur = self.collection.find(critere or {}, PROJECTION_ETUDIANT, batch_size=taille_lot)
+        for data in curseur:
+            yield Etudiant.from_dict(data)
+    
+    def construire_classe_frame(self, critere: Optional[Dict[str, Any]] = None,
+                                taille_lot: int = 1000) -> ClasseFrame:
+        """
+        Charge les notes des étudiants dans une structure en colonnes (NumPy)
+        
+        Args:
+            critere: Critères de filtrage (si None, tous les étudiants)
+            taille_lot: Nombre de documents récupérés par aller-retour réseau
+            
+        Returns:
+            La structure en colonnes, pour les calculs vectorisés
+        """
+        curseur = self.collection.find(critere or {}, {"_id": 1, "classe": 1, "notes": 1}, batch_size=taille_lot)
+        return ClasseFrame.depuis_documents(curseur)
     
-    def lister_etudiants_par_classe(self, classe: str) -> List[Etudiant]:
+    def statistiques_de_classe(self, classe: str) -> Dict[str, Any]:
+        """
+        Retourne les statistiques d'une classe
+        
+        Les statistiques matérialisées sont lues en priorité; tant qu'elles ne sont pas
+        disponibles (avant leur première vérification), elles sont calculées à la volée
+        sur les notes de la classe.
+        
+        Args:
+            classe: La classe
+            
+        Returns:
+            Les statistiques (nombre à 0 si la classe n'a aucun étudiant)
+        """
+        stats = self.statistiques_classe.obtenir(classe)
+        if stats is not None:
+            return stats
+        
+        frame = self.construire_classe_frame({"classe": classe})
+        moyennes = frame.moyennes()
+        avec_notes = frame.nombre_notes() > 0
+        return {
+            "classe": classe,
+            "nombre": len(frame),
+            "nb_avec_notes": int(avec_notes.sum()),
+            "moyenne": float(moyennes.mean()) if len(frame) else 0.0,
+            "moyenne_avec_notes": float(moyennes[avec_notes].mean()) if avec_notes.any() else 0.0,
+            "mentions": frame.repartition_mentions(),
+            "matieres": frame.statistiques_matieres()
+        }
+    
+    def compter_etudiants(self, critere: Optional[Dict[str, Any]] = None) -> int:
+        """
+        Compte les étudiants correspondant à des critères
+        
+        Args:
+            critere: Critères de filtrage (si None, tous les étudiants)
+            
+        Returns:
+            Le nombre d'étudiants
+        """
+        return self.collection.count_documents(critere or {})
+    
+    def lister_etudiants_par_classe(self, classe: str,
+                                    projection: Optional[Dict[str, Any]] = None) -> List[Etudiant]:
         """
         Liste tous les étudiants d'une classe
         
         Args:
             classe: La classe recherchée
+            projection: Champs à récupérer (par défaut, ceux d'un Etudiant)
             
         Returns:
             Liste des étudiants de cette classe
         """
-        return self.rechercher_etudiants({"classe": classe})
+        return self.rechercher_etudiants({"classe": classe}, projection)
     
     def mettre_a_jour_etudiant(self, etudiant: Etudiant) -> bool:
         """
         Met à jour un étudiant
         
+        La mise à jour est conditionnée à la version lue. Si le document a été modifié
+        entre-temps, les modifications locales sont réappliquées sur la version actuelle
+        (les notes de matières différentes se fusionnent) et l'écriture est retentée.
+        Un étudiant non modifié depuis sa lecture n'est pas écrit.
+        
         Args:
             etudiant: L'étudiant à mettre à jour
             
         Returns:
-            True si la mise à jour a réussi, False sinon
+            True si la mise à jour a réussi, False sinon (y compris sans modification)
+            
+        Raises:
+            ValueError: Si une matière ou une note est invalide
+            VersionConflictError: Si les modifications entrent en conflit avec celles d'un autre utilisateur
         """
-        if not etudiant._id:
+        if not etudiant._id or not etudiant.est_modifie():
             return False
+        valider_notes(etudiant.notes)
         
         try:
             # Convertir l'ID en ObjectId si c'est une chaîne
             object_id = ObjectId(etudiant._id) if isinstance(etudiant._id, str) else etudiant._id
             
-            update_data = {
-                "nom": etudiant.nom,
-                "prenom": etudiant.prenom,
-                "telephone": etudiant.telephone,
-                "classe": etudiant.classe,
-                "notes": etudiant.notes
-            }
+            for _ in range(MAX_TENTATIVES):
+                update_data = donnees_mise_a_jour(etudiant)
+                
+                # Récupérer l'état précédent dans le même aller-retour pour les statistiques de classe
+                ancien = self.collection.find_one_and_update(
+                    filtre_version(object_id, etudiant.version),
+                    {"$set": update_data, "$inc": {"version": 1}},
+                    projection={**PROJECTION_ETUDIANT, "recherche": 1},
+                    return_document=ReturnDocument.BEFORE
+                )
+                if ancien is not None:
+                    break
+                
+                # Version périmée (ou étudiant supprimé): fusionner avec la version actuelle
+                actuel = self.collection.find_one({"_id": object_id}, PROJECTION_ETUDIANT)
+                if actuel is None:
+                    return False
+                rebaser(etudiant, actuel)
+            else:
+                raise VersionConflictError(
+                    f"L'étudiant {etudiant._id} est modifié trop souvent par d'autres utilisateurs; réessayez"
+                )
             
-            resultat = self.collection.update_one(
-                {"_id": object_id},
-                {"$set": update_data}
-            )
+            etudiant.marquer_enregistre((ancien.get("version") or 0) + 1)
+            modifie = any(ancien.get(champ) != valeur for champ, valeur in update_data.items())
             
-            # Mettre à jour le cache Redis
-            if resultat.modified_count > 0:
-                self.redis.set(f"etudiant:{etudiant._id}", etudiant.to_json())
-                self.redis.set(f"etudiant:telephone:{etudiant.telephone}", etudiant._id)
-                return True
+            if modifie:
+                self.statistiques_classe.appliquer(ancien, update_data)
+                if ancien.get("telephone") != etudiant.telephone:
+                    self.cache.invalider_index({"telephone": ancien.get("telephone")})
             
-            return False
+            # Mettre à jour le cache Redis (sans écraser une version plus récente), même
+            # pour une écriture sans effet: la version du document a augmenté
+            self.cache.mettre_en_cache_versionne(
+                [(etudiant._id, etudiant.to_json(), etudiant.version, {"telephone": etudiant.telephone})]
+            )
+            if modifie:
+                self.classement.mettre_a_jour(etudiant)
+            return modifie
+        except VersionConflictError:
+            raise
         except Exception as e:
             # Importation conditionnelle pour éviter une dépendance circulaire
             from src.utils.logger import Logger
@@ -227,6 +649,155 @@ class EtudiantService:
             logger.error(f"Erreur lors de la mise à jour de l'étudiant {etudiant._id}: {e}")
             return False
     
+    def saisir_notes_en_masse(self, matiere: str, notes: Dict[str, float],
+                              notification_service: Optional[NotificationService] = None,
+                              taille_lot: int = 1000) -> Dict[str, List]:
+        """
+        Enregistre les notes d'une matière pour plusieurs étudiants
+        
+        Chaque lot coûte une lecture $in (état précédent, pour les statistiques de
+        classe) et un seul bulk_write de $set sur "notes.<matiere>", conditionnés à la
+        version lue: les autres champs ne sont pas réécrits, et les étudiants modifiés
+        entre la lecture et l'écriture sont relus puis retentés. Le cache, le classement et les statistiques sont mis à jour
+        en un aller-retour par lot, et les notifications partent sur une seule
+        connexion SMTP.
+        
+        Args:
+            matiere: La matière saisie
+            notes: Dictionnaire {id étudiant: note}
+            notification_service: Service utilisé pour notifier les étudiants (optionnel)
+            taille_lot: Nombre d'étudiants traités par requête
+            
+        Returns:
+            Rapport {"mis_a_jour": [ids], "inchanges": [ids], "introuvables": [ids],
+            "invalides": [{"id", "erreur"}], "conflits": [ids]}
+            
+        Raises:
+            ValueError: Si le nom de la matière est invalide
+        """
+        valider_matiere(matiere)
+        
+        rapport = {"mis_a_jour": [], "inchanges": [], "introuvables": [], "invalides": [], "conflits": []}
+        valides = {}
+        
+        for etudiant_id, note in notes.items():
+            if not ObjectId.is_valid(etudiant_id):
+                rapport["introuvables"].append(etudiant_id)
+            elif isinstance(note, bool) or not isinstance(note, (int, float)) or not 0 <= note <= 20:
+                rapport["invalides"].append({"id": etudiant_id, "erreur": f"Note invalide pour {matiere}: {note}"})
+            else:
+                valides[etudiant_id] = note
+        
+        ids = list(valides)
+        for debut in range(0, len(ids), taille_lot):
+            lot = {etudiant_id: valides[etudiant_id] for etudiant_id in ids[debut:debut + taille_lot]}
+            modifies = self._saisir_lot_notes(matiere, lot, rapport)
+            if modifies and notification_service is not None:
+                notification_service.notifier_notes_en_masse(modifies, matiere)
+        
+        return rapport
+    
+    def _saisir_lot_notes(self, matiere: str, lot: Dict[str, float], rapport: Dict[str, List]) -> List[Etudiant]:
+        """
+        Enregistre un lot de notes, en retentant les étudiants modifiés entre-temps
+        
+        Returns:
+            Les étudiants modifiés, avec leurs notes à jour
+        """
+        etudiants = []
+        for _ in range(MAX_TENTATIVES):
+            lot = self._ecrire_lot_notes(matiere, lot, rapport, etudiants)
+            if not lot:
+                break
+        rapport["conflits"].extend(lot)
+        return etudiants
+    
+    def _ecrire_lot_notes(self, matiere: str, lot: Dict[str, float], rapport: Dict[str, List],
+                          etudiants: List[Etudiant]) -> Dict[str, float]:
+        """
+        Écrit un lot de notes et met à jour le rapport, le cache Redis, le classement
+        et les statistiques de classe
+        
+        Args:
+            matiere: La matière saisie
+            lot: Dictionnaire {id étudiant: note}
+            rapport: Le rapport de saisie à compléter
+            etudiants: Liste complétée avec les étudiants modifiés
+            
+        Returns:
+            Les notes des étudiants modifiés par un autre processus depuis leur lecture
+        """
+        anciens = {
+            str(data["_id"]): data
+            for data in self.collection.find({"_id": {"$in": [ObjectId(etudiant_id) for etudiant_id in lot]}},
+                                             PROJECTION_ETUDIANT)
+        }
+        
+        operations = []
+        modifications = []
+        for etudiant_id, note in lot.items():
+            ancien = anciens.get(etudiant_id)
+            if ancien is None:
+                rapport["introuvables"].append(etudiant_id)
+                continue
+            anciennes_notes = ancien.get("notes") or {}
+            if anciennes_notes.get(matiere) == note:
+                rapport["inchanges"].append(etudiant_id)
+                continue
+            version = ancien.get("version") or 0
+            operations.append(UpdateOne(
+                filtre_version(ancien["_id"], version),
+                {"$set": {f"notes.{matiere}": note}, "$inc": {"version": 1}}
+            ))
+            modifications.append((ancien, {**ancien, "notes": {**anciennes_notes, matiere: note}, "version": version + 1}))
+        
+        if not operations:
+            return {}
+        
+        index_en_erreur = set()
+        try:
+            resultat = self.collection.bulk_write(operations, ordered=False)
+            appliquees = resultat.matched_count
+        except BulkWriteError as e:
+            appliquees = e.details.get("nMatched", 0)
+            for erreur in e.details.get("writeErrors", []):
+                index_en_erreur.add(erreur["index"])
+                rapport["invalides"].append({
+                    "id": str(modifications[erreur["index"]][0]["_id"]),
+                    "erreur": erreur.get("errmsg", "")
+                })
+        
+        modifications = [paire for index, paire in enumerate(modifications) if index not in index_en_erreur]
+        
+        # Des filtres de version n'ont pas correspondu: relire version et note pour savoir
+        # lesquels (un document portant la version attendue et la note écrite a été écrit ici)
+        a_retenter = {}
+        if appliquees < len(modifications):
+            actuels = {
+                data["_id"]: (data.get("version"), (data.get("notes") or {}).get(matiere))
+                for data in self.collection.find({"_id": {"$in": [ancien["_id"] for ancien, _ in modifications]}},
+                                                 {"version": 1, f"notes.{matiere}": 1})
+            }
+            ecrites = []
+            for ancien, nouveau in modifications:
+                if actuels.get(ancien["_id"]) == (nouveau["version"], nouveau["notes"][matiere]):
+                    ecrites.append((ancien, nouveau))
+                else:
+                    a_retenter[str(ancien["_id"])] = nouveau["notes"][matiere]
+            modifications = ecrites
+        
+        modifies = [Etudiant.from_dict(nouveau) for _, nouveau in modifications]
+        if modifies:
+            rapport["mis_a_jour"].extend(etudiant._id for etudiant in modifies)
+            etudiants.extend(modifies)
+            self.statistiques_classe.appliquer_lot(modifications)
+            self.cache.mettre_en_cache_versionne(
+                (etudiant._id, etudiant.to_json(), etudiant.version, None) for etudiant in modifies
+            )
+            self.classement.mettre_a_jour_scores(modifies)
+        
+        return a_retenter
+    
     def supprimer_etudiant(self, etudiant_id: str) -> bool:
         """
         Supprime un étudiant
@@ -242,12 +813,15 @@ class EtudiantService:
         if not etudiant:
             return False
         
-        resultat = self.collection.delete_one({"_id": ObjectId(etudiant_id)})
+        document = self.collection.find_one_and_delete(
+            {"_id": ObjectId(etudiant_id)}, projection=PROJECTION_ETUDIANT
+        )
         
         # Supprimer les entrées dans Redis
-        if resultat.deleted_count > 0:
-            self.redis.delete(f"etudiant:{etudiant_id}")
-            self.redis.delete(f"etudiant:telephone:{etudiant.telephone}")
+        if document is not None:
+            self.statistiques_classe.appliquer(document, None)
+            self.cache.invalider(etudiant_id, {"telephone": document["telephone"]})
+            self.classement.supprimer(etudiant_id)
             return True
         
         return False
@@ -256,6 +830,9 @@ class EtudiantService:
         """
         Trie les étudiants par moyenne décroissante
         
+        Les moyennes sont calculées et triées par NumPy (ClasseFrame), avec le même
+        arrondi que les mentions; les ex aequo gardent leur ordre d'origine.
+        
         Args:
             etudiants: Liste d'étudiants à trier (si None, récupère tous les étudiants)
             
@@ -265,7 +842,7 @@ class EtudiantService:
         if etudiants is None:
             etudiants = self.lister_etudiants()
         
-        return sorted(etudiants, key=lambda e: e.moyenne, reverse=True)
+        return [etudiants[i] for i in ClasseFrame.depuis_etudiants(etudiants).ordre()]
     
     def calculer_moyenne_classe(self, classe: str) -> float:
         """
@@ -277,21 +854,181 @@ class EtudiantService:
         Returns:
             La moyenne générale de la classe
         """
-        etudiants = self.lister_etudiants_par_classe(classe)
-        if not etudiants:
+        # Lecture O(1) des statistiques matérialisées lorsqu'elles sont disponibles
+        stats = self.statistiques_classe.obtenir(classe)
+        if stats is not None:
+            return stats["moyenne"]
+        
+        # Sinon, calcul vectorisé sans construire d'objets Etudiant
+        frame = self.construire_classe_frame({"classe": classe})
+        if not len(frame):
             return 0.0
         
-        return sum(etudiant.moyenne for etudiant in etudiants) / len(etudiants)
+        return float(frame.moyennes().mean())
     
-    def top_etudiants(self, limit: int = 10) -> List[Etudiant]:
+    def top_etudiants(self, limit: int = 10, classe: Optional[str] = None, skip: int = 0,
+                      apres: Optional[Tuple[float, str]] = None) -> List[Etudiant]:
         """
         Retourne les meilleurs étudiants par moyenne
         
+        Le classement est lu dans les sorted sets Redis maintenus à chaque écriture.
+        S'ils ne sont pas initialisés (ou pour la pagination par curseur), il est
+        calculé par MongoDB (pipeline d'agrégation $sort + $limit).
+        
         Args:
             limit: Nombre d'étudiants à retourner
+            classe: Restreint le classement à une classe (optionnel)
+            skip: Nombre d'étudiants à sauter (pagination par décalage)
+            apres: Couple (moyenne, id) du dernier étudiant de la page précédente
+                   (pagination par curseur, préférable à skip pour les pages lointaines)
+            
+        Returns:
+            Liste des meilleurs étudiants, par moyenne décroissante
+        """
+        if apres is None:
+            classement = self.classement.top(limit, classe, skip)
+            if classement is not None:
+                return self.obtenir_etudiants([etudiant_id for etudiant_id, _ in classement])
+        
+        pipeline = []
+        
+        if classe is not None:
+            pipeline.append({"$match": {"classe": classe}})
+        
+        pipeline.append({"$addFields": {"moyenne": EXPRESSION_MOYENNE}})
+        
+        if apres is not None:
+            moyenne, etudiant_id = apres
+            pipeline.append({"$match": {"$or": [
+                {"moyenne": {"$lt": moyenne}},
+                {"moyenne": moyenne, "_id": {"$lt": ObjectId(etudiant_id)}}
+            ]}})
+        
+        # _id décroissant départage les ex aequo, dans le même ordre que ZREVRANGE (ClassementService)
+        pipeline.append({"$sort": {"moyenne": -1, "_id": -1}})
+        
+        if skip:
+            pipeline.append({"$skip": skip})
+        
+        pipeline.append({"$limit": limit})
+        pipeline.append({"$project": PROJECTION_ETUDIANT})
+        
+        return [Etudiant.from_dict(data) for data in self.collection.aggregate(pipeline)]
+    
+    def rang_etudiant(self, etudiant_id: str, classe: Optional[str] = None) -> Optional[int]:
+        """
+        Retourne le rang d'un étudiant par moyenne décroissante (1 = meilleure moyenne)
+        
+        Le rang est lu dans les sorted sets Redis (ZREVRANK). S'ils ne sont pas
+        initialisés, il est compté par MongoDB, avec le même départage des ex aequo.
+        
+        Args:
+            etudiant_id: L'ID de l'étudiant
+            classe: Rang dans cette classe plutôt que dans l'établissement (optionnel)
+            
+        Returns:
+            Le rang, ou None si l'étudiant n'existe pas (ou n'est pas dans la classe)
+        """
+        rang = self.classement.rang(etudiant_id, classe)
+        if rang is not None or self.classement.est_initialise():
+            return rang
+        
+        identifiant = ObjectId(etudiant_id)
+        documents = list(self.collection.aggregate([
+            {"$match": {"_id": identifiant}},
+            {"$project": {"classe": 1, "moyenne": EXPRESSION_MOYENNE}}
+        ]))
+        if not documents or (classe is not None and documents[0].get("classe") != classe):
+            return None
+        moyenne = documents[0]["moyenne"]
+        
+        pipeline = [{"$match": {"classe": classe}}] if classe is not None else []
+        pipeline += [
+            {"$addFields": {"moyenne": EXPRESSION_MOYENNE}},
+            # Précèdent l'étudiant: les meilleures moyennes, puis les ex aequo d'_id supérieur
+            {"$match": {"$or": [
+                {"moyenne": {"$gt": moyenne}},
+                {"moyenne": moyenne, "_id": {"$gt": identifiant}}
+            ]}},
+            {"$count": "nombre"}
+        ]
+        resultat = list(self.collection.aggregate(pipeline))
+        return (resultat[0]["nombre"] if resultat else 0) + 1
+    
+    def etudiants_entre(self, minimum: float, maximum: float, classe: Optional[str] = None,
+                        limit: int = 100) -> List[Etudiant]:
+        """
+        Retourne les étudiants dont la moyenne est dans [minimum, maximum[
+        
+        Les étudiants sont lus dans les sorted sets Redis (ZREVRANGEBYSCORE). S'ils ne
+        sont pas initialisés, ils sont sélectionnés par MongoDB.
+        
+        Args:
+            minimum: Moyenne minimale (incluse)
+            maximum: Moyenne maximale (exclue)
+            classe: Restreint la recherche à une classe (optionnel)
+            limit: Nombre maximal d'étudiants
             
         Returns:
-            Liste des meilleurs étudiants
+            Liste des étudiants, par moyenne décroissante
+        """
+        classement = self.classement.entre(minimum, maximum, classe, limit)
+        if classement is not None:
+            return self.obtenir_etudiants([etudiant_id for etudiant_id, _ in classement])
+        
+        pipeline = [{"$match": {"classe": classe}}] if classe is not None else []
+        pipeline += [
+            {"$addFields": {"moyenne": EXPRESSION_MOYENNE}},
+            {"$match": {"moyenne": {"$gte": minimum, "$lt": maximum}}},
+            {"$sort": {"moyenne": -1, "_id": -1}},
+            {"$limit": limit},
+            {"$project": PROJECTION_ETUDIANT}
+        ]
+        return [Etudiant.from_dict(data) for data in self.collection.aggregate(pipeline)]
+    
+    def obtenir_etudiants(self, etudiant_ids: List[str]) -> List[Etudiant]:
+        """
+        Récupère plusieurs étudiants par leurs IDs
+        
+        Le cache est lu en un seul MGET; les étudiants absents sont récupérés par une
+        seule requête $in puis remis en cache en un seul aller-retour.
+        
+        Args:
+            etudiant_ids: Les IDs des étudiants
+            
+        Returns:
+            Les étudiants trouvés, dans l'ordre des IDs
+        """
+        trouves = {}
+        manquants = []
+        
+        for etudiant_id, etudiant_json in zip(etudiant_ids, self.cache.obtenir_plusieurs(etudiant_ids)):
+            if etudiant_json:
+                trouves[etudiant_id] = Etudiant.from_json(etudiant_json)
+            elif ObjectId.is_valid(etudiant_id):
+                manquants.append(ObjectId(etudiant_id))
+        
+        if manquants:
+            recuperes = [
+                Etudiant.from_dict(data)
+                for data in self.collection.find({"_id": {"$in": manquants}}, PROJECTION_ETUDIANT)
+            ]
+            for etudiant in recuperes:
+                trouves[etudiant._id] = etudiant
+            self.cache.mettre_en_cache_versionne(
+                (etudiant._id, etudiant.to_json(), etudiant.version, None) for etudiant in recuperes
+            )
+        
+        return [trouves[etudiant_id] for etudiant_id in etudiant_ids if etudiant_id in trouves]
+    
+    def reconstruire_classement(self) -> int:
+        """
+        Reconstruit le classement Redis à partir de MongoDB
+        
+        Returns:
+            Le nombre d'étudiants classés
         """
-        etudiants_tries = self.trier_etudiants_par_moyenne()
-        return etudiants_tries[:limit] 
\ No newline at end of file
+        documents = self.collection.aggregate([
+            {"$project": {"classe": 1, "moyenne": EXPRESSION_MOYENNE}}
+        ])
+        return self.classement.reconstruire(documents)
\ No newline at end of file
@@ -0,0 +1,486 @@
+import asyncio
+from typing import List, Dict, Any, Optional, Iterable
+from bson import ObjectId
+from pymongo import ReturnDocument
+from pymongo.errors import DuplicateKeyError, BulkWriteError
+
+from src.models.etudiant import Etudiant
+from src.models.etudiant_resume import EtudiantResume
+from src.config.database import Database
+from src.services.cache_service import MARQUEUR_ABSENT
+from src.services.cache_service_async import CacheServiceAsync
+from src.services.classement_service_async import ClassementServiceAsync
+from src.services.notification_service import NotificationService
+from src.services.etudiant.agregation import PROJECTION_ETUDIANT, PROJECTION_RESUME, EXPRESSION_MOYENNE
+from src.services.etudiant.statistiques_classe_service_async import StatistiquesClasseServiceAsync
+from src.services.etudiant.documents import (
+    document_etudiant, donnees_mise_a_jour, lots_a_inserer, retirer_existants, noter_insertion, valider_notes
+)
+from src.services.etudiant.versions import MAX_TENTATIVES, filtre_version, rebaser
+from src.utils.exception.exceptions import VersionConflictError
+from src.utils.concurrence import executer_en_parallele, executer_en_flux, decouper
+from src.utils.logger import Logger
+
+class EtudiantServiceAsync:
+    """
+    Service asyncio de gestion des étudiants (motor + redis.asyncio)
+
+    Expose les mêmes opérations qu'EtudiantService, avec les mêmes documents et les
+    mêmes clés de cache, pour que les traitements par lots (hydratation de nombreux
+    IDs, rapports de classe, imports) fassent leurs entrées/sorties en parallèle.
+    Le classement et les statistiques de classe sont tenus par leurs versions asyncio,
+    qui écrivent les mêmes clés Redis et documents MongoDB.
+
+    Les clients sont liés à la boucle d'événements: le service s'utilise dans un
+    bloc "async with" au sein d'une même boucle.
+    """
+
+    def __init__(self, limite_concurrence: int = 10):
+        """
+        Initialise le service avec ses propres clients asyncio
+
+        Args:
+            limite_concurrence: Nombre maximal d'opérations simultanées des traitements par lots
+        """
+        self.client, self.db, self.redis = Database.creer_connexions_async()
+        self.cache = CacheServiceAsync("etudiant", self.redis)
+        self.collection = self.db.etudiants
+        self.classement = ClassementServiceAsync(self.redis)
+        self.statistiques_classe = StatistiquesClasseServiceAsync(self.db)
+        self.limite_concurrence = limite_concurrence
+        self.logger = Logger.get_instance()
+
+    async def __aenter__(self) -> 'EtudiantServiceAsync':
+        """Permet d'utiliser le service dans un bloc async with"""
+        return self
+
+    async def __aexit__(self, *exc) -> None:
+        """Ferme les clients à la sortie du bloc async with"""
+        await self.fermer()
+
+    async def fermer(self) -> None:
+        """Ferme les clients MongoDB et Redis du service"""
+        self.client.close()
+        await self.redis.aclose()
+
+    async def ajouter_etudiant(self, etudiant: Etudiant) -> str:
+        """
+        Ajoute un étudiant à la base de données
+
+        Args:
+            etudiant: L'étudiant à ajouter
+
+        Returns:
+            L'ID de l'étudiant créé
+
+        Raises:
+            ValueError: Si une matière ou une note est invalide, ou si le numéro de téléphone existe déjà
+        """
+        valider_notes(etudiant.notes)
+        document = document_etudiant(etudiant)
+        try:
+            result = await self.collection.insert_one(document)
+        except DuplicateKeyError:
+            raise ValueError(f"Un étudiant avec le numéro {etudiant.telephone} existe déjà")
+        etudiant._id = str(result.inserted_id)
+
+        await asyncio.gather(
+            self.statistiques_classe.appliquer(None, document),
+            self.cache.mettre_en_cache(etudiant._id, etudiant.to_json(), {"telephone": etudiant.telephone}),
+            self.classement.mettre_a_jour(etudiant)
+        )
+
+        return etudiant._id
+
+    async def ajouter_etudiants_en_masse(self, etudiants: Iterable[Etudiant], taille_lot: int = 1000) -> Dict[str, List]:
+        """
+        Ajoute un grand nombre d'étudiants par lots insérés en parallèle
+
+        Les étudiants sont lus au fur et à mesure: au plus limite_concurrence lots sont
+        en mémoire à la fois, comme avec EtudiantService pour un générateur.
+
+        Args:
+            etudiants: Les étudiants à ajouter (itérable, éventuellement un générateur)
+            taille_lot: Nombre d'étudiants insérés par requête
+
+        Returns:
+            Rapport {"inseres": [ids], "doublons": [téléphones], "invalides": [{"telephone", "erreur"}]}
+        """
+        rapport = {"inseres": [], "doublons": [], "invalides": []}
+
+        # Les lots n'ont aucun téléphone en commun: ils peuvent être insérés simultanément
+        await executer_en_flux(
+            lambda lot: self._inserer_lot(lot, rapport), lots_a_inserer(etudiants, rapport, taille_lot),
+            self.limite_concurrence
+        )
+
+        return rapport
+
+    async def _inserer_lot(self, lot: List[Etudiant], rapport: Dict[str, List]) -> None:
+        """
+        Insère un lot d'étudiants et met à jour le rapport, le cache et les données dérivées
+
+        Args:
+            lot: Les étudiants du lot (sans doublon interne)
+            rapport: Le rapport d'importation à compléter
+        """
+        telephones = [etudiant.telephone for etudiant in lot]
+        curseur = self.collection.find({"telephone": {"$in": telephones}}, {"telephone": 1})
+        existants = {data["telephone"] async for data in curseur}
+
+        a_inserer = retirer_existants(lot, existants, rapport)
+        if not a_inserer:
+            return
+
+        documents = [document_etudiant(etudiant) for etudiant in a_inserer]
+        erreurs = []
+        try:
+            await self.collection.insert_many(documents, ordered=False)
+        except BulkWriteError as e:
+            erreurs = e.details.get("writeErrors", [])
+        inseres, documents_inseres = noter_insertion(a_inserer, documents, erreurs, rapport)
+
+        if inseres:
+            await asyncio.gather(
+                self.cache.mettre_en_cache_lot(
+                    (etudiant._id, etudiant.to_json(), {"telephone": etudiant.telephone}) for etudiant in inseres
+                ),
+                self.classement.ajouter_lot(inseres),
+                self.statistiques_classe.ajouter_lot(documents_inseres)
+            )
+
+    async def obtenir_etudiant(self, etudiant_id: str) -> Optional[Etudiant]:
+        """
+        Récupère un étudiant par son ID
+
+        Args:
+            etudiant_id: L'ID de l'étudiant
+
+        Returns:
+            L'étudiant trouvé ou None si aucun étudiant n'est trouvé
+        """
+        etudiant_json = await self.cache.obtenir(etudiant_id)
+        if not etudiant_json:
+            if not ObjectId.is_valid(etudiant_id):
+                self.logger.error(f"ID d'étudiant invalide: {etudiant_id}")
+                return None
+
+            etudiant_json = await self.cache.charger_une_fois(
+                self.cache.cle(etudiant_id),
+                lambda: self.cache.obtenir(etudiant_id),
+                lambda: self._charger_etudiant({"_id": ObjectId(etudiant_id)})
+            )
+            if not etudiant_json:
+                return None
+
+        etudiant = Etudiant.from_json(etudiant_json)
+        if not etudiant._id:
+            etudiant._id = etudiant_id
+        return etudiant
+
+    async def obtenir_etudiant_par_telephone(self, telephone: str) -> Optional[Etudiant]:
+        """
+        Récupère un étudiant par son numéro de téléphone
+
+        Args:
+            telephone: Le numéro de téléphone
+
+        Returns:
+            L'étudiant trouvé ou None si aucun étudiant n'est trouvé
+        """
+        etudiant_json = await self.cache.obtenir_par_index("telephone", telephone)
+        if not etudiant_json:
+            etudiant_json = await self.cache.charger_une_fois(
+                self.cache.cle_index("telephone", telephone),
+                lambda: self.cache.obtenir_par_index("telephone", telephone),
+                lambda: self._charger_par_telephone(telephone)
+            )
+
+        if not etudiant_json or etudiant_json == MARQUEUR_ABSENT:
+            return None
+
+        return Etudiant.from_json(etudiant_json)
+
+    async def _charger_par_telephone(self, telephone: str) -> str:
+        """Lit un étudiant par téléphone dans MongoDB; s'il n'existe pas, l'inscrit au cache négatif"""
+        return (await self._charger_etudiant({"telephone": telephone})
+                or await self.cache.marquer_absent("telephone", telephone))
+
+    async def _charger_etudiant(self, filtre: Dict[str, Any]) -> Optional[str]:
+        """Lit un étudiant dans MongoDB et le met en cache (conditionné à la version) avec son index téléphone"""
+        data = await self.collection.find_one(filtre, PROJECTION_ETUDIANT)
+        if not data:
+            return None
+
+        etudiant = Etudiant.from_dict(data)
+        etudiant_json = etudiant.to_json()
+        await self.cache.mettre_en_cache_versionne(
+            [(etudiant._id, etudiant_json, etudiant.version, {"telephone": etudiant.telephone})]
+        )
+        return etudiant_json
+
+    async def obtenir_etudiants(self, etudiant_ids: List[str], taille_lot: int = 1000) -> List[Etudiant]:
+        """
+        Récupère plusieurs étudiants par leurs IDs
+
+        Les IDs sont découpés en lots traités en parallèle: un MGET par lot, puis une
+        requête $in pour les étudiants absents du cache, remis en cache en un aller-retour.
+
+        Args:
+            etudiant_ids: Les IDs des étudiants
+            taille_lot: Nombre d'IDs par lot
+
+        Returns:
+            Les étudiants trouvés, dans l'ordre des IDs
+        """
+        trouves = {}
+
+        async def hydrater(lot: List[str]) -> None:
+            manquants = []
+            for etudiant_id, etudiant_json in zip(lot, await self.cache.obtenir_plusieurs(lot)):
+                if etudiant_json:
+                    trouves[etudiant_id] = Etudiant.from_json(etudiant_json)
+                elif ObjectId.is_valid(etudiant_id):
+                    manquants.append(ObjectId(etudiant_id))
+
+            if manquants:
+                curseur = self.collection.find({"_id": {"$in": manquants}}, PROJECTION_ETUDIANT)
+                recuperes = [Etudiant.from_dict(data) async for data in curseur]
+                for etudiant in recuperes:
+                    trouves[etudiant._id] = etudiant
+                await self.cache.mettre_en_cache_versionne(
+                    (etudiant._id, etudiant.to_json(), etudiant.version, None) for etudiant in recuperes
+                )
+
+        await executer_en_parallele(hydrater, list(decouper(etudiant_ids, taille_lot)), self.limite_concurrence)
+        return [trouves[etudiant_id] for etudiant_id in etudiant_ids if etudiant_id in trouves]
+
+    async def rechercher_etudiants(self, critere: Dict[str, Any],
+                                   projection: Optional[Dict[str, Any]] = None) -> List[Etudiant]:
+        """
+        Recherche des étudiants selon différents critères
+
+        Args:
+            critere: Dictionnaire des critères de recherche
+            projection: Champs à récupérer (par défaut, ceux d'un Etudiant)
+
+        Returns:
+            Liste des étudiants correspondants
+        """
+        curseur = self.collection.find(critere, projection or PROJECTION_ETUDIANT)
+        return [Etudiant.from_dict(data) async for data in curseur]
+
+    async def rechercher_resumes(self, critere: Optional[Dict[str, Any]] = None) -> List[EtudiantResume]:
+        """
+        Recherche des étudiants sans le détail de leurs notes
+
+        Args:
+            critere: Critères de recherche (si None, tous les étudiants)
+
+        Returns:
+            Liste des résumés des étudiants correspondants
+        """
+        curseur = self.collection.find(critere or {}, PROJECTION_RESUME)
+        return [EtudiantResume.from_dict(data) async for data in curseur]
+
+    async def lister_etudiants(self, projection: Optional[Dict[str, Any]] = None) -> List[Etudiant]:
+        """
+        Liste tous les étudiants
+
+        Args:
+            projection: Champs à récupérer (par défaut, ceux d'un Etudiant)
+
+        Returns:
+            Liste de tous les étudiants
+        """
+        return await self.rechercher_etudiants({}, projection)
+
+    async def lister_etudiants_par_classe(self, classe: str,
+                                          projection: Optional[Dict[str, Any]] = None) -> List[Etudiant]:
+        """
+        Liste tous les étudiants d'une classe
+
+        Args:
+            classe: La classe recherchée
+            projection: Champs à récupérer (par défaut, ceux d'un Etudiant)
+
+        Returns:
+            Liste des étudiants de cette classe
+        """
+        return await self.rechercher_etudiants({"classe": classe}, projection)
+
+    async def compter_etudiants(self, critere: Optional[Dict[str, Any]] = None) -> int:
+        """
+        Compte les étudiants correspondant à des critères
+
+        Args:
+            critere: Critères de filtrage (si None, tous les étudiants)
+
+        Returns:
+            Le nombre d'étudiants
+        """
+        return await self.collection.count_documents(critere or {})
+
+    async def mettre_a_jour_etudiant(self, etudiant: Etudiant) -> bool:
+        """
+        Met à jour un étudiant (conditionné à la version lue, comme EtudiantService)
+
+        Args:
+            etudiant: L'étudiant à mettre à jour
+
+        Returns:
+            True si la mise à jour a réussi, False sinon (y compris sans modification)
+
+        Raises:
+            ValueError: Si une matière ou une note est invalide
+            VersionConflictError: Si les modifications entrent en conflit avec celles d'un autre utilisateur
+        """
+        if not etudiant._id or not etudiant.est_modifie():
+            return False
+        valider_notes(etudiant.notes)
+
+        object_id = ObjectId(etudiant._id)
+        try:
+            for _ in range(MAX_TENTATIVES):
+                update_data = donnees_mise_a_jour(etudiant)
+                ancien = await self.collection.find_one_and_update(
+                    filtre_version(object_id, etudiant.version),
+                    {"$set": update_data, "$inc": {"version": 1}},
+                    projection={**PROJECTION_ETUDIANT, "recherche": 1},
+                    return_document=ReturnDocument.BEFORE
+                )
+                if ancien is not None:
+                    break
+
+                actuel = await self.collection.find_one({"_id": object_id}, PROJECTION_ETUDIANT)
+                if actuel is None:
+                    return False
+                rebaser(etudiant, actuel)
+            else:
+                raise VersionConflictError(
+                    f"L'étudiant {etudiant._id} est modifié trop souvent par d'autres utilisateurs; réessayez"
+                )
+        except VersionConflictError:
+            raise
+        except Exception as e:
+            self.logger.error(f"Erreur lors de la mise à jour de l'étudiant {etudiant._id}: {e}")
+            return False
+
+        etudiant.marquer_enregistre((ancien.get("version") or 0) + 1)
+        mise_en_cache = self.cache.mettre_en_cache_versionne(
+            [(etudiant._id, etudiant.to_json(), etudiant.version, {"telephone": etudiant.telephone})]
+        )
+
+        if all(ancien.get(champ) == valeur for champ, valeur in update_data.items()):
+            # Écriture sans effet: seule la version du document a augmenté
+            await mise_en_cache
+            return False
+
+        if ancien.get("telephone") != etudiant.telephone:
+            await self.cache.invalider_index({"telephone": ancien.get("telephone")})
+        await asyncio.gather(
+            self.statistiques_classe.appliquer(ancien, update_data),
+            mise_en_cache,
+            self.classement.mettre_a_jour(etudiant)
+        )
+        return True
+
+    async def supprimer_etudiant(self, etudiant_id: str) -> bool:
+        """
+        Supprime un étudiant
+
+        Args:
+            etudiant_id: L'ID de l'étudiant à supprimer
+
+        Returns:
+            True si la suppression a réussi, False sinon
+        """
+        if not ObjectId.is_valid(etudiant_id):
+            return False
+
+        document = await self.collection.find_one_and_delete(
+            {"_id": ObjectId(etudiant_id)}, projection=PROJECTION_ETUDIANT
+        )
+        if document is None:
+            return False
+
+        await asyncio.gather(
+            self.statistiques_classe.appliquer(document, None),
+            self.cache.invalider(etudiant_id, {"telephone": document["telephone"]}),
+            self.classement.supprimer(etudiant_id)
+        )
+        return True
+
+    async def calculer_moyenne_classe(self, classe: str) -> float:
+        """
+        Calcule la moyenne générale d'une classe
+
+        Args:
+            classe: La classe dont on veut calculer la moyenne
+
+        Returns:
+            La moyenne générale de la classe
+        """
+        stats = await self.statistiques_classe.obtenir(classe)
+        if stats is not None:
+            return stats["moyenne"]
+
+        curseur = self.collection.aggregate([
+            {"$match": {"classe": classe}},
+            {"$group": {"_id": None, "moyenne": {"$avg": EXPRESSION_MOYENNE}}}
+        ])
+        resultats = [data async for data in curseur]
+        return resultats[0]["moyenne"] if resultats else 0.0
+
+    async def top_etudiants(self, limit: int = 10, classe: Optional[str] = None, skip: int = 0) -> List[Etudiant]:
+        """
+        Retourne les meilleurs étudiants par moyenne
+
+        Args:
+            limit: Nombre d'étudiants à retourner
+            classe: Limite le classement à une classe (optionnel)
+            skip: Nombre d'étudiants à sauter (pagination)
+
+        Returns:
+            Liste des meilleurs étudiants
+        """
+        classement = await self.classement.top(limit, classe, skip)
+        if classement is not None:
+            return await self.obtenir_etudiants([etudiant_id for etudiant_id, _ in classement])
+
+        pipeline = [{"$match": {"classe": classe}}] if classe is not None else []
+        pipeline += [
+            {"$addFields": {"moyenne": EXPRESSION_MOYENNE}},
+            {"$sort": {"moyenne": -1, "_id": -1}},  # ex aequo dans l'ordre de ZREVRANGE
+            {"$skip": skip},
+            {"$limit": limit},
+            {"$project": PROJECTION_ETUDIANT}
+        ]
+        return [Etudiant.from_dict(data) async for data in self.collection.aggregate(pipeline)]
+
+    async def envoyer_rapports_classes(self, classes: List[str],
+                                       notification_service: Optional[NotificationService] = None) -> Dict[str, bool]:
+        """
+        Prépare et envoie le rapport de plusieurs classes en parallèle
+
+        Pour chaque classe, les étudiants et la moyenne sont lus simultanément, puis
+        l'email (SMTP, bloquant) est envoyé dans un thread.
+
+        Args:
+            classes: Les classes
+            notification_service: Service d'envoi des rapports (créé si absent)
+
+        Returns:
+            Dictionnaire {classe: True si le rapport a été envoyé}
+        """
+        notification_service = notification_service or NotificationService()
+
+        async def envoyer(classe: str) -> bool:
+            etudiants, moyenne = await asyncio.gather(
+                self.lister_etudiants_par_classe(classe),
+                self.calculer_moyenne_classe(classe)
+            )
+            return await asyncio.to_thread(notification_service.envoyer_rapport_classe, classe, etudiants, moyenne)
+
+        resultats = await executer_en_parallele(envoyer, classes, self.limite_concurrence)
+        return dict(zip(classes, resultats))
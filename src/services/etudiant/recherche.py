@@ -0,0 +1,97 @@
+"""Normalisation et trigrammes des champs de recherche des étudiants"""
+import re
+import unicodedata
+from typing import Dict, Any, List
+from pymongo import UpdateOne
+
+# Champs recherchables par préfixe (stockés normalisés sous "recherche.<champ>")
+CHAMPS_PREFIXE = ("nom", "prenom", "classe")
+
+# Part minimale des trigrammes de la saisie présents dans le nom pour retenir un résultat
+SEUIL_TRIGRAMMES = 0.3
+
+def normaliser(texte: str) -> str:
+    """
+    Normalise un texte pour la recherche: minuscules, sans accents, espaces réduits
+
+    Args:
+        texte: Le texte à normaliser
+
+    Returns:
+        Le texte normalisé ("Éléonore  N'Diaye" -> "eleonore n'diaye")
+    """
+    decompose = unicodedata.normalize("NFKD", texte or "")
+    sans_accents = "".join(c for c in decompose if not unicodedata.combining(c))
+    return " ".join(sans_accents.lower().split())
+
+def trigrammes(texte: str) -> List[str]:
+    """
+    Découpe un texte en trigrammes de caractères, mot par mot
+
+    Chaque mot est entouré d'espaces (" mot ") pour que les débuts et fins de mots
+    forment leurs propres trigrammes (" mo", "ot ").
+
+    Args:
+        texte: Le texte (normalisé ou non)
+
+    Returns:
+        Liste triée des trigrammes distincts
+    """
+    resultat = set()
+    for mot in re.findall(r"\w+", normaliser(texte)):
+        mot = f" {mot} "
+        resultat.update(mot[i:i + 3] for i in range(len(mot) - 2))
+    return sorted(resultat)
+
+def champs_recherche(nom: str, prenom: str, classe: str) -> Dict[str, Any]:
+    """
+    Construit le sous-document "recherche" stocké avec chaque étudiant
+
+    Args:
+        nom: Le nom de l'étudiant
+        prenom: Le prénom de l'étudiant
+        classe: La classe de l'étudiant
+
+    Returns:
+        Dictionnaire {nom, prenom, classe, trigrammes} avec les valeurs normalisées
+    """
+    return {
+        "nom": normaliser(nom),
+        "prenom": normaliser(prenom),
+        "classe": normaliser(classe),
+        "trigrammes": trigrammes(f"{nom or ''} {prenom or ''}")
+    }
+
+def renseigner_champs_recherche(collection, taille_lot: int = 1000) -> int:
+    """
+    Renseigne les champs de recherche des étudiants enregistrés avant leur introduction
+
+    Le filtre porte sur recherche.nom (toujours écrit, même vide) pour que l'index
+    recherche_nom limite le parcours aux documents sans champs de recherche: une fois
+    tous les étudiants renseignés, l'appel au démarrage ne lit aucun document.
+
+    Args:
+        collection: La collection des étudiants
+        taille_lot: Nombre de mises à jour envoyées par requête
+
+    Returns:
+        Le nombre d'étudiants renseignés
+    """
+    curseur = collection.find(
+        {"recherche.nom": {"$exists": False}},
+        {"nom": 1, "prenom": 1, "classe": 1},
+        batch_size=taille_lot
+    )
+
+    nombre = 0
+    operations = []
+    for data in curseur:
+        recherche = champs_recherche(data.get("nom"), data.get("prenom"), data.get("classe"))
+        operations.append(UpdateOne({"_id": data["_id"]}, {"$set": {"recherche": recherche}}))
+        if len(operations) >= taille_lot:
+            nombre += collection.bulk_write(operations, ordered=False).modified_count
+            operations = []
+    if operations:
+        nombre += collection.bulk_write(operations, ordered=False).modified_count
+
+    return nombre
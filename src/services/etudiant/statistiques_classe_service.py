@@ -0,0 +1,460 @@
+from typing import List, Dict, Any, Optional, Iterable, Tuple
+from collections import defaultdict
+from pymongo import UpdateOne, ReturnDocument
+
+from src.config.database import Database
+from src.services.etudiant.agregation import EXPRESSION_MOYENNE, MENTIONS, mention_pour
+from src.utils.logger import Logger
+
+# Tolérance pour comparer des sommes de flottants mises à jour par incréments successifs
+TOLERANCE = 1e-6
+
+class StatistiquesClasseService:
+    """
+    Statistiques de classe matérialisées
+
+    Chaque classe possède un document dans la collection stats_classes:
+        {
+            "_id": classe,
+            "nombre": int, "nb_avec_notes": int, "somme_moyennes": float,
+            "mentions": {mention: int},
+            "matieres": {matiere: {"somme": float, "nombre": int, "min": float, "max": float}}
+        }
+
+    Ces documents sont maintenus par des incréments atomiques ($inc, $min, $max) à chaque
+    écriture d'un étudiant, ce qui rend la lecture des statistiques d'une classe O(1).
+    """
+
+    ID_META = "__meta__"
+
+    def __init__(self):
+        """Initialise le service avec les collections MongoDB"""
+        self.db = Database.get_db()
+        self.collection = self.db.stats_classes
+        self.etudiants = self.db.etudiants
+        self.logger = Logger.get_instance()
+
+    # Les méthodes statiques et de classe qui suivent construisent les écritures sans
+    # les exécuter: StatistiquesClasseServiceAsync les exécute avec motor.
+
+    @staticmethod
+    def _contribution(document: Optional[Dict[str, Any]], signe: int) -> Dict[str, float]:
+        """
+        Calcule les incréments apportés par un étudiant aux statistiques de sa classe
+
+        Args:
+            document: Le document étudiant (classe, notes) ou None
+            signe: 1 pour ajouter l'étudiant, -1 pour le retirer
+
+        Returns:
+            Dictionnaire {chemin du champ: incrément}
+        """
+        if not document:
+            return {}
+
+        notes = document.get("notes") or {}
+        moyenne = sum(notes.values()) / len(notes) if notes else 0.0
+
+        increments = {"nombre": signe, "somme_moyennes": signe * moyenne}
+        if notes:
+            increments["nb_avec_notes"] = signe
+            increments[f"mentions.{mention_pour(moyenne)}"] = signe
+        for matiere, note in notes.items():
+            increments[f"matieres.{matiere}.somme"] = signe * note
+            increments[f"matieres.{matiere}.nombre"] = signe
+
+        return increments
+
+    @staticmethod
+    def _fusionner(increments: Dict[str, float], autres: Dict[str, float]) -> Dict[str, float]:
+        """Additionne deux dictionnaires d'incréments"""
+        for champ, valeur in autres.items():
+            increments[champ] = increments.get(champ, 0) + valeur
+        return increments
+
+    @classmethod
+    def _changements(cls, ancien: Optional[Dict[str, Any]],
+                     nouveau: Optional[Dict[str, Any]]) -> List[Tuple[str, Dict[str, float], Optional[Dict], Optional[Dict]]]:
+        """
+        Décompose la modification d'un étudiant par classe concernée
+
+        Returns:
+            Liste de (classe, incréments, anciennes notes, nouvelles notes)
+        """
+        ancienne_classe = ancien.get("classe") if ancien else None
+        nouvelle_classe = nouveau.get("classe") if nouveau else None
+
+        if ancien and nouveau and ancienne_classe == nouvelle_classe:
+            increments = cls._fusionner(cls._contribution(nouveau, 1), cls._contribution(ancien, -1))
+            return [(nouvelle_classe, increments, ancien.get("notes"), nouveau.get("notes"))]
+
+        changements = []
+        if ancien:
+            changements.append((ancienne_classe, cls._contribution(ancien, -1), ancien.get("notes"), None))
+        if nouveau:
+            changements.append((nouvelle_classe, cls._contribution(nouveau, 1), None, nouveau.get("notes")))
+        return changements
+
+    @staticmethod
+    def _mise_a_jour_classe(increments: Dict[str, float],
+                            nouvelles_notes: Optional[Dict[str, float]]) -> Dict[str, Dict[str, float]]:
+        """Construit les opérateurs $inc, $min et $max d'une écriture (vide si rien ne change)"""
+        increments = {champ: valeur for champ, valeur in increments.items() if valeur != 0}
+        mise_a_jour = {}
+        if increments:
+            mise_a_jour["$inc"] = increments
+        if nouvelles_notes:
+            mise_a_jour["$min"] = {f"matieres.{m}.min": n for m, n in nouvelles_notes.items()}
+            mise_a_jour["$max"] = {f"matieres.{m}.max": n for m, n in nouvelles_notes.items()}
+        return mise_a_jour
+
+    @staticmethod
+    def _accumuler_extremums(mise_a_jour: Dict[str, Dict[str, float]], notes: Dict[str, float]) -> None:
+        """Ajoute des notes aux opérateurs $min et $max d'une écriture groupée"""
+        for matiere, note in notes.items():
+            champ_min = f"matieres.{matiere}.min"
+            champ_max = f"matieres.{matiere}.max"
+            mise_a_jour["$min"][champ_min] = min(note, mise_a_jour["$min"].get(champ_min, note))
+            mise_a_jour["$max"][champ_max] = max(note, mise_a_jour["$max"].get(champ_max, note))
+
+    @staticmethod
+    def _notes_retirees(anciennes_notes: Optional[Dict[str, float]],
+                        nouvelles_notes: Optional[Dict[str, float]]) -> List[Tuple[str, float]]:
+        """Retourne les notes retirées ou modifiées, qui pouvaient être un extremum"""
+        nouvelles_notes = nouvelles_notes or {}
+        return [
+            (matiere, note) for matiere, note in (anciennes_notes or {}).items() if nouvelles_notes.get(matiere) != note
+        ]
+
+    @staticmethod
+    def _extremums_a_corriger(stats: Dict[str, Any],
+                              notes_retirees: Iterable[Tuple[str, float]]) -> Tuple[set, set]:
+        """
+        Détermine les corrections d'une classe après le retrait de notes
+
+        Returns:
+            (matières sans note à retirer, matières dont les extremums sont à recalculer)
+        """
+        a_recalculer = set()
+        a_retirer = set()
+        for matiere, note in notes_retirees:
+            stats_matiere = stats.get("matieres", {}).get(matiere, {})
+            if stats_matiere.get("nombre", 0) <= 0:
+                a_retirer.add(matiere)
+            elif note in (stats_matiere.get("min"), stats_matiere.get("max")):
+                a_recalculer.add(matiere)
+        return a_retirer, a_recalculer
+
+    @staticmethod
+    def _pipeline_extremums(classe: str, matiere: str) -> List[Dict[str, Any]]:
+        """Agrégation du minimum et du maximum d'une matière pour une classe"""
+        champ = f"notes.{matiere}"
+        return [
+            {"$match": {"classe": classe, champ: {"$exists": True}}},
+            {"$group": {"_id": None, "min": {"$min": f"${champ}"}, "max": {"$max": f"${champ}"}}}
+        ]
+
+    @staticmethod
+    def _ecriture_extremums(matiere: str, resultat: Dict[str, float]) -> Dict[str, Any]:
+        """Écriture des extremums recalculés d'une matière"""
+        return {"$set": {f"matieres.{matiere}.min": resultat["min"], f"matieres.{matiere}.max": resultat["max"]}}
+
+    @classmethod
+    def _operations_ajout(cls, documents: Iterable[Dict[str, Any]]) -> List[UpdateOne]:
+        """Construit une écriture par classe pour un lot d'étudiants nouvellement créés"""
+        par_classe = defaultdict(lambda: {"$inc": {}, "$min": {}, "$max": {}})
+
+        for document in documents:
+            mise_a_jour = par_classe[document.get("classe")]
+            cls._fusionner(mise_a_jour["$inc"], cls._contribution(document, 1))
+            cls._accumuler_extremums(mise_a_jour, document.get("notes") or {})
+
+        return [
+            UpdateOne({"_id": classe}, {op: champs for op, champs in mise_a_jour.items() if champs}, upsert=True)
+            for classe, mise_a_jour in par_classe.items()
+        ]
+
+    def appliquer(self, ancien: Optional[Dict[str, Any]], nouveau: Optional[Dict[str, Any]]) -> None:
+        """
+        Répercute la modification d'un étudiant sur les statistiques de classe
+
+        Args:
+            ancien: Le document étudiant avant l'écriture (None pour une création)
+            nouveau: Le document étudiant après l'écriture (None pour une suppression)
+        """
+        for classe, increments, anciennes_notes, nouvelles_notes in self._changements(ancien, nouveau):
+            self._appliquer_classe(classe, increments, anciennes_notes, nouvelles_notes)
+
+    def _appliquer_classe(self, classe: str, increments: Dict[str, float],
+                          anciennes_notes: Optional[Dict[str, float]],
+                          nouvelles_notes: Optional[Dict[str, float]]) -> None:
+        """
+        Applique des incréments au document de statistiques d'une classe
+
+        Les minimums et maximums ne peuvent pas être décrémentés: lorsqu'une note retirée
+        ou modifiée était l'extremum de sa matière, celui-ci est recalculé pour cette
+        seule matière de la classe.
+        """
+        mise_a_jour = self._mise_a_jour_classe(increments, nouvelles_notes)
+        if not mise_a_jour:
+            return
+
+        stats = self.collection.find_one_and_update(
+            {"_id": classe}, mise_a_jour, upsert=True, return_document=ReturnDocument.AFTER
+        )
+        self._corriger_extremums(classe, stats, self._notes_retirees(anciennes_notes, nouvelles_notes))
+
+    def _corriger_extremums(self, classe: str, stats: Dict[str, Any],
+                            notes_retirees: Iterable[Tuple[str, float]]) -> None:
+        """
+        Corrige le document d'une classe après le retrait de notes
+
+        Une matière sans note est retirée; une matière dont une note retirée était le
+        minimum ou le maximum voit ses extremums recalculés (une fois par matière).
+        """
+        a_retirer, a_recalculer = self._extremums_a_corriger(stats, notes_retirees)
+
+        if a_retirer:
+            self.collection.update_one({"_id": classe}, {"$unset": {f"matieres.{m}": "" for m in a_retirer}})
+        for matiere in a_recalculer:
+            self._recalculer_extremums(classe, matiere)
+
+        if stats.get("nombre", 0) <= 0:
+            self.collection.delete_one({"_id": classe, "nombre": {"$lte": 0}})
+
+    def _recalculer_extremums(self, classe: str, matiere: str) -> None:
+        """Recalcule le minimum et le maximum d'une matière pour une classe"""
+        resultat = next(self.etudiants.aggregate(self._pipeline_extremums(classe, matiere)), None)
+        if resultat:
+            self.collection.update_one({"_id": classe}, self._ecriture_extremums(matiere, resultat))
+
+    def ajouter_lot(self, documents: Iterable[Dict[str, Any]]) -> None:
+        """
+        Ajoute un lot d'étudiants nouvellement créés avec une écriture par classe
+
+        Args:
+            documents: Les documents étudiants insérés
+        """
+        operations = self._operations_ajout(documents)
+        if operations:
+            self.collection.bulk_write(operations, ordered=False)
+
+    def appliquer_lot(self, modifications: Iterable[Tuple[Dict[str, Any], Dict[str, Any]]]) -> None:
+        """
+        Répercute la modification de plusieurs étudiants avec une écriture par classe
+
+        Args:
+            modifications: Couples (document avant, document après) d'étudiants existants
+        """
+        par_classe = defaultdict(lambda: {"$inc": {}, "$min": {}, "$max": {}, "retirees": []})
+
+        for ancien, nouveau in modifications:
+            if ancien.get("classe") != nouveau.get("classe"):
+                # Changement de classe: deux classes concernées, traité individuellement
+                self.appliquer(ancien, nouveau)
+                continue
+
+            mise_a_jour = par_classe[nouveau.get("classe")]
+            self._fusionner(mise_a_jour["$inc"], self._contribution(nouveau, 1))
+            self._fusionner(mise_a_jour["$inc"], self._contribution(ancien, -1))
+            self._accumuler_extremums(mise_a_jour, nouveau.get("notes") or {})
+            mise_a_jour["retirees"].extend(self._notes_retirees(ancien.get("notes"), nouveau.get("notes")))
+
+        for classe, mise_a_jour in par_classe.items():
+            notes_retirees = mise_a_jour.pop("retirees")
+            mise_a_jour["$inc"] = {champ: valeur for champ, valeur in mise_a_jour["$inc"].items() if valeur != 0}
+            operateurs = {op: champs for op, champs in mise_a_jour.items() if champs}
+            if not operateurs:
+                continue
+
+            stats = self.collection.find_one_and_update(
+                {"_id": classe}, operateurs, upsert=True, return_document=ReturnDocument.AFTER
+            )
+            self._corriger_extremums(classe, stats, notes_retirees)
+
+    def est_initialise(self) -> bool:
+        """Indique si les statistiques ont été construites à partir des étudiants existants"""
+        return self.collection.find_one({"_id": self.ID_META}) is not None
+
+    def obtenir(self, classe: str) -> Optional[Dict[str, Any]]:
+        """
+        Lit les statistiques matérialisées d'une classe
+
+        Args:
+            classe: La classe
+
+        Returns:
+            Les statistiques avec les moyennes dérivées, ou None si elles ne sont pas
+            disponibles (classe vide ou statistiques non initialisées)
+        """
+        if not self.est_initialise():
+            return None
+
+        stats = self.collection.find_one({"_id": classe})
+        return self._deriver(classe, stats) if stats else None
+
+    @staticmethod
+    def _deriver(classe: str, stats: Dict[str, Any]) -> Dict[str, Any]:
+        """Calcule les moyennes dérivées du document de statistiques d'une classe"""
+        nombre = stats.get("nombre", 0)
+        nb_avec_notes = stats.get("nb_avec_notes", 0)
+        somme = stats.get("somme_moyennes", 0.0)
+
+        return {
+            "classe": classe,
+            "nombre": nombre,
+            "nb_avec_notes": nb_avec_notes,
+            # Moyenne de tous les étudiants (0 pour ceux sans note) et des seuls étudiants notés
+            "moyenne": somme / nombre if nombre else 0.0,
+            "moyenne_avec_notes": somme / nb_avec_notes if nb_avec_notes else 0.0,
+            "mentions": {mention: stats.get("mentions", {}).get(mention, 0) for mention in MENTIONS.values()},
+            "matieres": {
+                matiere: {
+                    "nombre": valeurs["nombre"],
+                    "moyenne": valeurs["somme"] / valeurs["nombre"],
+                    "min": valeurs.get("min"),
+                    "max": valeurs.get("max")
+                }
+                for matiere, valeurs in stats.get("matieres", {}).items()
+                if valeurs.get("nombre", 0) > 0
+            }
+        }
+
+    def calculer_depuis_etudiants(self) -> Dict[str, Dict[str, Any]]:
+        """
+        Recalcule entièrement les statistiques de toutes les classes à partir des étudiants
+
+        Returns:
+            Dictionnaire {classe: document de statistiques}
+        """
+        a_des_notes = {"$gt": [{"$size": "$notes_liste"}, 0]}
+
+        pipeline_classes = [
+            {"$project": {
+                "classe": 1,
+                "moyenne": EXPRESSION_MOYENNE,
+                "notes_liste": {"$objectToArray": {"$ifNull": ["$notes", {}]}}
+            }},
+            {"$group": dict(
+                {
+                    "_id": "$classe",
+                    "nombre": {"$sum": 1},
+                    "nb_avec_notes": {"$sum": {"$cond": [a_des_notes, 1, 0]}},
+                    "somme_moyennes": {"$sum": "$moyenne"}
+                },
+                **{
+                    f"mention_{cle}": {"$sum": {"$cond": [
+                        {"$and": [a_des_notes, {"$gte": ["$moyenne", borne]}, {"$lt": ["$moyenne", borne_suivante]}]},
+                        1, 0
+                    ]}}
+                    for (borne, cle), borne_suivante in zip(MENTIONS.items(), list(MENTIONS)[1:] + [21])
+                }
+            )}
+        ]
+
+        pipeline_matieres = [
+            {"$project": {"classe": 1, "notes_liste": {"$objectToArray": {"$ifNull": ["$notes", {}]}}}},
+            {"$unwind": "$notes_liste"},
+            {"$group": {
+                "_id": {"classe": "$classe", "matiere": "$notes_liste.k"},
+                "somme": {"$sum": "$notes_liste.v"},
+                "nombre": {"$sum": 1},
+                "min": {"$min": "$notes_liste.v"},
+                "max": {"$max": "$notes_liste.v"}
+            }}
+        ]
+
+        resultats = {}
+        for data in self.etudiants.aggregate(pipeline_classes):
+            mentions = {cle: data[f"mention_{cle}"] for cle in MENTIONS.values() if data[f"mention_{cle}"]}
+            resultats[data["_id"]] = {
+                "_id": data["_id"],
+                "nombre": data["nombre"],
+                "nb_avec_notes": data["nb_avec_notes"],
+                "somme_moyennes": data["somme_moyennes"],
+                "mentions": mentions,
+                "matieres": {}
+            }
+
+        for data in self.etudiants.aggregate(pipeline_matieres):
+            classe, matiere = data["_id"]["classe"], data["_id"]["matiere"]
+            resultats[classe]["matieres"][matiere] = {
+                "somme": data["somme"],
+                "nombre": data["nombre"],
+                "min": data["min"],
+                "max": data["max"]
+            }
+
+        return resultats
+
+    def verifier(self, corriger: bool = False) -> List[Dict[str, Any]]:
+        """
+        Compare les statistiques matérialisées avec un recalcul complet
+
+        Args:
+            corriger: Remplace les statistiques stockées par le recalcul
+
+        Returns:
+            Liste des écarts {"classe", "champ", "attendu", "stocke"}
+        """
+        attendues = self.calculer_depuis_etudiants()
+        stockees = {
+            stats["_id"]: stats for stats in self.collection.find({"_id": {"$ne": self.ID_META}})
+        }
+
+        ecarts = []
+        for classe in sorted(set(attendues) | set(stockees), key=str):
+            valeurs_attendues = self._aplatir(attendues.get(classe, {}))
+            valeurs_stockees = self._aplatir(stockees.get(classe, {}))
+            for champ in sorted(set(valeurs_attendues) | set(valeurs_stockees)):
+                attendu = valeurs_attendues.get(champ, 0)
+                stocke = valeurs_stockees.get(champ, 0)
+                if abs((attendu or 0) - (stocke or 0)) > TOLERANCE:
+                    ecarts.append({"classe": classe, "champ": champ, "attendu": attendu, "stocke": stocke})
+
+        if ecarts:
+            self.logger.warning(f"Statistiques de classe: {len(ecarts)} écart(s) détecté(s)")
+
+        if corriger:
+            self.reconstruire(attendues)
+
+        return ecarts
+
+    @staticmethod
+    def _aplatir(document: Dict[str, Any], prefixe: str = "") -> Dict[str, float]:
+        """Aplatit un document de statistiques en {chemin: valeur numérique}"""
+        valeurs = {}
+        for cle, valeur in document.items():
+            if cle == "_id":
+                continue
+            chemin = f"{prefixe}{cle}"
+            if isinstance(valeur, dict):
+                valeurs.update(StatistiquesClasseService._aplatir(valeur, f"{chemin}."))
+            elif isinstance(valeur, (int, float)):
+                valeurs[chemin] = valeur
+        return valeurs
+
+    def reconstruire(self, statistiques: Optional[Dict[str, Dict[str, Any]]] = None) -> int:
+        """
+        Remplace toutes les statistiques de classe par un recalcul complet
+
+        Args:
+            statistiques: Résultat de calculer_depuis_etudiants (recalculé si None)
+
+        Returns:
+            Le nombre de classes
+        """
+        if statistiques is None:
+            statistiques = self.calculer_depuis_etudiants()
+
+        self.collection.delete_many({"_id": {"$nin": list(statistiques) + [self.ID_META]}})
+        if statistiques:
+            self.collection.bulk_write(
+                [UpdateOne({"_id": classe}, {"$set": {k: v for k, v in stats.items() if k != "_id"}}, upsert=True)
+                 for classe, stats in statistiques.items()],
+                ordered=False
+            )
+        self.collection.update_one({"_id": self.ID_META}, {"$set": {"initialise": True}}, upsert=True)
+
+        self.logger.info(f"Statistiques de classe reconstruites: {len(statistiques)} classe(s)")
+        return len(statistiques)
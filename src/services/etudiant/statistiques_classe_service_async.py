@@ -0,0 +1,69 @@
+from typing import Dict, Any, Optional, Iterable, Tuple
+from pymongo import ReturnDocument
+
+from src.services.etudiant.statistiques_classe_service import StatistiquesClasseService
+
+class StatistiquesClasseServiceAsync:
+    """
+    Version asyncio de StatistiquesClasseService (mêmes documents stats_classes, mêmes écritures)
+
+    Les écritures sont construites par les méthodes statiques de StatistiquesClasseService
+    et exécutées avec motor. La vérification et la reconstruction restent des opérations
+    de maintenance synchrones.
+    """
+
+    def __init__(self, db):
+        """
+        Initialise le service
+
+        Args:
+            db: Base de données motor
+        """
+        self.collection = db.stats_classes
+        self.etudiants = db.etudiants
+
+    async def appliquer(self, ancien: Optional[Dict[str, Any]], nouveau: Optional[Dict[str, Any]]) -> None:
+        """Répercute la modification d'un étudiant (documents avant/après, None pour une création/suppression)"""
+        for classe, increments, anciennes_notes, nouvelles_notes in StatistiquesClasseService._changements(ancien, nouveau):
+            mise_a_jour = StatistiquesClasseService._mise_a_jour_classe(increments, nouvelles_notes)
+            if not mise_a_jour:
+                continue
+
+            stats = await self.collection.find_one_and_update(
+                {"_id": classe}, mise_a_jour, upsert=True, return_document=ReturnDocument.AFTER
+            )
+            await self._corriger_extremums(
+                classe, stats, StatistiquesClasseService._notes_retirees(anciennes_notes, nouvelles_notes)
+            )
+
+    async def _corriger_extremums(self, classe: str, stats: Dict[str, Any],
+                                  notes_retirees: Iterable[Tuple[str, float]]) -> None:
+        """Corrige le document d'une classe après le retrait de notes (voir StatistiquesClasseService)"""
+        a_retirer, a_recalculer = StatistiquesClasseService._extremums_a_corriger(stats, notes_retirees)
+
+        if a_retirer:
+            await self.collection.update_one({"_id": classe}, {"$unset": {f"matieres.{m}": "" for m in a_retirer}})
+        for matiere in a_recalculer:
+            curseur = self.etudiants.aggregate(StatistiquesClasseService._pipeline_extremums(classe, matiere))
+            resultats = [resultat async for resultat in curseur]
+            if resultats:
+                await self.collection.update_one(
+                    {"_id": classe}, StatistiquesClasseService._ecriture_extremums(matiere, resultats[0])
+                )
+
+        if stats.get("nombre", 0) <= 0:
+            await self.collection.delete_one({"_id": classe, "nombre": {"$lte": 0}})
+
+    async def ajouter_lot(self, documents: Iterable[Dict[str, Any]]) -> None:
+        """Ajoute un lot d'étudiants nouvellement créés avec une écriture par classe"""
+        operations = StatistiquesClasseService._operations_ajout(documents)
+        if operations:
+            await self.collection.bulk_write(operations, ordered=False)
+
+    async def obtenir(self, classe: str) -> Optional[Dict[str, Any]]:
+        """Lit les statistiques matérialisées d'une classe (None si indisponibles)"""
+        if await self.collection.find_one({"_id": StatistiquesClasseService.ID_META}) is None:
+            return None
+
+        stats = await self.collection.find_one({"_id": classe})
+        return StatistiquesClasseService._deriver(classe, stats) if stats else None
@@ -0,0 +1,66 @@
+"""Contrôle de concurrence optimiste des mises à jour d'étudiants (champ "version")"""
+from typing import Dict, Any
+
+from src.models.etudiant import Etudiant
+from src.utils.exception.exceptions import VersionConflictError
+
+# Nombre de tentatives d'une mise à jour en conflit avant d'abandonner
+MAX_TENTATIVES = 3
+
+def filtre_version(object_id, version: int) -> Dict[str, Any]:
+    """
+    Filtre d'une mise à jour conditionnée à la version lue
+
+    Args:
+        object_id: L'ID MongoDB du document
+        version: La version lue (0 couvre aussi les documents antérieurs au champ)
+
+    Returns:
+        Le filtre MongoDB
+    """
+    if version:
+        return {"_id": object_id, "version": version}
+    return {"_id": object_id, "version": {"$in": [0, None]}}
+
+def rebaser(etudiant: Etudiant, actuel: Dict[str, Any]) -> None:
+    """
+    Réapplique les modifications d'un étudiant sur la version actuelle de son document
+
+    Fusion à trois voies: un champ ou une note modifié d'un seul côté prend la valeur
+    de ce côté; modifié des deux côtés avec des valeurs différentes, c'est un conflit.
+
+    Args:
+        etudiant: L'étudiant modifié localement
+        actuel: Le document actuel (PROJECTION_ETUDIANT)
+
+    Raises:
+        VersionConflictError: Si les modifications ne peuvent pas être fusionnées
+    """
+    modifications = etudiant.modifications
+    if modifications is None:
+        raise VersionConflictError(
+            f"L'étudiant {etudiant._id} a été modifié par un autre utilisateur; rechargez-le avant de le modifier"
+        )
+
+    for champ, lu in etudiant.origine.items():
+        local = getattr(etudiant, champ)
+        distant = actuel.get(champ)
+        if local == lu:
+            setattr(etudiant, champ, distant)
+        elif distant not in (lu, local):
+            raise VersionConflictError(
+                f"Le champ '{champ}' de l'étudiant {etudiant._id} a été modifié par un autre utilisateur"
+            )
+
+    notes = dict(actuel.get("notes") or {})
+    for matiere, (lue, nouvelle) in modifications.items():
+        if notes.get(matiere) not in (lue, nouvelle):
+            raise VersionConflictError(
+                f"La note de {matiere} de l'étudiant {etudiant._id} a été modifiée par un autre utilisateur"
+            )
+        if nouvelle is None:
+            notes.pop(matiere, None)
+        else:
+            notes[matiere] = nouvelle
+
+    etudiant.rebaser(notes, actuel.get("version") or 0, actuel)
@@ -1,12 +1,77 @@
 import csv
+import gzip
 import json
+import os
 import pandas as pd
-from typing import List, Optional
+from typing import List, Dict, Any, Iterable, Optional, TextIO, Union
 from fpdf import FPDF
 
 from src.models.etudiant import Etudiant
+from src.models.etudiant_resume import EtudiantResume
 from src.services.etudiant.etudiant_service import EtudiantService
 
+class FichierIdentifiants:
+    """
+    Fichier CSV des identifiants des comptes créés en masse, écrit lot par lot
+
+    Le fichier contient les mots de passe initiaux en clair: il est créé lisible par
+    son seul propriétaire (0600) et doit être supprimé après distribution. Un fichier
+    existant n'est jamais réutilisé: il garderait ses permissions, et écraser un export
+    précédent ferait perdre des mots de passe qui ne sont stockés nulle part ailleurs.
+    Chaque lot est écrit sur disque dès sa réception; un fichier resté vide à la
+    fermeture est supprimé.
+    """
+
+    def __init__(self, chemin_fichier: str):
+        """
+        Crée le fichier et écrit l'en-tête
+
+        Args:
+            chemin_fichier: Chemin du fichier CSV à créer
+
+        Raises:
+            FileExistsError: Si le fichier existe déjà
+        """
+        self.chemin_fichier = chemin_fichier
+        self.nombre = 0
+        descripteur = os.open(chemin_fichier, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o600)
+        self.fichier = open(descripteur, 'w', newline='', encoding='utf-8')
+        self.writer = csv.writer(self.fichier)
+        self.writer.writerow(['Nom', 'Prénom', 'Classe', "Nom d'utilisateur", 'Mot de passe', 'Email', 'ID étudiant'])
+
+    def ecrire(self, comptes: List[Dict[str, Any]]) -> None:
+        """
+        Ajoute des comptes au fichier et les écrit immédiatement sur disque
+
+        Args:
+            comptes: Les comptes créés (format du rapport "crees" de UtilisateurService.provisionner_etudiants)
+        """
+        for compte in comptes:
+            self.writer.writerow([
+                compte["nom"],
+                compte["prenom"],
+                compte["classe"],
+                compte["username"],
+                compte["password"],
+                compte["email"],
+                compte["id_etudiant"]
+            ])
+        self.fichier.flush()
+        os.fsync(self.fichier.fileno())
+        self.nombre += len(comptes)
+
+    def fermer(self) -> None:
+        """Ferme le fichier, et le supprime s'il ne contient aucun compte"""
+        self.fichier.close()
+        if not self.nombre:
+            os.remove(self.chemin_fichier)
+
+    def __enter__(self) -> 'FichierIdentifiants':
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.fermer()
+
 class ExportImportService:
     """Service d'exportation et d'importation des données"""
     
@@ -14,21 +79,42 @@ class ExportImportService:
         """Initialise le service avec le service d'étudiants"""
         self.etudiant_service = EtudiantService()
     
-    def exporter_csv(self, etudiants: Optional[List[Etudiant]] = None, chemin_fichier: str = "etudiants.csv") -> str:
+    def _etudiants_a_exporter(self, etudiants: Optional[Iterable[Etudiant]],
+                              critere: Optional[Dict[str, Any]], taille_lot: int) -> Iterable[Etudiant]:
+        """Retourne les étudiants fournis ou un flux issu d'un curseur MongoDB"""
+        if etudiants is None:
+            return self.etudiant_service.iterer_etudiants(critere, taille_lot)
+        return etudiants
+    
+    @staticmethod
+    def _ouvrir_fichier(chemin_fichier: str, compresser: bool, newline: Optional[str] = None) -> TextIO:
+        """Ouvre le fichier de sortie en texte, compressé en gzip si demandé ou si l'extension est .gz"""
+        if compresser or chemin_fichier.endswith('.gz'):
+            return gzip.open(chemin_fichier, 'wt', encoding='utf-8', newline=newline)
+        return open(chemin_fichier, 'w', encoding='utf-8', newline=newline)
+    
+    def exporter_csv(self, etudiants: Optional[Iterable[Etudiant]] = None, chemin_fichier: str = "etudiants.csv",
+                     critere: Optional[Dict[str, Any]] = None, taille_lot: int = 1000,
+                     compresser: bool = False) -> str:
         """
         Exporte les étudiants au format CSV
         
+        Si aucun étudiant n'est fourni, les lignes sont écrites au fil d'un curseur
+        MongoDB: la mémoire utilisée ne dépend pas du nombre d'étudiants.
+        
         Args:
-            etudiants: Liste des étudiants à exporter (si None, exporte tous les étudiants)
+            etudiants: Étudiants à exporter (si None, exporte les étudiants correspondant à critere)
             chemin_fichier: Chemin du fichier CSV à créer
+            critere: Critères de filtrage utilisés lorsque etudiants est None
+            taille_lot: Nombre de documents lus par aller-retour MongoDB
+            compresser: Compresse le fichier en gzip (automatique si l'extension est .gz)
             
         Returns:
             Le chemin du fichier créé
         """
-        if etudiants is None:
-            etudiants = self.etudiant_service.lister_etudiants()
+        etudiants = self._etudiants_a_exporter(etudiants, critere, taille_lot)
         
-        with open(chemin_fichier, 'w', newline='', encoding='utf-8') as fichier:
+        with self._ouvrir_fichier(chemin_fichier, compresser, newline='') as fichier:
             writer = csv.writer(fichier)
             
             # Écrire l'en-tête
@@ -42,34 +128,61 @@ class ExportImportService:
                     etudiant.prenom,
                     etudiant.telephone,
                     etudiant.classe,
-                    json.dumps(etudiant.notes),
+                    json.dumps(dict(etudiant.notes)),
                     f"{etudiant.moyenne:.2f}"
                 ])
         
         return chemin_fichier
     
-    def exporter_json(self, etudiants: Optional[List[Etudiant]] = None, chemin_fichier: str = "etudiants.json") -> str:
+    def exporter_json(self, etudiants: Optional[Iterable[Etudiant]] = None, chemin_fichier: str = "etudiants.json",
+                      critere: Optional[Dict[str, Any]] = None, taille_lot: int = 1000,
+                      compresser: bool = False, ndjson: bool = False) -> str:
         """
         Exporte les étudiants au format JSON
         
+        Le tableau JSON est écrit élément par élément (ou une ligne par étudiant en
+        NDJSON), sans construire la liste complète en mémoire.
+        
         Args:
-            etudiants: Liste des étudiants à exporter (si None, exporte tous les étudiants)
+            etudiants: Étudiants à exporter (si None, exporte les étudiants correspondant à critere)
             chemin_fichier: Chemin du fichier JSON à créer
+            critere: Critères de filtrage utilisés lorsque etudiants est None
+            taille_lot: Nombre de documents lus par aller-retour MongoDB
+            compresser: Compresse le fichier en gzip (automatique si l'extension est .gz)
+            ndjson: Écrit un objet JSON par ligne au lieu d'un tableau
             
         Returns:
             Le chemin du fichier créé
         """
-        if etudiants is None:
-            etudiants = self.etudiant_service.lister_etudiants()
-        
-        data = []
-        for etudiant in etudiants:
-            etudiant_dict = etudiant.to_dict()
-            etudiant_dict['moyenne'] = etudiant.moyenne
-            data.append(etudiant_dict)
+        etudiants = self._etudiants_a_exporter(etudiants, critere, taille_lot)
         
-        with open(chemin_fichier, 'w', encoding='utf-8') as fichier:
-            json.dump(data, fichier, ensure_ascii=False, indent=4)
+        with self._ouvrir_fichier(chemin_fichier, compresser) as fichier:
+            if not ndjson:
+                fichier.write("[")
+            
+            premier = True
+            for etudiant in etudiants:
+                etudiant_dict = {
+                    "_id": etudiant._id,
+                    "nom": etudiant.nom,
+                    "prenom": etudiant.prenom,
+                    "telephone": etudiant.telephone,
+                    "classe": etudiant.classe,
+                    "notes": dict(etudiant.notes),
+                    "moyenne": etudiant.moyenne
+                }
+                
+                if ndjson:
+                    fichier.write(json.dumps(etudiant_dict, ensure_ascii=False))
+                    fichier.write("\n")
+                else:
+                    contenu = json.dumps(etudiant_dict, ensure_ascii=False, indent=4)
+                    fichier.write("\n    " if premier else ",\n    ")
+                    fichier.write(contenu.replace("\n", "\n    "))
+                premier = False
+            
+            if not ndjson:
+                fichier.write("]" if premier else "\n]")
         
         return chemin_fichier
     
@@ -110,19 +223,22 @@ class ExportImportService:
         
         return chemin_fichier
     
-    def exporter_pdf(self, etudiants: Optional[List[Etudiant]] = None, chemin_fichier: str = "etudiants.pdf") -> str:
+    def exporter_pdf(self, etudiants: Optional[List[Union[Etudiant, EtudiantResume]]] = None,
+                     chemin_fichier: str = "etudiants.pdf", critere: Optional[Dict[str, Any]] = None) -> str:
         """
         Exporte les étudiants au format PDF
         
         Args:
-            etudiants: Liste des étudiants à exporter (si None, exporte tous les étudiants)
+            etudiants: Liste des étudiants à exporter (si None, exporte les étudiants correspondant au critère)
             chemin_fichier: Chemin du fichier PDF à créer
+            critere: Critères de filtrage lorsque etudiants est None (si None, tous les étudiants)
             
         Returns:
             Le chemin du fichier créé
         """
         if etudiants is None:
-            etudiants = self.etudiant_service.lister_etudiants()
+            # Le PDF n'affiche pas le détail des notes: résumés avec moyenne calculée par MongoDB
+            etudiants = self.etudiant_service.rechercher_resumes(critere)
         
         # Créer un PDF
         pdf = FPDF()
@@ -156,84 +272,178 @@ class ExportImportService:
         
         return chemin_fichier
     
-    def importer_csv(self, chemin_fichier: str) -> List[str]:
+    @staticmethod
+    def exporter_identifiants(comptes: List[Dict[str, Any]], chemin_fichier: str = "identifiants.csv") -> str:
+        """
+        Exporte les identifiants des comptes créés en masse au format CSV (voir FichierIdentifiants)
+        
+        Args:
+            comptes: Les comptes créés (rapport "crees" de UtilisateurService.provisionner_etudiants)
+            chemin_fichier: Chemin du fichier CSV à créer
+            
+        Returns:
+            Le chemin du fichier créé
+            
+        Raises:
+            FileExistsError: Si le fichier existe déjà
+        """
+        with FichierIdentifiants(chemin_fichier) as fichier:
+            fichier.ecrire(comptes)
+        
+        return chemin_fichier
+    
+    @staticmethod
+    def ouvrir_identifiants(chemin_fichier: str) -> FichierIdentifiants:
+        """
+        Crée le fichier des identifiants d'une création de comptes en masse, écrit lot par lot
+        
+        Args:
+            chemin_fichier: Chemin du fichier CSV à créer
+            
+        Returns:
+            Le fichier, à passer (méthode ecrire) à UtilisateurService.provisionner_etudiants
+            
+        Raises:
+            FileExistsError: Si le fichier existe déjà
+        """
+        return FichierIdentifiants(chemin_fichier)
+    
+    def importer_csv(self, chemin_fichier: str, taille_lot: int = 1000) -> Dict[str, List]:
         """
         Importe des étudiants depuis un fichier CSV
         
         Args:
             chemin_fichier: Chemin du fichier CSV à importer
+            taille_lot: Nombre d'étudiants insérés par requête
             
         Returns:
-            Liste des IDs des étudiants importés
+            Rapport d'importation {"inseres", "doublons", "invalides"}
         """
-        ids_importes = []
+        invalides = []
         
-        with open(chemin_fichier, 'r', newline='', encoding='utf-8') as fichier:
-            reader = csv.DictReader(fichier)
-            
-            for ligne in reader:
+        def lire_etudiants(reader):
+            for numero, ligne in enumerate(reader, start=2):
                 try:
                     # Analyser les notes
-                    notes = json.loads(ligne.get('Notes', '{}'))
+                    notes = json.loads(ligne.get('Notes') or '{}')
                     
-                    # Créer l'étudiant
-                    etudiant = Etudiant(
+                    yield Etudiant(
                         nom=ligne.get('Nom', ''),
                         prenom=ligne.get('Prénom', ''),
                         telephone=ligne.get('Téléphone', ''),
                         classe=ligne.get('Classe', ''),
                         notes=notes
                     )
-                    
-                    # Ajouter l'étudiant
-                    etudiant_id = self.etudiant_service.ajouter_etudiant(etudiant)
-                    ids_importes.append(etudiant_id)
-                    
                 except ValueError as e:
-                    # Gérer les erreurs de validation
-                    print(f"Erreur lors de l'importation d'un étudiant: {e}")
+                    invalides.append({"telephone": ligne.get('Téléphone', ''), "erreur": f"Ligne {numero}: {e}"})
+        
+        with open(chemin_fichier, 'r', newline='', encoding='utf-8') as fichier:
+            reader = csv.DictReader(fichier)
+            rapport = self.etudiant_service.ajouter_etudiants_en_masse(lire_etudiants(reader), taille_lot)
         
-        return ids_importes
+        rapport["invalides"].extend(invalides)
+        return rapport
     
-    def importer_excel(self, chemin_fichier: str) -> List[str]:
+    def importer_json(self, chemin_fichier: str, taille_lot: int = 1000) -> Dict[str, List]:
+        """
+        Importe des étudiants depuis un fichier JSON (format produit par exporter_json)
+        
+        Les fichiers .ndjson/.jsonl sont lus ligne par ligne et les fichiers .gz sont
+        décompressés à la volée. Une ligne illisible ou un élément qui n'est pas un objet
+        est inscrit aux invalides sans interrompre l'importation.
+        
+        Args:
+            chemin_fichier: Chemin du fichier JSON à importer
+            taille_lot: Nombre d'étudiants insérés par requête
+            
+        Returns:
+            Rapport d'importation {"inseres", "doublons", "invalides"}
+        """
+        chemin = chemin_fichier[:-3] if chemin_fichier.endswith('.gz') else chemin_fichier
+        ndjson = chemin.endswith(('.ndjson', '.jsonl'))
+        
+        if chemin_fichier.endswith('.gz'):
+            fichier = gzip.open(chemin_fichier, 'rt', encoding='utf-8')
+        else:
+            fichier = open(chemin_fichier, 'r', encoding='utf-8')
+        
+        invalides = []
+        libelle = "Ligne" if ndjson else "Élément"
+        
+        def lire_items():
+            if not ndjson:
+                items = json.load(fichier)
+                if not isinstance(items, list):
+                    raise ValueError("Le fichier JSON doit contenir une liste d'étudiants")
+                yield from enumerate(items, start=1)
+                return
+            for numero, ligne in enumerate(fichier, start=1):
+                if not ligne.strip():
+                    continue
+                try:
+                    yield numero, json.loads(ligne)
+                except ValueError as e:
+                    invalides.append({"telephone": "", "erreur": f"Ligne {numero}: JSON invalide ({e})"})
+        
+        def lire_etudiants():
+            for numero, item in lire_items():
+                if not isinstance(item, dict):
+                    invalides.append({"telephone": "", "erreur": f"{libelle} {numero}: objet étudiant attendu"})
+                    continue
+                yield Etudiant(
+                    nom=item.get('nom', ''),
+                    prenom=item.get('prenom', ''),
+                    telephone=item.get('telephone', ''),
+                    classe=item.get('classe', ''),
+                    notes=item.get('notes') or {}
+                )
+        
+        with fichier:
+            rapport = self.etudiant_service.ajouter_etudiants_en_masse(lire_etudiants(), taille_lot)
+        
+        rapport["invalides"].extend(invalides)
+        return rapport
+    
+    def importer_excel(self, chemin_fichier: str, taille_lot: int = 1000) -> Dict[str, List]:
         """
         Importe des étudiants depuis un fichier Excel
         
         Args:
             chemin_fichier: Chemin du fichier Excel à importer
+            taille_lot: Nombre d'étudiants insérés par requête
             
         Returns:
-            Liste des IDs des étudiants importés
+            Rapport d'importation {"inseres", "doublons", "invalides"}
         """
-        ids_importes = []
+        invalides = []
         
-        # Lire le fichier Excel
-        df = pd.read_excel(chemin_fichier)
+        # Lire le fichier Excel (téléphones lus comme texte pour conserver les zéros)
+        df = pd.read_excel(chemin_fichier, dtype={'Téléphone': str})
         
-        for _, ligne in df.iterrows():
-            try:
-                # Extraire les notes
-                notes = {}
-                for colonne in ligne.index:
-                    if colonne.startswith("Note "):
-                        matiere = colonne[5:]  # Extraire le nom de la matière
-                        notes[matiere] = float(ligne[colonne])
-                
-                # Créer l'étudiant
-                etudiant = Etudiant(
-                    nom=ligne.get('Nom', ''),
-                    prenom=ligne.get('Prénom', ''),
-                    telephone=ligne.get('Téléphone', ''),
-                    classe=ligne.get('Classe', ''),
-                    notes=notes
-                )
-                
-                # Ajouter l'étudiant
-                etudiant_id = self.etudiant_service.ajouter_etudiant(etudiant)
-                ids_importes.append(etudiant_id)
-                
-            except ValueError as e:
-                # Gérer les erreurs de validation
-                print(f"Erreur lors de l'importation d'un étudiant: {e}")
+        def valeur(ligne, colonne):
+            v = ligne.get(colonne, '')
+            return '' if pd.isna(v) else str(v)
+        
+        def lire_etudiants():
+            for numero, (_, ligne) in enumerate(df.iterrows(), start=2):
+                try:
+                    # Extraire les notes
+                    notes = {}
+                    for colonne in ligne.index:
+                        if colonne.startswith("Note ") and not pd.isna(ligne[colonne]):
+                            matiere = colonne[5:]  # Extraire le nom de la matière
+                            notes[matiere] = float(ligne[colonne])
+                    
+                    yield Etudiant(
+                        nom=valeur(ligne, 'Nom'),
+                        prenom=valeur(ligne, 'Prénom'),
+                        telephone=valeur(ligne, 'Téléphone'),
+                        classe=valeur(ligne, 'Classe'),
+                        notes=notes
+                    )
+                except ValueError as e:
+                    invalides.append({"telephone": valeur(ligne, 'Téléphone'), "erreur": f"Ligne {numero}: {e}"})
         
-        return ids_importes 
\ No newline at end of file
+        rapport = self.etudiant_service.ajouter_etudiants_en_masse(lire_etudiants(), taille_lot)
+        rapport["invalides"].extend(invalides)
+        return rapport
\ No newline at end of file
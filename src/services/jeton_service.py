@@ -0,0 +1,284 @@
+import base64
+import hashlib
+import hmac
+import json
+import os
+import threading
+import time
+import uuid
+from typing import Dict, Any, Optional
+from dotenv import load_dotenv
+
+from src.config.database import Database
+from src.models.utilisateur import Utilisateur
+from src.utils.exception.exceptions import ConfigurationError
+
+# Chargement des variables d'environnement
+load_dotenv()
+
+# Mode jetons signés: les sessions sont des jetons HMAC vérifiés dans le processus au
+# lieu de hashs Redis
+SESSIONS_SIGNEES = os.getenv('SESSIONS_SIGNEES', 'false').lower() == 'true'
+
+# Durée de validité d'un jeton signé en secondes (non prolongeable)
+JETON_TTL = int(os.getenv('JETON_TTL', 60 * 60))
+
+# Intervalle de relecture des révocations (horodatage de la dernière révocation d'un
+# utilisateur et jetons révoqués), en secondes. Une révocation faite par un autre
+# processus est prise en compte ici au plus après ce délai.
+JETON_RAFRAICHISSEMENT = float(os.getenv('JETON_RAFRAICHISSEMENT', 5))
+
+# Clés d'exemple refusées pour signer les jetons
+CLES_PAR_DEFAUT = {"", "default_secret_key", "votre_cle_secrete", "changer_cette_cle_par_une_valeur_aleatoire_complexe"}
+
+# Révocations d'utilisateurs: horodatage (ms) de la dernière, et liste
+# {"utilisateur:<id>": ms (jetons émis avant révoqués)}
+CLE_DERNIERE_REVOCATION = "jetons:derniere_revocation"
+CLE_REVOCATIONS = "jetons:revocations"
+
+# Jetons révoqués un par un (déconnexions): {jti: expiration du jeton (s)}. Cet ensemble
+# ne contient que des jetons encore valides; il est relu en entier par chaque processus.
+CLE_JETONS_REVOQUES = "jetons:revoques"
+
+# Enregistre la révocation d'un utilisateur, retire celles qui ne concernent plus que des
+# jetons expirés et avance l'horodatage de la dernière révocation
+# KEYS[1]: liste des révocations, KEYS[2]: dernière révocation
+# ARGV[1]: champ révoqué, ARGV[2]: instant (ms), ARGV[3]: instant avant lequel une révocation est périmée (ms)
+SCRIPT_REVOQUER = """
+redis.call('HSET', KEYS[1], ARGV[1], ARGV[2])
+local champs = redis.call('HGETALL', KEYS[1])
+for i = 1, #champs, 2 do
+    if tonumber(champs[i + 1]) < tonumber(ARGV[3]) then
+        redis.call('HDEL', KEYS[1], champs[i])
+    end
+end
+if tonumber(ARGV[2]) > tonumber(redis.call('GET', KEYS[2]) or '0') then
+    redis.call('SET', KEYS[2], ARGV[2])
+end
+return 1
+"""
+
+# Enregistre un jeton révoqué et retire les jetons révoqués déjà expirés
+# KEYS[1]: jetons révoqués; ARGV[1]: jti, ARGV[2]: expiration du jeton (s), ARGV[3]: instant (s)
+SCRIPT_REVOQUER_JETON = """
+redis.call('HSET', KEYS[1], ARGV[1], ARGV[2])
+local champs = redis.call('HGETALL', KEYS[1])
+for i = 1, #champs, 2 do
+    if tonumber(champs[i + 1]) <= tonumber(ARGV[3]) then
+        redis.call('HDEL', KEYS[1], champs[i])
+    end
+end
+return 1
+"""
+
+def _b64(donnees: bytes) -> str:
+    """Encode en base64 URL sans remplissage"""
+    return base64.urlsafe_b64encode(donnees).rstrip(b"=").decode("ascii")
+
+def _b64_decoder(texte: str) -> bytes:
+    """Décode du base64 URL sans remplissage"""
+    return base64.urlsafe_b64decode(texte + "=" * (-len(texte) % 4))
+
+def maintenant_ms() -> int:
+    """Instant courant en millisecondes"""
+    return int(time.time() * 1000)
+
+class JetonService:
+    """
+    Jetons de session signés (HMAC-SHA256), vérifiables sans accès réseau
+
+    Un jeton "<charge>.<signature>" contient l'ID, le nom et le rôle de l'utilisateur,
+    l'instant d'émission et l'expiration. Sa vérification se fait dans le processus:
+    les jetons révoqués un par un et l'horodatage de la dernière révocation d'un
+    utilisateur sont relus de Redis au plus toutes les JETON_RAFRAICHISSEMENT secondes.
+    La liste des utilisateurs révoqués n'est consultée que pour les jetons émis avant
+    cet horodatage.
+    """
+
+    _derniere_revocation = 0   # Horodatage (ms) connu du processus
+    _jetons_revoques = {}      # {jti: expiration (s)} connus du processus
+    _lu_a = 0.0                # Instant (monotonic) de leur dernière lecture
+    _verrou = threading.Lock()
+
+    def __init__(self, secret_key: str, ttl: int = JETON_TTL, client_redis=None):
+        """
+        Initialise le service
+
+        Args:
+            secret_key: La clé de signature (SECRET_KEY)
+            ttl: Durée de validité des jetons en secondes
+            client_redis: Client Redis (par défaut, la connexion partagée de l'application)
+
+        Raises:
+            ConfigurationError: Si la clé est absente ou est une clé d'exemple
+        """
+        if secret_key in CLES_PAR_DEFAUT:
+            raise ConfigurationError("SECRET_KEY doit être définie avec une valeur unique pour utiliser les sessions signées")
+        self.cle = secret_key.encode("utf-8")
+        self.ttl = ttl
+        self.redis = client_redis or Database.get_redis_connection()
+        self._script_revoquer = self.redis.register_script(SCRIPT_REVOQUER)
+        self._script_revoquer_jeton = self.redis.register_script(SCRIPT_REVOQUER_JETON)
+
+    @staticmethod
+    def est_signe(jeton: str) -> bool:
+        """Indique si un token est un jeton signé (et non un token de session Redis)"""
+        return "." in jeton
+
+    def _signer(self, charge: str) -> str:
+        """Calcule la signature d'une charge encodée"""
+        return _b64(hmac.new(self.cle, charge.encode("utf-8"), hashlib.sha256).digest())
+
+    def emettre(self, utilisateur: Utilisateur) -> Dict[str, Any]:
+        """
+        Émet un jeton signé pour un utilisateur authentifié
+
+        Args:
+            utilisateur: L'utilisateur
+
+        Returns:
+            Dictionnaire {token, expiration}
+        """
+        emission = maintenant_ms()
+        contenu = {
+            "uid": utilisateur._id,
+            "nom": utilisateur.username,
+            "role": utilisateur.role.value,
+            "iat": emission,
+            "exp": emission // 1000 + self.ttl,
+            "jti": uuid.uuid4().hex
+        }
+        if utilisateur.id_etudiant:
+            contenu["etu"] = utilisateur.id_etudiant
+
+        charge = _b64(json.dumps(contenu, separators=(",", ":")).encode("utf-8"))
+        return {"token": f"{charge}.{self._signer(charge)}", "expiration": contenu["exp"]}
+
+    def decoder(self, jeton: str) -> Optional[Dict[str, Any]]:
+        """
+        Vérifie la signature et l'expiration d'un jeton (sans consulter les révocations)
+
+        Args:
+            jeton: Le jeton
+
+        Returns:
+            Le contenu du jeton, ou None s'il est mal formé, falsifié ou expiré
+        """
+        charge, _, signature = jeton.partition(".")
+        if not hmac.compare_digest(signature.encode("utf-8"), self._signer(charge).encode("ascii")):
+            return None
+        try:
+            contenu = json.loads(_b64_decoder(charge))
+        except ValueError:
+            return None
+        if not isinstance(contenu, dict) or contenu.get("exp", 0) <= time.time():
+            return None
+        return contenu
+
+    @staticmethod
+    def session(contenu: Dict[str, Any]) -> Dict[str, Any]:
+        """Informations de session (même forme que SessionService.verifier) d'un jeton décodé"""
+        return {
+            "utilisateur_id": contenu["uid"],
+            "username": contenu["nom"],
+            "role": contenu["role"],
+            "id_etudiant": contenu.get("etu"),
+            "expiration": contenu["exp"]
+        }
+
+    @staticmethod
+    def est_revoque(contenu: Dict[str, Any], revocation_utilisateur: Optional[str]) -> bool:
+        """Applique l'entrée de la liste des révocations concernant l'utilisateur d'un jeton"""
+        return revocation_utilisateur is not None and contenu["iat"] <= int(revocation_utilisateur)
+
+    @classmethod
+    def _noter_revocation(cls, horodatage: int) -> None:
+        """Avance l'horodatage de la dernière révocation connu du processus"""
+        with cls._verrou:
+            cls._derniere_revocation = max(cls._derniere_revocation, horodatage)
+
+    @classmethod
+    def _noter_jetons_revoques(cls, jetons: Dict[str, Any]) -> None:
+        """Ajoute des jetons révoqués à ceux connus du processus, en oubliant les jetons expirés"""
+        maintenant = time.time()
+        with cls._verrou:
+            connus = {**cls._jetons_revoques, **{jti: int(exp) for jti, exp in jetons.items()}}
+            cls._jetons_revoques = {jti: exp for jti, exp in connus.items() if exp > maintenant}
+
+    @classmethod
+    def _doit_relire(cls) -> bool:
+        """Indique si les révocations connues du processus doivent être relues"""
+        return time.monotonic() - cls._lu_a >= JETON_RAFRAICHISSEMENT
+
+    @classmethod
+    def _noter_lecture(cls, derniere_revocation: Optional[str], jetons: Dict[str, Any]) -> None:
+        """Prend en compte les révocations relues dans Redis"""
+        cls._noter_revocation(int(derniere_revocation or 0))
+        cls._noter_jetons_revoques(jetons)
+        cls._lu_a = time.monotonic()
+
+    def _relire_revocations(self) -> None:
+        """Relit les révocations dans Redis (en un aller-retour) si elles sont trop anciennes"""
+        if JetonService._doit_relire():
+            pipeline = self.redis.pipeline(transaction=False)
+            pipeline.get(CLE_DERNIERE_REVOCATION)
+            pipeline.hgetall(CLE_JETONS_REVOQUES)
+            JetonService._noter_lecture(*pipeline.execute())
+
+    def verifier(self, jeton: str) -> Optional[Dict[str, Any]]:
+        """
+        Vérifie un jeton signé
+
+        Args:
+            jeton: Le jeton
+
+        Returns:
+            Les informations de session, ou None si le jeton est invalide, expiré ou révoqué
+        """
+        contenu = self.decoder(jeton)
+        if contenu is None:
+            return None
+
+        self._relire_revocations()
+        if contenu["jti"] in JetonService._jetons_revoques:
+            return None
+
+        # Seuls les jetons émis avant la dernière révocation d'un utilisateur sont comparés à la liste
+        if contenu["iat"] <= JetonService._derniere_revocation:
+            if self.est_revoque(contenu, self.redis.hget(CLE_REVOCATIONS, f"utilisateur:{contenu['uid']}")):
+                return None
+
+        return self.session(contenu)
+
+    def revoquer_jeton(self, jeton: str) -> bool:
+        """
+        Révoque un jeton (déconnexion)
+
+        Args:
+            jeton: Le jeton
+
+        Returns:
+            True si le jeton était valide, False sinon
+        """
+        contenu = self.decoder(jeton)
+        if contenu is None:
+            return False
+        self._script_revoquer_jeton(
+            keys=[CLE_JETONS_REVOQUES], args=[contenu["jti"], contenu["exp"], int(time.time())]
+        )
+        JetonService._noter_jetons_revoques({contenu["jti"]: contenu["exp"]})
+        return True
+
+    def revoquer_utilisateur(self, utilisateur_id: str) -> None:
+        """
+        Révoque tous les jetons émis jusqu'ici pour un utilisateur
+
+        Args:
+            utilisateur_id: L'ID de l'utilisateur
+        """
+        horodatage = maintenant_ms()
+        self._script_revoquer(
+            keys=[CLE_REVOCATIONS, CLE_DERNIERE_REVOCATION],
+            args=[f"utilisateur:{utilisateur_id}", horodatage, horodatage - self.ttl * 1000]
+        )
+        JetonService._noter_revocation(horodatage)
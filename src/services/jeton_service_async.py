@@ -0,0 +1,81 @@
+import time
+from typing import Dict, Any, Optional
+
+from src.models.utilisateur import Utilisateur
+from src.services.jeton_service import (
+    JetonService, JETON_TTL, CLE_DERNIERE_REVOCATION, CLE_REVOCATIONS, CLE_JETONS_REVOQUES, maintenant_ms
+)
+
+class JetonServiceAsync:
+    """
+    Version asyncio de JetonService (mêmes jetons, même liste de révocations)
+
+    La signature et l'expiration sont vérifiées dans le processus; seules les lectures
+    et écritures des révocations sont attendues (await).
+    """
+
+    est_signe = staticmethod(JetonService.est_signe)
+
+    def __init__(self, client_redis, secret_key: str, ttl: int = JETON_TTL):
+        """
+        Initialise le service
+
+        Args:
+            client_redis: Client redis.asyncio
+            secret_key: La clé de signature (SECRET_KEY)
+            ttl: Durée de validité des jetons en secondes
+
+        Raises:
+            ConfigurationError: Si la clé est absente ou est une clé d'exemple
+        """
+        self.jetons = JetonService(secret_key, ttl, client_redis)
+        self.redis = client_redis
+
+    def emettre(self, utilisateur: Utilisateur) -> Dict[str, Any]:
+        """Émet un jeton signé pour un utilisateur authentifié: {token, expiration}"""
+        return self.jetons.emettre(utilisateur)
+
+    async def _relire_revocations(self) -> None:
+        """Relit les révocations dans Redis (en un aller-retour) si elles sont trop anciennes"""
+        if JetonService._doit_relire():
+            pipeline = self.redis.pipeline(transaction=False)
+            pipeline.get(CLE_DERNIERE_REVOCATION)
+            pipeline.hgetall(CLE_JETONS_REVOQUES)
+            JetonService._noter_lecture(*await pipeline.execute())
+
+    async def verifier(self, jeton: str) -> Optional[Dict[str, Any]]:
+        """Vérifie un jeton signé: informations de session, ou None si invalide, expiré ou révoqué"""
+        contenu = self.jetons.decoder(jeton)
+        if contenu is None:
+            return None
+
+        await self._relire_revocations()
+        if contenu["jti"] in JetonService._jetons_revoques:
+            return None
+
+        if contenu["iat"] <= JetonService._derniere_revocation:
+            revocation = await self.redis.hget(CLE_REVOCATIONS, f"utilisateur:{contenu['uid']}")
+            if JetonService.est_revoque(contenu, revocation):
+                return None
+
+        return JetonService.session(contenu)
+
+    async def revoquer_jeton(self, jeton: str) -> bool:
+        """Révoque un jeton (déconnexion); False si le jeton n'était pas valide"""
+        contenu = self.jetons.decoder(jeton)
+        if contenu is None:
+            return False
+        await self.jetons._script_revoquer_jeton(
+            keys=[CLE_JETONS_REVOQUES], args=[contenu["jti"], contenu["exp"], int(time.time())]
+        )
+        JetonService._noter_jetons_revoques({contenu["jti"]: contenu["exp"]})
+        return True
+
+    async def revoquer_utilisateur(self, utilisateur_id: str) -> None:
+        """Révoque tous les jetons émis jusqu'ici pour un utilisateur"""
+        horodatage = maintenant_ms()
+        await self.jetons._script_revoquer(
+            keys=[CLE_REVOCATIONS, CLE_DERNIERE_REVOCATION],
+            args=[f"utilisateur:{utilisateur_id}", horodatage, horodatage - self.jetons.ttl * 1000]
+        )
+        JetonService._noter_revocation(horodatage)
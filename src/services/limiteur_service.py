@@ -0,0 +1,188 @@
+import math
+import os
+import threading
+import time
+from collections import Counter
+from typing import List, Dict, Any, Optional, Tuple
+from dotenv import load_dotenv
+from redis.exceptions import RedisError
+
+from src.config.database import Database
+from src.utils.cache_lru import CacheLRU
+from src.utils.logger import Logger
+
+# Chargement des variables d'environnement
+load_dotenv()
+
+# Tentatives de connexion autorisées en rafale par nom d'utilisateur et par client, et
+# durée en secondes au bout de laquelle un seau vide est de nouveau plein
+LIMITE_CONNEXIONS_USERNAME = int(os.getenv('LIMITE_CONNEXIONS_USERNAME', 5))
+LIMITE_CONNEXIONS_CLIENT = int(os.getenv('LIMITE_CONNEXIONS_CLIENT', 20))
+LIMITE_CONNEXIONS_PERIODE = float(os.getenv('LIMITE_CONNEXIONS_PERIODE', 60))
+
+# Nombre maximal de seaux gardés en mémoire quand Redis est indisponible
+TAILLE_SEAUX_LOCAUX = 10000
+
+# Seaux à jetons: une tentative n'est acceptée que si chaque seau contient un jeton, et
+# consomme alors un jeton de chacun. Un seau se remplit de ARGV[2] jetons par seconde
+# jusqu'à sa capacité ARGV[1], et expire une fois plein.
+# KEYS: les seaux; ARGV[1 + 2i], ARGV[2 + 2i]: capacité et débit du seau i; ARGV[#ARGV]: instant (ms)
+# Retourne {1, 0} si la tentative est acceptée, sinon {0, attente en ms, indice du seau vide}
+SCRIPT_SEAUX = """
+local maintenant = tonumber(ARGV[#ARGV])
+local niveaux = {}
+for i, cle in ipairs(KEYS) do
+    local capacite = tonumber(ARGV[2 * i - 1])
+    local debit = tonumber(ARGV[2 * i])
+    local seau = redis.call('HMGET', cle, 'jetons', 'maj')
+    local jetons = tonumber(seau[1]) or capacite
+    local maj = tonumber(seau[2]) or maintenant
+    jetons = math.min(capacite, jetons + math.max(0, maintenant - maj) / 1000 * debit)
+    if jetons < 1 then
+        return {0, math.ceil((1 - jetons) / debit * 1000), i}
+    end
+    niveaux[i] = jetons
+end
+for i, cle in ipairs(KEYS) do
+    local capacite = tonumber(ARGV[2 * i - 1])
+    local debit = tonumber(ARGV[2 * i])
+    redis.call('HSET', cle, 'jetons', tostring(niveaux[i] - 1), 'maj', maintenant)
+    redis.call('PEXPIRE', cle, math.ceil(capacite / debit * 1000))
+end
+return {1, 0}
+"""
+
+class LimiteurService:
+    """
+    Limitation des tentatives de connexion (seaux à jetons par nom d'utilisateur et par client)
+
+    Les seaux sont stockés dans Redis et mis à jour par un script Lua (vérification et
+    consommation atomiques, partagées par tous les processus). Si Redis est indisponible,
+    des seaux en mémoire prennent le relais dans chaque processus. Les compteurs de
+    tentatives acceptées et rejetées sont tenus par processus.
+    """
+
+    PREFIXE = "limite:connexion:"
+
+    _seaux_locaux = CacheLRU(taille_max=TAILLE_SEAUX_LOCAUX, ttl=LIMITE_CONNEXIONS_PERIODE)
+    _verrou = threading.Lock()
+    _metriques = Counter()
+
+    def __init__(self, limite_username: int = LIMITE_CONNEXIONS_USERNAME,
+                 limite_client: int = LIMITE_CONNEXIONS_CLIENT, periode: float = LIMITE_CONNEXIONS_PERIODE,
+                 client_redis=None):
+        """
+        Initialise le limiteur
+
+        Args:
+            limite_username: Tentatives en rafale par nom d'utilisateur
+            limite_client: Tentatives en rafale par client (adresse IP, poste...)
+            periode: Durée de remplissage complet d'un seau en secondes
+            client_redis: Client Redis (par défaut, la connexion partagée de l'application)
+        """
+        self.limite_username = limite_username
+        self.limite_client = limite_client
+        self.periode = periode
+        self.redis = client_redis or Database.get_redis_connection()
+        self._script_seaux = self.redis.register_script(SCRIPT_SEAUX)
+        self.metriques = LimiteurService._metriques
+        self.logger = Logger.get_instance()
+
+    def seaux(self, username: str, client: Optional[str] = None) -> List[Tuple[str, str, int]]:
+        """
+        Retourne les seaux concernés par une tentative
+
+        Returns:
+            Liste de (type, clé Redis, capacité)
+        """
+        seaux = [("username", f"{self.PREFIXE}username:{username.lower()}", self.limite_username)]
+        if client:
+            seaux.append(("client", f"{self.PREFIXE}client:{client}", self.limite_client))
+        return seaux
+
+    def arguments(self, seaux: List[Tuple[str, str, int]]) -> Tuple[List[str], List[Any]]:
+        """Construit les clés et arguments de SCRIPT_SEAUX"""
+        args = []
+        for _, _, capacite in seaux:
+            args.extend([capacite, capacite / self.periode])
+        args.append(int(time.time() * 1000))
+        return [cle for _, cle, _ in seaux], args
+
+    def consommer(self, username: str, client: Optional[str] = None) -> Optional[float]:
+        """
+        Enregistre une tentative de connexion si les limites le permettent
+
+        Args:
+            username: Le nom d'utilisateur tenté
+            client: L'identifiant du client (adresse IP...), optionnel
+
+        Returns:
+            None si la tentative est acceptée, sinon le délai d'attente en secondes
+        """
+        seaux = self.seaux(username, client)
+        cles, args = self.arguments(seaux)
+        try:
+            resultat = self._script_seaux(keys=cles, args=args)
+        except RedisError as e:
+            self.metriques["repli_memoire"] += 1
+            self.logger.warning(f"Limitation des connexions en mémoire (Redis indisponible): {e}")
+            resultat = self.consommer_local(seaux, args[-1])
+        return self.enregistrer(resultat, seaux)
+
+    def enregistrer(self, resultat: List[int], seaux: List[Tuple[str, str, int]]) -> Optional[float]:
+        """Met à jour les métriques d'après le résultat de SCRIPT_SEAUX et retourne l'attente éventuelle"""
+        self.metriques["tentatives"] += 1
+        if resultat[0]:
+            self.metriques["acceptees"] += 1
+            return None
+
+        self.metriques["rejetees"] += 1
+        self.metriques[f"rejetees_{seaux[int(resultat[2]) - 1][0]}"] += 1
+        return int(resultat[1]) / 1000
+
+    def consommer_local(self, seaux: List[Tuple[str, str, int]], maintenant: int) -> List[int]:
+        """Équivalent en mémoire de SCRIPT_SEAUX (seaux propres au processus)"""
+        with LimiteurService._verrou:
+            niveaux = []
+            for i, (_, cle, capacite) in enumerate(seaux, start=1):
+                debit = capacite / self.periode
+                jetons, maj = self._seaux_locaux.obtenir(cle) or (capacite, maintenant)
+                jetons = min(capacite, jetons + max(0, maintenant - maj) / 1000 * debit)
+                if jetons < 1:
+                    return [0, math.ceil((1 - jetons) / debit * 1000), i]
+                niveaux.append(jetons)
+
+            for (_, cle, _), jetons in zip(seaux, niveaux):
+                self._seaux_locaux.definir(cle, (jetons - 1, maintenant))
+            return [1, 0]
+
+    def reinitialiser(self, username: str) -> None:
+        """
+        Remplit le seau d'un nom d'utilisateur (après une connexion réussie)
+
+        Args:
+            username: Le nom d'utilisateur
+        """
+        _, cle, _ = self.seaux(username)[0]
+        self._seaux_locaux.supprimer(cle)
+        try:
+            self.redis.delete(cle)
+        except RedisError:
+            pass
+
+    @classmethod
+    def statistiques(cls) -> Dict[str, Any]:
+        """
+        Retourne les compteurs du processus
+
+        Returns:
+            Dictionnaire {tentatives, acceptees, rejetees, rejetees_username, rejetees_client,
+            repli_memoire, taux_rejet}
+        """
+        metriques = cls._metriques
+        statistiques = {
+            cle: metriques[cle]
+            for cle in ("tentatives", "acceptees", "rejetees", "rejetees_username", "rejetees_client", "repli_memoire")
+        }
+        statistiques["taux_rejet"] = metriques["rejetees"] / metriques["tentatives"] if metriques["tentatives"] else 0.0
+        return statistiques
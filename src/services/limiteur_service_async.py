@@ -0,0 +1,41 @@
+from typing import Optional
+from redis.exceptions import RedisError
+
+from src.services.limiteur_service import LimiteurService
+
+class LimiteurServiceAsync:
+    """
+    Version asyncio de LimiteurService (mêmes seaux Redis, même repli en mémoire et
+    mêmes compteurs)
+    """
+
+    def __init__(self, client_redis):
+        """
+        Initialise le limiteur
+
+        Args:
+            client_redis: Client redis.asyncio
+        """
+        self.limiteur = LimiteurService(client_redis=client_redis)
+        self.redis = client_redis
+
+    async def consommer(self, username: str, client: Optional[str] = None) -> Optional[float]:
+        """Enregistre une tentative de connexion: None si acceptée, sinon le délai d'attente en secondes"""
+        seaux = self.limiteur.seaux(username, client)
+        cles, args = self.limiteur.arguments(seaux)
+        try:
+            resultat = await self.limiteur._script_seaux(keys=cles, args=args)
+        except RedisError as e:
+            self.limiteur.metriques["repli_memoire"] += 1
+            self.limiteur.logger.warning(f"Limitation des connexions en mémoire (Redis indisponible): {e}")
+            resultat = self.limiteur.consommer_local(seaux, args[-1])
+        return self.limiteur.enregistrer(resultat, seaux)
+
+    async def reinitialiser(self, username: str) -> None:
+        """Remplit le seau d'un nom d'utilisateur (après une connexion réussie)"""
+        _, cle, _ = self.limiteur.seaux(username)[0]
+        self.limiteur._seaux_locaux.supprimer(cle)
+        try:
+            await self.redis.delete(cle)
+        except RedisError:
+            pass
@@ -0,0 +1,179 @@
+import asyncio
+import os
+import re
+import secrets
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from typing import List, Optional
+import bcrypt
+from dotenv import load_dotenv
+
+# Chargement des variables d'environnement
+load_dotenv()
+
+# Facteur de travail bcrypt (2^cout itérations): chaque incrément double le temps de
+# hachage et de vérification. Les hashs d'un autre coût sont refaits à la connexion.
+BCRYPT_COUT = int(os.getenv('BCRYPT_COUT', 12))
+
+# Nombre de processus du pool de hachage (0 ou absent: un par cœur)
+MOT_DE_PASSE_PROCESSUS = int(os.getenv('MOT_DE_PASSE_PROCESSUS', 0)) or os.cpu_count() or 1
+
+# En dessous de ce nombre de mots de passe, un lot est haché sans passer par le pool
+TAILLE_MIN_LOT_POOL = 4
+
+# Caractères des mots de passe générés (sans les caractères ambigus: 0/O, 1/l/I)
+ALPHABET_MOT_DE_PASSE = "abcdefghijkmnopqrstuvwxyzABCDEFGHJKLMNPQRSTUVWXYZ23456789"
+
+_MOTIF_COUT = re.compile(r"^\$2[abxy]?\$(\d{2})\$")
+
+def hacher(password: str, cout: int = BCRYPT_COUT) -> str:
+    """
+    Hache un mot de passe avec bcrypt
+
+    Fonction de module pour pouvoir être exécutée dans un processus du pool.
+
+    Args:
+        password: Le mot de passe en clair
+        cout: Le facteur de travail bcrypt
+
+    Returns:
+        Le hash bcrypt
+    """
+    return bcrypt.hashpw(password.encode('utf-8'), bcrypt.gensalt(rounds=cout)).decode('utf-8')
+
+def verifier(password: str, password_hash: str) -> bool:
+    """
+    Vérifie un mot de passe contre un hash bcrypt
+
+    Args:
+        password: Le mot de passe en clair
+        password_hash: Le hash bcrypt
+
+    Returns:
+        True si le mot de passe correspond, False sinon
+    """
+    if not password_hash:
+        return False
+    return bcrypt.checkpw(password.encode('utf-8'), password_hash.encode('utf-8'))
+
+def cout_du_hash(password_hash: str) -> Optional[int]:
+    """
+    Lit le facteur de travail d'un hash bcrypt ($2b$<cout>$...)
+
+    Returns:
+        Le coût, ou None si le hash n'est pas un hash bcrypt
+    """
+    correspondance = _MOTIF_COUT.match(password_hash or "")
+    return int(correspondance.group(1)) if correspondance else None
+
+def generer_mot_de_passe(longueur: int = 12) -> str:
+    """
+    Génère un mot de passe initial aléatoire (module secrets)
+
+    Args:
+        longueur: Nombre de caractères
+
+    Returns:
+        Le mot de passe en clair
+    """
+    return "".join(secrets.choice(ALPHABET_MOT_DE_PASSE) for _ in range(longueur))
+
+class MotDePasseService:
+    """
+    Service de hachage et de vérification des mots de passe
+
+    Un hachage bcrypt coûte plusieurs centaines de millisecondes de CPU. Les opérations
+    unitaires du mode console s'exécutent directement; les lots (création de comptes en
+    masse) et les opérations asynchrones (connexions simultanées en mode serveur) sont
+    répartis sur un pool de processus partagé, créé au premier usage.
+    """
+
+    _pool: Optional[ProcessPoolExecutor] = None
+    _verrou = threading.Lock()
+
+    def __init__(self, cout: int = BCRYPT_COUT):
+        """
+        Initialise le service
+
+        Args:
+            cout: Le facteur de travail des nouveaux hashs
+        """
+        self.cout = cout
+
+    @classmethod
+    def pool(cls) -> ProcessPoolExecutor:
+        """Retourne le pool de processus partagé, en le créant au premier appel"""
+        if cls._pool is None:
+            with cls._verrou:
+                if cls._pool is None:
+                    cls._pool = ProcessPoolExecutor(max_workers=MOT_DE_PASSE_PROCESSUS)
+        return cls._pool
+
+    @classmethod
+    def arreter(cls) -> None:
+        """Arrête le pool de processus partagé (recréé au prochain usage)"""
+        with cls._verrou:
+            if cls._pool is not None:
+                cls._pool.shutdown()
+                cls._pool = None
+
+    def hacher(self, password: str) -> str:
+        """
+        Hache un mot de passe avec le coût configuré
+
+        Args:
+            password: Le mot de passe en clair
+
+        Returns:
+            Le hash bcrypt
+        """
+        return hacher(password, self.cout)
+
+    def verifier(self, password: str, password_hash: str) -> bool:
+        """
+        Vérifie un mot de passe
+
+        Args:
+            password: Le mot de passe en clair
+            password_hash: Le hash enregistré
+
+        Returns:
+            True si le mot de passe correspond, False sinon
+        """
+        return verifier(password, password_hash)
+
+    def hacher_lot(self, passwords: List[str]) -> List[str]:
+        """
+        Hache une liste de mots de passe sur le pool de processus
+
+        Args:
+            passwords: Les mots de passe en clair
+
+        Returns:
+            Les hashs, dans l'ordre des mots de passe
+        """
+        if len(passwords) < TAILLE_MIN_LOT_POOL:
+            return [self.hacher(password) for password in passwords]
+
+        morceau = max(1, len(passwords) // (MOT_DE_PASSE_PROCESSUS * 4))
+        return list(self.pool().map(hacher, passwords, [self.cout] * len(passwords), chunksize=morceau))
+
+    async def hacher_async(self, password: str) -> str:
+        """Hache un mot de passe sur le pool sans bloquer la boucle d'événements"""
+        return await asyncio.get_running_loop().run_in_executor(self.pool(), hacher, password, self.cout)
+
+    async def verifier_async(self, password: str, password_hash: str) -> bool:
+        """Vérifie un mot de passe sur le pool sans bloquer la boucle d'événements"""
+        return await asyncio.get_running_loop().run_in_executor(self.pool(), verifier, password, password_hash)
+
+    def doit_rehacher(self, password_hash: str) -> bool:
+        """
+        Indique si un hash a été produit avec un autre coût que le coût configuré
+
+        Args:
+            password_hash: Le hash enregistré
+
+        Returns:
+            True si le hash doit être refait à partir du mot de passe en clair
+        """
+        return cout_du_hash(password_hash) != self.cout
@@ -2,10 +2,12 @@ import smtplib
 import os
 from email.mime.text import MIMEText
 from email.mime.multipart import MIMEMultipart
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, Iterable, Tuple
 from dotenv import load_dotenv
 
 from src.models.etudiant import Etudiant
+from src.models.classe_frame import ClasseFrame
+from src.utils.logger import Logger
 
 # Chargement des variables d'environnement
 load_dotenv()
@@ -22,6 +24,9 @@ class NotificationService:
         
         # Flag pour activer/désactiver les notifications (utile pour les tests)
         self.notifications_actives = os.getenv('NOTIFICATIONS_ACTIVES', 'false').lower() == 'true'
+        
+        # Journal sur stderr (et fichier): la sortie standard reste réservée aux résultats de la CLI
+        self.logger = Logger.get_instance()
     
     def envoyer_email(self, destinataire: str, sujet: str, contenu: str) -> bool:
         """
@@ -36,31 +41,71 @@ class NotificationService:
             True si l'envoi a réussi, False sinon
         """
         if not self.notifications_actives:
-            print(f"[NOTIFICATION DÉSACTIVÉE] Email à {destinataire}: {sujet}")
+            self.logger.info(f"[NOTIFICATION DÉSACTIVÉE] Email à {destinataire}: {sujet}")
             return True
         
         try:
-            # Créer le message
-            message = MIMEMultipart()
-            message['From'] = self.email_user
-            message['To'] = destinataire
-            message['Subject'] = sujet
-            
-            # Ajouter le contenu HTML
-            message.attach(MIMEText(contenu, 'html'))
-            
             # Connexion au serveur SMTP
             with smtplib.SMTP(self.email_host, self.email_port) as serveur:
                 serveur.starttls()
                 serveur.login(self.email_user, self.email_password)
-                serveur.send_message(message)
+                serveur.send_message(self._construire_message(destinataire, sujet, contenu))
             
             return True
             
         except Exception as e:
-            print(f"Erreur lors de l'envoi de l'email: {e}")
+            self.logger.error(f"Erreur lors de l'envoi de l'email: {e}")
             return False
     
+    def envoyer_emails(self, messages: Iterable[Tuple[str, str, str]]) -> int:
+        """
+        Envoie plusieurs emails sur une seule connexion SMTP
+        
+        Args:
+            messages: Triplets (destinataire, sujet, contenu HTML)
+            
+        Returns:
+            Le nombre d'emails envoyés
+        """
+        messages = list(messages)
+        if not messages:
+            return 0
+        
+        if not self.notifications_actives:
+            for destinataire, sujet, _ in messages:
+                self.logger.info(f"[NOTIFICATION DÉSACTIVÉE] Email à {destinataire}: {sujet}")
+            return len(messages)
+        
+        envoyes = 0
+        try:
+            with smtplib.SMTP(self.email_host, self.email_port) as serveur:
+                serveur.starttls()
+                serveur.login(self.email_user, self.email_password)
+                for destinataire, sujet, contenu in messages:
+                    try:
+                        serveur.send_message(self._construire_message(destinataire, sujet, contenu))
+                        envoyes += 1
+                    except smtplib.SMTPRecipientsRefused as e:
+                        self.logger.error(f"Erreur lors de l'envoi de l'email à {destinataire}: {e}")
+        except Exception as e:
+            self.logger.error(f"Erreur lors de l'envoi des emails: {e}")
+        
+        return envoyes
+    
+    def _construire_message(self, destinataire: str, sujet: str, contenu: str) -> MIMEMultipart:
+        """Construit un email HTML"""
+        message = MIMEMultipart()
+        message['From'] = self.email_user
+        message['To'] = destinataire
+        message['Subject'] = sujet
+        message.attach(MIMEText(contenu, 'html'))
+        return message
+    
+    @staticmethod
+    def _email_etudiant(etudiant: Etudiant) -> str:
+        """Adresse simulée d'un étudiant (on suppose qu'on a l'email de l'étudiant)"""
+        return f"{etudiant.prenom.lower()}.{etudiant.nom.lower()}@example.com"
+    
     def notifier_nouvelle_note(self, etudiant: Etudiant, matiere: str, note: float) -> bool:
         """
         Notifie l'étudiant d'une nouvelle note
@@ -73,8 +118,11 @@ class NotificationService:
         Returns:
             True si la notification a été envoyée, False sinon
         """
-        # Simuler un email (on suppose qu'on a l'email de l'étudiant)
-        email = f"{etudiant.prenom.lower()}.{etudiant.nom.lower()}@example.com"
+        return self.envoyer_email(*self._message_nouvelle_note(etudiant, matiere, note))
+    
+    def _message_nouvelle_note(self, etudiant: Etudiant, matiere: str, note: float) -> Tuple[str, str, str]:
+        """Construit l'email (destinataire, sujet, contenu) d'une nouvelle note"""
+        email = self._email_etudiant(etudiant)
         
         sujet = f"Nouvelle note en {matiere}"
         
@@ -93,7 +141,7 @@ class NotificationService:
         </html>
         """
         
-        return self.envoyer_email(email, sujet, contenu)
+        return email, sujet, contenu
     
     def notifier_moyenne_faible(self, etudiant: Etudiant) -> bool:
         """
@@ -108,8 +156,11 @@ class NotificationService:
         if etudiant.moyenne >= 10:
             return False
         
-        # Simuler un email
-        email = f"{etudiant.prenom.lower()}.{etudiant.nom.lower()}@example.com"
+        return self.envoyer_email(*self._message_moyenne_faible(etudiant))
+    
+    def _message_moyenne_faible(self, etudiant: Etudiant) -> Tuple[str, str, str]:
+        """Construit l'email (destinataire, sujet, contenu) d'alerte de moyenne faible"""
+        email = self._email_etudiant(etudiant)
         
         sujet = "Alerte: Moyenne en dessous de 10/20"
         
@@ -124,15 +175,37 @@ class NotificationService:
         </html>
         """
         
-        return self.envoyer_email(email, sujet, contenu)
+        return email, sujet, contenu
+    
+    def notifier_notes_en_masse(self, etudiants: Iterable[Etudiant], matiere: str) -> int:
+        """
+        Notifie une saisie de notes groupée (nouvelle note et, le cas échéant, moyenne
+        faible) en envoyant tous les emails sur une seule connexion SMTP
+        
+        Args:
+            etudiants: Les étudiants notés, avec leurs notes à jour
+            matiere: La matière saisie
+            
+        Returns:
+            Le nombre d'emails envoyés
+        """
+        messages = []
+        for etudiant in etudiants:
+            messages.append(self._message_nouvelle_note(etudiant, matiere, etudiant.notes[matiere]))
+            if etudiant.moyenne < 10:
+                messages.append(self._message_moyenne_faible(etudiant))
+        return self.envoyer_emails(messages)
     
     def envoyer_rapport_classe(self, classe: str, etudiants: List[Etudiant], moyenne_classe: float) -> bool:
         """
         Envoie un rapport sur les résultats d'une classe aux enseignants
         
+        Le classement (moyennes, ordre et rangs, ex aequo au même rang) est calculé
+        par NumPy sur la structure en colonnes des étudiants.
+        
         Args:
             classe: La classe concernée
-            etudiants: Liste des étudiants de la classe
+            etudiants: Liste des étudiants de la classe (dans un ordre quelconque)
             moyenne_classe: Moyenne générale de la classe
             
         Returns:
@@ -143,15 +216,19 @@ class NotificationService:
         
         sujet = f"Rapport des résultats de la classe {classe}"
         
-        # Construire le tableau des résultats
+        # Construire le tableau des résultats, par moyenne décroissante
+        frame = ClasseFrame.depuis_etudiants(etudiants)
+        moyennes = frame.moyennes()
+        rangs = frame.rangs(moyennes)
         tableau_etudiants = ""
-        for i, etudiant in enumerate(etudiants, 1):
+        for i in frame.ordre(moyennes):
+            etudiant = etudiants[i]
             tableau_etudiants += f"""
             <tr>
-                <td>{i}</td>
+                <td>{rangs[i]}</td>
                 <td>{etudiant.nom}</td>
                 <td>{etudiant.prenom}</td>
-                <td>{etudiant.moyenne:.2f}/20</td>
+                <td>{moyennes[i]:.2f}/20</td>
             </tr>
             """
         
@@ -0,0 +1,249 @@
+import os
+import time
+import uuid
+from typing import List, Dict, Any, Optional
+from dotenv import load_dotenv
+
+from src.config.database import Database
+from src.models.utilisateur import Utilisateur
+from src.utils.cache_lru import CacheLRU
+
+# Chargement des variables d'environnement
+load_dotenv()
+
+# Durée de vie glissante d'une session (prolongée à chaque vérification) et durée
+# maximale depuis la connexion, en secondes
+SESSION_TTL = int(os.getenv('SESSION_TTL', 24 * 60 * 60))
+SESSION_DUREE_MAX = int(os.getenv('SESSION_DUREE_MAX', 7 * 24 * 60 * 60))
+
+# Durée de vie des vérifications mémorisées dans le processus (0 pour désactiver).
+# Une session révoquée par un autre processus reste acceptée ici au plus ce délai.
+SESSION_CACHE_TTL = float(os.getenv('SESSION_CACHE_TTL', 5))
+
+# Lit une session et prolonge sa durée de vie, sans dépasser sa fin absolue
+# KEYS[1]: clé de la session, ARGV[1]: instant courant, ARGV[2]: durée de vie glissante
+SCRIPT_VERIFIER_SESSION = """
+local donnees = redis.call('HGETALL', KEYS[1])
+if #donnees == 0 then
+    return donnees
+end
+local fin = 0
+for i = 1, #donnees, 2 do
+    if donnees[i] == 'fin' then
+        fin = tonumber(donnees[i + 1])
+    end
+end
+local restant = fin - tonumber(ARGV[1])
+if restant <= 0 then
+    redis.call('DEL', KEYS[1])
+    return {}
+end
+local ttl = math.min(tonumber(ARGV[2]), restant)
+redis.call('EXPIRE', KEYS[1], ttl)
+table.insert(donnees, 'ttl')
+table.insert(donnees, tostring(ttl))
+return donnees
+"""
+
+# Supprime toutes les sessions d'un utilisateur et son index
+# KEYS[1]: index des sessions de l'utilisateur, ARGV[1]: préfixe des clés de session
+SCRIPT_SUPPRIMER_SESSIONS = """
+local tokens = redis.call('SMEMBERS', KEYS[1])
+local supprimees = 0
+for _, token in ipairs(tokens) do
+    supprimees = supprimees + redis.call('DEL', ARGV[1] .. token)
+end
+redis.call('DEL', KEYS[1])
+return {supprimees, tokens}
+"""
+
+class SessionService:
+    """
+    Stockage des sessions utilisateur dans Redis
+
+    Chaque session est un hash "session:<token>" créé avec sa durée de vie dans une
+    transaction (MULTI), et dont la durée de vie est prolongée à chaque vérification
+    (expiration glissante, bornée par SESSION_DUREE_MAX depuis la connexion). Les tokens
+    actifs d'un utilisateur sont indexés dans l'ensemble "sessions:utilisateur:<id>":
+    toutes ses sessions se révoquent sans parcourir l'espace de clés. Les vérifications
+    réussies sont mémorisées quelques secondes dans le processus.
+    """
+
+    PREFIXE = "session:"
+    PREFIXE_UTILISATEUR = "sessions:utilisateur:"
+
+    _verifications = None  # Cache des vérifications, partagé par les instances du processus
+
+    @staticmethod
+    def get_cache_verifications() -> CacheLRU:
+        """Récupère le cache des vérifications du processus (créé au premier appel)"""
+        if SessionService._verifications is None:
+            SessionService._verifications = CacheLRU(
+                taille_max=int(os.getenv('SESSION_CACHE_TAILLE', 10000)),
+                ttl=SESSION_CACHE_TTL
+            )
+        return SessionService._verifications
+
+    def __init__(self, ttl: int = SESSION_TTL, duree_max: int = SESSION_DUREE_MAX):
+        """
+        Initialise le service
+
+        Args:
+            ttl: Durée de vie glissante des sessions en secondes
+            duree_max: Durée maximale d'une session depuis la connexion en secondes
+        """
+        self.redis = Database.get_redis_connection()
+        self.ttl = ttl
+        self.duree_max = duree_max
+        self.local = SessionService.get_cache_verifications()
+        self._script_verifier = self.redis.register_script(SCRIPT_VERIFIER_SESSION)
+        self._script_supprimer = self.redis.register_script(SCRIPT_SUPPRIMER_SESSIONS)
+
+    @staticmethod
+    def _nouvelle_session(utilisateur: Utilisateur, maintenant: int, duree_max: int) -> Dict[str, Any]:
+        """Construit les champs du hash d'une nouvelle session"""
+        session = {
+            "utilisateur_id": utilisateur._id,
+            "username": utilisateur.username,
+            "role": utilisateur.role.value,
+            "creation": maintenant,
+            "fin": maintenant + duree_max
+        }
+        if utilisateur.id_etudiant:
+            session["id_etudiant"] = utilisateur.id_etudiant
+        return session
+
+    @staticmethod
+    def _decoder(donnees: List[str], maintenant: int) -> Dict[str, Any]:
+        """Construit les informations de session à partir du résultat de SCRIPT_VERIFIER_SESSION"""
+        champs = dict(zip(donnees[::2], donnees[1::2]))
+        return {
+            "utilisateur_id": champs.get("utilisateur_id"),
+            "username": champs.get("username"),
+            "role": champs.get("role"),
+            "id_etudiant": champs.get("id_etudiant"),
+            "expiration": maintenant + int(champs["ttl"])
+        }
+
+    def cle(self, token: str) -> str:
+        """Retourne la clé d'une session"""
+        return f"{self.PREFIXE}{token}"
+
+    def cle_utilisateur(self, utilisateur_id: str) -> str:
+        """Retourne la clé de l'index des sessions d'un utilisateur"""
+        return f"{self.PREFIXE_UTILISATEUR}{utilisateur_id}"
+
+    def creer(self, utilisateur: Utilisateur) -> Dict[str, Any]:
+        """
+        Ouvre une session pour un utilisateur authentifié
+
+        Args:
+            utilisateur: L'utilisateur
+
+        Returns:
+            Dictionnaire {token, expiration}
+        """
+        token = str(uuid.uuid4())
+        maintenant = int(time.time())
+        session = self._nouvelle_session(utilisateur, maintenant, self.duree_max)
+
+        # Hash, durée de vie et index de l'utilisateur en une seule transaction
+        pipeline = self.redis.pipeline(transaction=True)
+        pipeline.hset(self.cle(token), mapping=session)
+        pipeline.expire(self.cle(token), self.ttl)
+        pipeline.sadd(self.cle_utilisateur(utilisateur._id), token)
+        pipeline.expire(self.cle_utilisateur(utilisateur._id), self.duree_max)
+        pipeline.execute()
+
+        return {"token": token, "expiration": maintenant + min(self.ttl, self.duree_max)}
+
+    def verifier(self, token: str) -> Optional[Dict[str, Any]]:
+        """
+        Vérifie une session et prolonge sa durée de vie
+
+        Args:
+            token: Le token de session
+
+        Returns:
+            Les informations de session (utilisateur_id, username, role, id_etudiant,
+            expiration), ou None si la session est invalide ou expirée
+        """
+        session = self.local.obtenir(token)
+        if session is not None:
+            return dict(session)
+
+        maintenant = int(time.time())
+        donnees = self._script_verifier(keys=[self.cle(token)], args=[maintenant, self.ttl])
+        if not donnees:
+            return None
+
+        session = self._decoder(donnees, maintenant)
+        self.local.definir(token, session)
+        return dict(session)
+
+    def supprimer(self, token: str) -> bool:
+        """
+        Ferme une session
+
+        Args:
+            token: Le token de session
+
+        Returns:
+            True si la session existait, False sinon
+        """
+        self.local.supprimer(token)
+        utilisateur_id = self.redis.hget(self.cle(token), "utilisateur_id")
+
+        pipeline = self.redis.pipeline(transaction=True)
+        pipeline.delete(self.cle(token))
+        if utilisateur_id:
+            pipeline.srem(self.cle_utilisateur(utilisateur_id), token)
+        return bool(pipeline.execute()[0])
+
+    def supprimer_sessions_utilisateur(self, utilisateur_id: str) -> int:
+        """
+        Ferme toutes les sessions d'un utilisateur ("déconnexion partout")
+
+        Args:
+            utilisateur_id: L'ID de l'utilisateur
+
+        Returns:
+            Le nombre de sessions fermées
+        """
+        supprimees, tokens = self._script_supprimer(keys=[self.cle_utilisateur(utilisateur_id)], args=[self.PREFIXE])
+        self.local.supprimer(*tokens)
+        return int(supprimees)
+
+    def lister_sessions(self, utilisateur_id: str) -> List[Dict[str, Any]]:
+        """
+        Liste les sessions actives d'un utilisateur (sans prolonger leur durée de vie)
+
+        Les tokens des sessions expirées sont retirés de l'index au passage.
+
+        Args:
+            utilisateur_id: L'ID de l'utilisateur
+
+        Returns:
+            Liste de {token, creation, expiration}
+        """
+        tokens = list(self.redis.smembers(self.cle_utilisateur(utilisateur_id)))
+        if not tokens:
+            return []
+
+        pipeline = self.redis.pipeline(transaction=False)
+        for token in tokens:
+            pipeline.hget(self.cle(token), "creation")
+            pipeline.ttl(self.cle(token))
+        resultats = pipeline.execute()
+
+        maintenant = int(time.time())
+        sessions, expires = [], []
+        for token, creation, ttl in zip(tokens, resultats[::2], resultats[1::2]):
+            if creation is None or ttl < 0:
+                expires.append(token)
+            else:
+                sessions.append({"token": token, "creation": int(creation), "expiration": maintenant + ttl})
+
+        if expires:
+            self.redis.srem(self.cle_utilisateur(utilisateur_id), *expires)
+        return sessions
@@ -0,0 +1,112 @@
+import time
+import uuid
+from typing import List, Dict, Any, Optional
+
+from src.models.utilisateur import Utilisateur
+from src.services.session_service import (
+    SessionService, SESSION_TTL, SESSION_DUREE_MAX, SCRIPT_VERIFIER_SESSION, SCRIPT_SUPPRIMER_SESSIONS
+)
+
+class SessionServiceAsync:
+    """
+    Version asyncio de SessionService (mêmes clés, mêmes scripts, même cache local)
+
+    Une session ouverte par l'un des deux services est vérifiée et révoquée par l'autre.
+    """
+
+    def __init__(self, client_redis, ttl: int = SESSION_TTL, duree_max: int = SESSION_DUREE_MAX):
+        """
+        Initialise le service
+
+        Args:
+            client_redis: Client redis.asyncio
+            ttl: Durée de vie glissante des sessions en secondes
+            duree_max: Durée maximale d'une session depuis la connexion en secondes
+        """
+        self.redis = client_redis
+        self.ttl = ttl
+        self.duree_max = duree_max
+        self.local = SessionService.get_cache_verifications()
+        self._script_verifier = self.redis.register_script(SCRIPT_VERIFIER_SESSION)
+        self._script_supprimer = self.redis.register_script(SCRIPT_SUPPRIMER_SESSIONS)
+
+    def cle(self, token: str) -> str:
+        """Retourne la clé d'une session"""
+        return f"{SessionService.PREFIXE}{token}"
+
+    def cle_utilisateur(self, utilisateur_id: str) -> str:
+        """Retourne la clé de l'index des sessions d'un utilisateur"""
+        return f"{SessionService.PREFIXE_UTILISATEUR}{utilisateur_id}"
+
+    async def creer(self, utilisateur: Utilisateur) -> Dict[str, Any]:
+        """Ouvre une session pour un utilisateur authentifié et retourne {token, expiration}"""
+        token = str(uuid.uuid4())
+        maintenant = int(time.time())
+        session = SessionService._nouvelle_session(utilisateur, maintenant, self.duree_max)
+
+        pipeline = self.redis.pipeline(transaction=True)
+        pipeline.hset(self.cle(token), mapping=session)
+        pipeline.expire(self.cle(token), self.ttl)
+        pipeline.sadd(self.cle_utilisateur(utilisateur._id), token)
+        pipeline.expire(self.cle_utilisateur(utilisateur._id), self.duree_max)
+        await pipeline.execute()
+
+        return {"token": token, "expiration": maintenant + min(self.ttl, self.duree_max)}
+
+    async def verifier(self, token: str) -> Optional[Dict[str, Any]]:
+        """Vérifie une session et prolonge sa durée de vie (None si invalide ou expirée)"""
+        session = self.local.obtenir(token)
+        if session is not None:
+            return dict(session)
+
+        maintenant = int(time.time())
+        donnees = await self._script_verifier(keys=[self.cle(token)], args=[maintenant, self.ttl])
+        if not donnees:
+            return None
+
+        session = SessionService._decoder(donnees, maintenant)
+        self.local.definir(token, session)
+        return dict(session)
+
+    async def supprimer(self, token: str) -> bool:
+        """Ferme une session et retourne True si elle existait"""
+        self.local.supprimer(token)
+        utilisateur_id = await self.redis.hget(self.cle(token), "utilisateur_id")
+
+        pipeline = self.redis.pipeline(transaction=True)
+        pipeline.delete(self.cle(token))
+        if utilisateur_id:
+            pipeline.srem(self.cle_utilisateur(utilisateur_id), token)
+        return bool((await pipeline.execute())[0])
+
+    async def supprimer_sessions_utilisateur(self, utilisateur_id: str) -> int:
+        """Ferme toutes les sessions d'un utilisateur et retourne leur nombre"""
+        supprimees, tokens = await self._script_supprimer(
+            keys=[self.cle_utilisateur(utilisateur_id)], args=[SessionService.PREFIXE]
+        )
+        self.local.supprimer(*tokens)
+        return int(supprimees)
+
+    async def lister_sessions(self, utilisateur_id: str) -> List[Dict[str, Any]]:
+        """Liste les sessions actives d'un utilisateur: [{token, creation, expiration}]"""
+        tokens = list(await self.redis.smembers(self.cle_utilisateur(utilisateur_id)))
+        if not tokens:
+            return []
+
+        pipeline = self.redis.pipeline(transaction=False)
+        for token in tokens:
+            pipeline.hget(self.cle(token), "creation")
+            pipeline.ttl(self.cle(token))
+        resultats = await pipeline.execute()
+
+        maintenant = int(time.time())
+        sessions, expires = [], []
+        for token, creation, ttl in zip(tokens, resultats[::2], resultats[1::2]):
+            if creation is None or ttl < 0:
+                expires.append(token)
+            else:
+                sessions.append({"token": token, "creation": int(creation), "expiration": maintenant + ttl})
+
+        if expires:
+            await self.redis.srem(self.cle_utilisateur(utilisateur_id), *expires)
+        return sessions
@@ -0,0 +1,91 @@
+from typing import Dict, Any
+
+from src.config.database import Database
+from src.services.etudiant.agregation import EXPRESSION_MOYENNE, MENTIONS
+
+# Bucket des moyennes hors de [0, 21) (notes corrompues): sans lui, $bucket échoue
+HORS_BORNES = "hors_bornes"
+
+class StatistiquesService:
+    """Service de calcul des statistiques sur les étudiants"""
+
+    def __init__(self):
+        """Initialise le service avec la connexion à la base de données"""
+        self.db = Database.get_db()
+        self.collection = self.db.etudiants
+
+    def calculer_statistiques(self) -> Dict[str, Any]:
+        """
+        Calcule toutes les statistiques des étudiants en une seule agrégation $facet
+
+        Returns:
+            Dictionnaire contenant:
+                nb_total: nombre total d'étudiants
+                nb_avec_notes: nombre d'étudiants ayant au moins une note
+                moyenne_generale: moyenne des moyennes des étudiants ayant des notes
+                classes: liste de {classe, nombre, nb_avec_notes, moyenne} par classe
+                mentions: nombre d'étudiants (ayant des notes) par mention, moyennes hors
+                    de [0, 21) ignorées
+        """
+        a_des_notes = {"$gt": ["$nb_notes", 0]}
+
+        pipeline = [
+            {"$project": {
+                "classe": 1,
+                "moyenne": EXPRESSION_MOYENNE,
+                "nb_notes": {"$size": {"$objectToArray": {"$ifNull": ["$notes", {}]}}}
+            }},
+            {"$facet": {
+                "global": [
+                    {"$group": {
+                        "_id": None,
+                        "nb_total": {"$sum": 1},
+                        "nb_avec_notes": {"$sum": {"$cond": [a_des_notes, 1, 0]}},
+                        "moyenne_generale": {"$avg": {"$cond": [a_des_notes, "$moyenne", None]}}
+                    }}
+                ],
+                "classes": [
+                    {"$group": {
+                        "_id": "$classe",
+                        "nombre": {"$sum": 1},
+                        "nb_avec_notes": {"$sum": {"$cond": [a_des_notes, 1, 0]}},
+                        "moyenne": {"$avg": {"$cond": [a_des_notes, "$moyenne", None]}}
+                    }},
+                    {"$sort": {"_id": 1}}
+                ],
+                "mentions": [
+                    {"$match": {"nb_notes": {"$gt": 0}}},
+                    {"$bucket": {
+                        "groupBy": "$moyenne",
+                        "boundaries": list(MENTIONS.keys()) + [21],
+                        "default": HORS_BORNES,
+                        "output": {"nombre": {"$sum": 1}}
+                    }}
+                ]
+            }}
+        ]
+
+        resultat = next(self.collection.aggregate(pipeline), {})
+        global_ = (resultat.get("global") or [{}])[0]
+
+        mentions = {mention: 0 for mention in MENTIONS.values()}
+        for bucket in resultat.get("mentions", []):
+            if bucket["_id"] == HORS_BORNES:
+                continue
+            mentions[MENTIONS[bucket["_id"]]] = bucket["nombre"]
+
+        return {
+            "nb_total": global_.get("nb_total", 0),
+            "nb_avec_notes": global_.get("nb_avec_notes", 0),
+            "moyenne_generale": global_.get("moyenne_generale") or 0.0,
+            "classes": [
+                {
+                    "classe": classe["_id"],
+                    "nombre": classe["nombre"],
+                    "nb_avec_notes": classe["nb_avec_notes"],
+                    "moyenne": classe["moyenne"]
+                }
+                for classe in resultat.get("classes", [])
+            ],
+            "mentions": mentions
+        }
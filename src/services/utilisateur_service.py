@@ -1,12 +1,42 @@
-import json
 import os
-from typing import List, Dict, Any, Optional
+import re
+from typing import List, Dict, Any, Optional, Iterable, Callable
 from bson import ObjectId
-import time
-import uuid
+from pymongo import ReturnDocument
+from pymongo.errors import DuplicateKeyError, BulkWriteError
 
+from src.models.etudiant import Etudiant
 from src.models.utilisateur import Utilisateur, Role
 from src.config.database import Database
+from src.services.cache_service import CacheService, MARQUEUR_ABSENT
+from src.services.etudiant.recherche import normaliser
+from src.services.mot_de_passe_service import MotDePasseService, generer_mot_de_passe
+from src.services.session_service import SessionService
+from src.services.jeton_service import JetonService, SESSIONS_SIGNEES
+from src.services.limiteur_service import LimiteurService
+from src.utils.exception.exceptions import RateLimitError
+from src.utils.concurrence import decouper
+
+# Domaine des adresses email des comptes étudiants créés en masse
+DOMAINE_EMAIL_ETUDIANTS = os.getenv('DOMAINE_EMAIL_ETUDIANTS', 'example.com')
+
+# Nombre d'insertions d'un lot de comptes avant d'abandonner les noms d'utilisateur
+# pris entre-temps par un autre processus
+MAX_TENTATIVES_NOMS = 3
+
+def username_de_base(prenom: str, nom: str) -> str:
+    """
+    Construit le nom d'utilisateur d'un étudiant avant suffixe d'homonymie
+
+    Args:
+        prenom: Le prénom
+        nom: Le nom
+
+    Returns:
+        Le nom d'utilisateur ("Éléonore", "N'Diaye" -> "eleonore.ndiaye")
+    """
+    parties = [re.sub(r"[^a-z0-9]", "", normaliser(partie)) for partie in (prenom, nom)]
+    return ".".join(partie for partie in parties if partie) or "etudiant"
 
 class UtilisateurService:
     """Service de gestion des utilisateurs"""
@@ -15,8 +45,14 @@ class UtilisateurService:
         """Initialise le service avec les connexions aux bases de données"""
         self.db = Database.get_db()
         self.redis = Database.get_redis_connection()
+        self.cache = CacheService("utilisateur")
+        self.mots_de_passe = MotDePasseService()
+        self.sessions = SessionService()
+        self.limiteur = LimiteurService()
         self.collection = self.db.utilisateurs
         self.secret_key = os.getenv('SECRET_KEY', 'default_secret_key')
+        # Sessions signées (vérifiées sans Redis) si SESSIONS_SIGNEES=true
+        self.jetons = JetonService(self.secret_key) if SESSIONS_SIGNEES else None
     
     def ajouter_utilisateur(self, utilisateur: Utilisateur, password: str) -> str:
         """
@@ -32,23 +68,213 @@ class UtilisateurService:
         Raises:
             ValueError: Si le nom d'utilisateur existe déjà
         """
-        # Vérifier si le nom d'utilisateur existe déjà
-        if self.collection.find_one({"username": utilisateur.username}):
+        # Refuser un nom pris avant le hachage coûteux; l'index unique couvre les créations simultanées
+        if self.collection.find_one({"username": utilisateur.username}, {"_id": 1}):
             raise ValueError(f"Un utilisateur avec le nom '{utilisateur.username}' existe déjà")
         
-        # Hasher le mot de passe
-        utilisateur.set_password(password)
+        # Hasher le mot de passe (coût BCRYPT_COUT)
+        utilisateur.password_hash = self.mots_de_passe.hacher(password)
         
-        # Insérer dans MongoDB
-        result = self.collection.insert_one(utilisateur.to_dict())
+        # Insérer dans MongoDB (l'unicité du nom est garantie par l'index unique)
+        try:
+            result = self.collection.insert_one(utilisateur.to_dict())
+        except DuplicateKeyError:
+            raise ValueError(f"Un utilisateur avec le nom '{utilisateur.username}' existe déjà")
         utilisateur._id = str(result.inserted_id)
         
         # Mettre à jour le cache Redis
-        self.redis.set(f"utilisateur:{utilisateur._id}", utilisateur.to_json())
-        self.redis.set(f"utilisateur:username:{utilisateur.username}", utilisateur._id)
+        self.cache.mettre_en_cache(utilisateur._id, utilisateur.to_json(), {"username": utilisateur.username})
         
         return utilisateur._id
     
+    def provisionner_etudiants(self, etudiants: Iterable[Etudiant], domaine_email: str = DOMAINE_EMAIL_ETUDIANTS,
+                               taille_lot: int = 1000,
+                               enregistrer: Optional[Callable[[List[Dict[str, Any]]], None]] = None) -> Dict[str, List]:
+        """
+        Crée en masse les comptes (rôle étudiant) d'une liste d'étudiants
+        
+        Pour chaque lot: une requête $in écarte les étudiants ayant déjà un compte, les
+        noms d'utilisateur (prenom.nom, suffixé en cas d'homonymie) sont réservés en une
+        ou deux requêtes, les mots de passe initiaux sont hachés en parallèle sur le pool
+        de processus, puis les comptes sont insérés par un insert_many et mis en cache
+        dans un seul pipeline Redis.
+        
+        Les mots de passe initiaux ne sont stockés nulle part ailleurs: enregistrer reçoit
+        les comptes de chaque lot dès leur insertion, y compris ceux insérés avant une
+        erreur qui interrompt le lot (l'erreur est ensuite propagée).
+        
+        Args:
+            etudiants: Les étudiants (enregistrés, avec leur _id)
+            domaine_email: Domaine des adresses email des comptes
+            taille_lot: Nombre de comptes insérés par requête
+            enregistrer: Fonction appelée avec les comptes créés de chaque lot (format de "crees")
+            
+        Returns:
+            Rapport {"crees": [{"id", "username", "password", "email", "id_etudiant", "nom", "prenom", "classe"}],
+                     "existants": [IDs d'étudiants ayant déjà un compte],
+                     "conflits": [IDs d'étudiants dont aucun nom d'utilisateur n'a pu être réservé]}
+        """
+        rapport = {"crees": [], "existants": [], "conflits": []}
+        vus = set()
+        
+        for lot in decouper(etudiants, taille_lot):
+            # Une seule requête pour les étudiants ayant déjà un compte
+            ids = [etudiant._id for etudiant in lot]
+            existants = {
+                data["id_etudiant"]
+                for data in self.collection.find({"id_etudiant": {"$in": ids}}, {"id_etudiant": 1})
+            }
+            
+            nouveaux = []
+            for etudiant in lot:
+                if etudiant._id in existants or etudiant._id in vus:
+                    rapport["existants"].append(etudiant._id)
+                else:
+                    vus.add(etudiant._id)
+                    nouveaux.append(etudiant)
+            
+            if nouveaux:
+                debut = len(rapport["crees"])
+                try:
+                    self._provisionner_lot(nouveaux, domaine_email, rapport)
+                finally:
+                    if enregistrer and len(rapport["crees"]) > debut:
+                        enregistrer(rapport["crees"][debut:])
+        
+        return rapport
+    
+    def _provisionner_lot(self, etudiants: List[Etudiant], domaine_email: str, rapport: Dict[str, List]) -> None:
+        """
+        Crée les comptes d'un lot d'étudiants sans compte et complète le rapport
+        
+        Args:
+            etudiants: Les étudiants du lot
+            domaine_email: Domaine des adresses email des comptes
+            rapport: Le rapport de provisionnement à compléter
+        """
+        passwords = [generer_mot_de_passe() for _ in etudiants]
+        hashes = self.mots_de_passe.hacher_lot(passwords)
+        
+        # (étudiant, mot de passe, compte, nom de base) des comptes restant à insérer
+        en_attente = [
+            (etudiant, password, Utilisateur(username="", email="", role=Role.ETUDIANT,
+                                             password_hash=password_hash, id_etudiant=etudiant._id),
+             username_de_base(etudiant.prenom, etudiant.nom))
+            for etudiant, password, password_hash in zip(etudiants, passwords, hashes)
+        ]
+        
+        crees = []
+        try:
+            for _ in range(MAX_TENTATIVES_NOMS):
+                usernames = self._reserver_usernames([base for _, _, _, base in en_attente])
+                for (_, _, utilisateur, _), username in zip(en_attente, usernames):
+                    utilisateur.username = username
+                    utilisateur.email = f"{username}@{domaine_email}"
+                
+                # Les noms pris entre-temps par un autre processus sont refusés par l'index unique
+                refuses = self._inserer_utilisateurs([utilisateur for _, _, utilisateur, _ in en_attente])
+                crees.extend(entree for i, entree in enumerate(en_attente) if i not in refuses)
+                en_attente = [entree for i, entree in enumerate(en_attente) if i in refuses]
+                if not en_attente:
+                    break
+        except BulkWriteError:
+            # Les comptes insérés avant l'erreur existent: leurs identifiants doivent être exportés
+            crees.extend(entree for entree in en_attente if entree[2]._id)
+            self._noter_crees(crees, rapport)
+            raise
+        
+        rapport["conflits"].extend(etudiant._id for etudiant, _, _, _ in en_attente)
+        self._noter_crees(crees, rapport)
+        
+        # Les nouveaux comptes (et leurs index username) en un seul pipeline
+        self.cache.mettre_en_cache_lot(
+            (utilisateur._id, utilisateur.to_json(), {"username": utilisateur.username})
+            for _, _, utilisateur, _ in crees
+        )
+    
+    @staticmethod
+    def _noter_crees(crees: List[tuple], rapport: Dict[str, List]) -> None:
+        """Inscrit au rapport les comptes créés (étudiant, mot de passe, compte, nom de base)"""
+        rapport["crees"].extend(
+            {
+                "id": utilisateur._id,
+                "username": utilisateur.username,
+                "password": password,
+                "email": utilisateur.email,
+                "id_etudiant": etudiant._id,
+                "nom": etudiant.nom,
+                "prenom": etudiant.prenom,
+                "classe": etudiant.classe
+            }
+            for etudiant, password, utilisateur, _ in crees
+        )
+    
+    def _reserver_usernames(self, bases: List[str]) -> List[str]:
+        """
+        Choisit des noms d'utilisateur libres à partir de noms de base
+        
+        Un nom de base déjà pris (en base ou plus tôt dans la liste) reçoit le plus
+        petit suffixe numérique libre: "awa.diop", "awa.diop2", "awa.diop3"...
+        
+        Args:
+            bases: Les noms de base
+            
+        Returns:
+            Les noms d'utilisateur, dans l'ordre des bases
+        """
+        distinctes = list(set(bases))
+        pris = {data["username"] for data in self.collection.find({"username": {"$in": distinctes}}, {"username": 1})}
+        
+        # Noms suffixés existants, pour les seules bases déjà prises. Une requête par base:
+        # seul un préfixe littéral ancré (^base) borne le parcours de l'index username,
+        # une alternance ^(a|b) le parcourrait en entier
+        for base in distinctes:
+            if base in pris:
+                motif = "^" + re.escape(base) + r"\d+$"
+                pris.update(data["username"] for data in self.collection.find({"username": {"$regex": motif}}, {"username": 1}))
+        
+        usernames = []
+        for base in bases:
+            username, suffixe = base, 2
+            while username in pris:
+                username = f"{base}{suffixe}"
+                suffixe += 1
+            pris.add(username)
+            usernames.append(username)
+        return usernames
+    
+    def _inserer_utilisateurs(self, utilisateurs: List[Utilisateur]) -> set:
+        """
+        Insère des comptes en un seul insert_many non ordonné
+        
+        Args:
+            utilisateurs: Les comptes à insérer (leur _id est renseigné s'ils sont insérés)
+            
+        Returns:
+            Les positions des comptes refusés pour nom d'utilisateur déjà pris
+            
+        Raises:
+            BulkWriteError: Si une insertion échoue pour une autre raison (les comptes
+                insérés malgré tout ont leur _id renseigné)
+        """
+        documents = [utilisateur.to_dict() for utilisateur in utilisateurs]
+        erreurs = []
+        try:
+            self.collection.insert_many(documents, ordered=False)
+        except BulkWriteError as e:
+            erreurs = e.details.get("writeErrors", [])
+            erreur_bulk = e
+        refuses = {erreur["index"] for erreur in erreurs}
+        
+        # insert_many renseigne l'_id de chaque document avant l'envoi
+        for i, (utilisateur, document) in enumerate(zip(utilisateurs, documents)):
+            if i not in refuses:
+                utilisateur._id = str(document["_id"])
+        
+        if any(erreur.get("code") != 11000 for erreur in erreurs):
+            raise erreur_bulk
+        return refuses
+    
     def obtenir_utilisateur(self, utilisateur_id: str) -> Optional[Utilisateur]:
         """
         Récupère un utilisateur par son ID
@@ -60,20 +286,18 @@ class UtilisateurService:
             L'utilisateur trouvé ou None si aucun utilisateur n'est trouvé
         """
         # Essayer d'abord Redis
-        utilisateur_json = self.redis.get(f"utilisateur:{utilisateur_id}")
-        if utilisateur_json:
-            return Utilisateur.from_json(utilisateur_json)
-        
-        # Sinon, chercher dans MongoDB
-        data = self.collection.find_one({"_id": ObjectId(utilisateur_id)})
-        if not data:
-            return None
-        
-        # Mettre en cache dans Redis
-        utilisateur = Utilisateur.from_dict(data)
-        self.redis.set(f"utilisateur:{utilisateur._id}", utilisateur.to_json())
-        
-        return utilisateur
+        utilisateur_json = self.cache.obtenir(utilisateur_id)
+        if not utilisateur_json:
+            # Sinon, chercher dans MongoDB (un seul lecteur à la fois pour cette clé)
+            utilisateur_json = self.cache.charger_une_fois(
+                self.cache.cle(utilisateur_id),
+                lambda: self.cache.obtenir(utilisateur_id),
+                lambda: self._charger_utilisateur({"_id": ObjectId(utilisateur_id)})
+            )
+            if not utilisateur_json:
+                return None
+        
+        return Utilisateur.from_json(utilisateur_json)
     
     def obtenir_utilisateur_par_username(self, username: str) -> Optional[Utilisateur]:
         """
@@ -85,70 +309,120 @@ class UtilisateurService:
         Returns:
             L'utilisateur trouvé ou None si aucun utilisateur n'est trouvé
         """
-        # Vérifier d'abord dans Redis
-        utilisateur_id = self.redis.get(f"utilisateur:username:{username}")
-        if utilisateur_id:
-            return self.obtenir_utilisateur(utilisateur_id)
+        # Vérifier d'abord dans Redis (index username -> ID, puis utilisateur)
+        utilisateur_json = self.cache.obtenir_par_index("username", username)
+        if not utilisateur_json:
+            # Sinon, chercher dans MongoDB (un seul lecteur à la fois pour ce nom)
+            utilisateur_json = self.cache.charger_une_fois(
+                self.cache.cle_index("username", username),
+                lambda: self.cache.obtenir_par_index("username", username),
+                lambda: self._charger_par_username(username)
+            )
+        
+        # Nom inconnu (éventuellement connu comme tel par le cache négatif)
+        if not utilisateur_json or utilisateur_json == MARQUEUR_ABSENT:
+            return None
+        
+        return Utilisateur.from_json(utilisateur_json)
+    
+    def _charger_par_username(self, username: str) -> str:
+        """Lit un utilisateur par nom dans MongoDB; s'il n'existe pas, l'inscrit au cache négatif"""
+        return self._charger_utilisateur({"username": username}) or self.cache.marquer_absent("username", username)
+    
+    def _charger_utilisateur(self, filtre: Dict[str, Any]) -> Optional[str]:
+        """
+        Lit un utilisateur dans MongoDB et le met en cache avec son index username
         
-        # Sinon, chercher dans MongoDB
-        data = self.collection.find_one({"username": username})
+        Returns:
+            Le JSON de l'utilisateur, ou None s'il n'existe pas
+        """
+        data = self.collection.find_one(filtre)
         if not data:
             return None
         
         utilisateur = Utilisateur.from_dict(data)
-        
-        # Mettre en cache dans Redis
-        self.redis.set(f"utilisateur:{utilisateur._id}", utilisateur.to_json())
-        self.redis.set(f"utilisateur:username:{username}", utilisateur._id)
-        
-        return utilisateur
+        utilisateur_json = utilisateur.to_json()
+        self.cache.mettre_en_cache(utilisateur._id, utilisateur_json, {"username": utilisateur.username})
+        return utilisateur_json
     
-    def authentifier(self, username: str, password: str) -> Optional[Dict[str, Any]]:
+    def authentifier(self, username: str, password: str, client: Optional[str] = None) -> Optional[Dict[str, Any]]:
         """
         Authentifie un utilisateur
         
         Args:
             username: Le nom d'utilisateur
             password: Le mot de passe
+            client: L'identifiant du client (adresse IP...), pour limiter ses tentatives
             
         Returns:
             Dictionnaire contenant le token de session et les infos de l'utilisateur,
             ou None si l'authentification échoue
+            
+        Raises:
+            RateLimitError: Si trop de tentatives ont été faites pour ce nom ou ce client
         """
+        # Limiter les tentatives avant toute recherche et tout calcul bcrypt
+        attente = self.limiteur.consommer(username, client)
+        if attente is not None:
+            raise RateLimitError(attente)
+        
         utilisateur = self.obtenir_utilisateur_par_username(username)
         
-        if not utilisateur or not utilisateur.check_password(password):
+        if not utilisateur or not self.mots_de_passe.verifier(password, utilisateur.password_hash):
             return None
         
-        # Générer un token de session
-        session_token = str(uuid.uuid4())
-        expiration = int(time.time()) + 24 * 60 * 60  # 24 heures
+        # Le coût configuré a changé depuis le hachage: refaire le hash tant que le mot de passe est connu
+        if self.mots_de_passe.doit_rehacher(utilisateur.password_hash):
+            self._rehacher(utilisateur, self.mots_de_passe.hacher(password))
         
-        session_data = {
-            "utilisateur_id": utilisateur._id,
-            "username": utilisateur.username,
-            "role": utilisateur.role.value,
-            "expiration": expiration
-        }
+        # Connexion réussie: les échecs précédents ne comptent plus contre ce nom
+        self.limiteur.reinitialiser(username)
         
-        # Stocker la session dans Redis
-        self.redis.set(f"session:{session_token}", json.dumps(session_data))
-        self.redis.expire(f"session:{session_token}", 24 * 60 * 60)  # 24 heures
+        # Ouvrir la session: jeton signé, ou hash Redis avec durée de vie glissante
+        session = self.jetons.emettre(utilisateur) if self.jetons else self.sessions.creer(utilisateur)
         
+        return self._resultat_connexion(utilisateur, session)
+    
+    @staticmethod
+    def _resultat_connexion(utilisateur: Utilisateur, session: Dict[str, Any]) -> Dict[str, Any]:
+        """Construit la réponse d'une authentification réussie (token, infos de l'utilisateur, expiration)"""
         return {
-            "token": session_token,
+            "token": session["token"],
             "utilisateur": {
                 "id": utilisateur._id,
                 "username": utilisateur.username,
                 "email": utilisateur.email,
-                "role": utilisateur.role.value
+                "role": utilisateur.role.value,
+                "id_etudiant": utilisateur.id_etudiant
             },
-            "expiration": expiration
+            "expiration": session["expiration"]
         }
     
+    def _rehacher(self, utilisateur: Utilisateur, nouveau_hash: str) -> None:
+        """
+        Remplace le hash du mot de passe d'un utilisateur par un hash au coût configuré
+        
+        Le remplacement est conditionné à l'ancien hash pour ne pas écraser un changement
+        de mot de passe concurrent.
+        
+        Args:
+            utilisateur: L'utilisateur authentifié
+            nouveau_hash: Le nouveau hash de son mot de passe
+        """
+        resultat = self.collection.update_one(
+            {"_id": ObjectId(utilisateur._id), "password_hash": utilisateur.password_hash},
+            {"$set": {"password_hash": nouveau_hash}}
+        )
+        if resultat.modified_count:
+            utilisateur.password_hash = nouveau_hash
+            self.cache.mettre_en_cache(utilisateur._id, utilisateur.to_json(), {"username": utilisateur.username})
+    
     def verifier_session(self, session_token: str) -> Optional[Dict[str, Any]]:
         """
-        Vérifie si une session est valide
+        Vérifie si une session est valide et prolonge sa durée de vie
+        
+        Un jeton signé est vérifié dans le processus (la liste des révocations n'est lue
+        que pour les jetons émis avant la dernière révocation).
         
         Args:
             session_token: Le token de session
@@ -156,18 +430,9 @@ class UtilisateurService:
         Returns:
             Les informations de session ou None si la session est invalide ou expirée
         """
-        session_json = self.redis.get(f"session:{session_token}")
-        if not session_json:
-            return None
-        
-        session_data = json.loads(session_json)
-        
-        # Vérifier l'expiration
-        if session_data.get("expiration", 0) < int(time.time()):
-            self.redis.delete(f"session:{session_token}")
-            return None
-        
-        return session_data
+        if self.jetons and JetonService.est_signe(session_token):
+            return self.jetons.verifier(session_token)
+        return self.sessions.verifier(session_token)
     
     def deconnecter(self, session_token: str) -> bool:
         """
@@ -179,7 +444,59 @@ class UtilisateurService:
         Returns:
             True si la déconnexion a réussi, False sinon
         """
-        return bool(self.redis.delete(f"session:{session_token}"))
+        if self.jetons and JetonService.est_signe(session_token):
+            return self.jetons.revoquer_jeton(session_token)
+        return self.sessions.supprimer(session_token)
+    
+    def deconnecter_partout(self, utilisateur_id: str) -> int:
+        """
+        Ferme toutes les sessions d'un utilisateur et révoque ses jetons signés
+        
+        Args:
+            utilisateur_id: L'ID de l'utilisateur
+            
+        Returns:
+            Le nombre de sessions Redis fermées
+        """
+        if self.jetons:
+            self.jetons.revoquer_utilisateur(utilisateur_id)
+        return self.sessions.supprimer_sessions_utilisateur(utilisateur_id)
+    
+    def lister_sessions(self, utilisateur_id: str) -> List[Dict[str, Any]]:
+        """
+        Liste les sessions Redis actives d'un utilisateur (les jetons signés ne sont pas enregistrés)
+        
+        Args:
+            utilisateur_id: L'ID de l'utilisateur
+            
+        Returns:
+            Liste de {token, creation, expiration}
+        """
+        return self.sessions.lister_sessions(utilisateur_id)
+    
+    def changer_mot_de_passe(self, utilisateur_id: str, password: str) -> bool:
+        """
+        Change le mot de passe d'un utilisateur et ferme toutes ses sessions
+        
+        Args:
+            utilisateur_id: L'ID de l'utilisateur
+            password: Le nouveau mot de passe en clair
+            
+        Returns:
+            True si le mot de passe a été changé, False si l'utilisateur n'existe pas
+        """
+        data = self.collection.find_one_and_update(
+            {"_id": ObjectId(utilisateur_id)},
+            {"$set": {"password_hash": self.mots_de_passe.hacher(password)}},
+            return_document=ReturnDocument.AFTER
+        )
+        if data is None:
+            return False
+        
+        utilisateur = Utilisateur.from_dict(data)
+        self.cache.mettre_en_cache(utilisateur._id, utilisateur.to_json(), {"username": utilisateur.username})
+        self.deconnecter_partout(utilisateur_id)
+        return True
     
     def mettre_a_jour_utilisateur(self, utilisateur: Utilisateur) -> bool:
         """
@@ -194,24 +511,35 @@ class UtilisateurService:
         if not utilisateur._id:
             return False
         
-        resultat = self.collection.update_one(
+        update_data = self._donnees_mise_a_jour(utilisateur)
+        
+        # Récupérer l'état précédent dans le même aller-retour (ancien nom d'utilisateur)
+        ancien = self.collection.find_one_and_update(
             {"_id": ObjectId(utilisateur._id)},
-            {"$set": {
-                "username": utilisateur.username,
-                "email": utilisateur.email,
-                "role": utilisateur.role.value,
-                "password_hash": utilisateur.password_hash,
-                "id_etudiant": utilisateur.id_etudiant
-            }}
+            {"$set": update_data},
+            projection=dict.fromkeys(update_data, 1),
+            return_document=ReturnDocument.BEFORE
         )
         
-        # Mettre à jour le cache Redis
-        if resultat.modified_count > 0:
-            self.redis.set(f"utilisateur:{utilisateur._id}", utilisateur.to_json())
-            self.redis.set(f"utilisateur:username:{utilisateur.username}", utilisateur._id)
-            return True
+        if ancien is None or all(ancien.get(champ) == valeur for champ, valeur in update_data.items()):
+            return False
         
-        return False
+        # Mettre à jour le cache Redis (l'index de l'ancien nom ne doit plus pointer ici)
+        if ancien.get("username") != utilisateur.username:
+            self.cache.invalider_index({"username": ancien.get("username")})
+        self.cache.mettre_en_cache(utilisateur._id, utilisateur.to_json(), {"username": utilisateur.username})
+        return True
+    
+    @staticmethod
+    def _donnees_mise_a_jour(utilisateur: Utilisateur) -> Dict[str, Any]:
+        """Construit les champs écrits par la mise à jour d'un utilisateur"""
+        return {
+            "username": utilisateur.username,
+            "email": utilisateur.email,
+            "role": utilisateur.role.value,
+            "password_hash": utilisateur.password_hash,
+            "id_etudiant": utilisateur.id_etudiant
+        }
     
     def supprimer_utilisateur(self, utilisateur_id: str) -> bool:
         """
@@ -230,10 +558,10 @@ class UtilisateurService:
         
         resultat = self.collection.delete_one({"_id": ObjectId(utilisateur_id)})
         
-        # Supprimer les entrées dans Redis
+        # Supprimer les entrées dans Redis et fermer ses sessions
         if resultat.deleted_count > 0:
-            self.redis.delete(f"utilisateur:{utilisateur_id}")
-            self.redis.delete(f"utilisateur:username:{utilisateur.username}")
+            self.cache.invalider(utilisateur_id, {"username": utilisateur.username})
+            self.deconnecter_partout(utilisateur_id)
             return True
         
         return False
@@ -0,0 +1,314 @@
+import os
+from typing import List, Dict, Any, Optional
+from bson import ObjectId
+from pymongo import ReturnDocument
+from pymongo.errors import DuplicateKeyError
+
+from src.models.utilisateur import Utilisateur, Role
+from src.config.database import Database
+from src.services.cache_service import MARQUEUR_ABSENT
+from src.services.cache_service_async import CacheServiceAsync
+from src.services.utilisateur_service import UtilisateurService
+from src.services.mot_de_passe_service import MotDePasseService
+from src.services.session_service_async import SessionServiceAsync
+from src.services.jeton_service import JetonService, SESSIONS_SIGNEES
+from src.services.jeton_service_async import JetonServiceAsync
+from src.services.limiteur_service_async import LimiteurServiceAsync
+from src.utils.exception.exceptions import RateLimitError
+
+class UtilisateurServiceAsync:
+    """
+    Service asyncio de gestion des utilisateurs (motor + redis.asyncio)
+
+    Expose les mêmes opérations qu'UtilisateurService, avec les mêmes documents, clés
+    de cache et sessions. Le hachage bcrypt, coûteux en CPU, est exécuté sur le pool
+    de processus de MotDePasseService: les connexions simultanées se répartissent sur
+    tous les cœurs sans bloquer la boucle d'événements.
+    """
+
+    def __init__(self):
+        """Initialise le service avec ses propres clients asyncio"""
+        self.client, self.db, self.redis = Database.creer_connexions_async()
+        self.cache = CacheServiceAsync("utilisateur", self.redis)
+        self.mots_de_passe = MotDePasseService()
+        self.sessions = SessionServiceAsync(self.redis)
+        self.limiteur = LimiteurServiceAsync(self.redis)
+        self.jetons = JetonServiceAsync(self.redis, os.getenv('SECRET_KEY', 'default_secret_key')) if SESSIONS_SIGNEES else None
+        self.collection = self.db.utilisateurs
+
+    async def __aenter__(self) -> 'UtilisateurServiceAsync':
+        """Permet d'utiliser le service dans un bloc async with"""
+        return self
+
+    async def __aexit__(self, *exc) -> None:
+        """Ferme les clients à la sortie du bloc async with"""
+        await self.fermer()
+
+    async def fermer(self) -> None:
+        """Ferme les clients MongoDB et Redis du service"""
+        self.client.close()
+        await self.redis.aclose()
+
+    async def ajouter_utilisateur(self, utilisateur: Utilisateur, password: str) -> str:
+        """
+        Ajoute un utilisateur à la base de données
+
+        Args:
+            utilisateur: L'utilisateur à ajouter
+            password: Le mot de passe en clair
+
+        Returns:
+            L'ID de l'utilisateur créé
+
+        Raises:
+            ValueError: Si le nom d'utilisateur existe déjà
+        """
+        # Refuser un nom pris avant le hachage coûteux; l'index unique couvre les créations simultanées
+        if await self.collection.find_one({"username": utilisateur.username}, {"_id": 1}):
+            raise ValueError(f"Un utilisateur avec le nom '{utilisateur.username}' existe déjà")
+
+        utilisateur.password_hash = await self.mots_de_passe.hacher_async(password)
+
+        try:
+            result = await self.collection.insert_one(utilisateur.to_dict())
+        except DuplicateKeyError:
+            raise ValueError(f"Un utilisateur avec le nom '{utilisateur.username}' existe déjà")
+        utilisateur._id = str(result.inserted_id)
+
+        await self.cache.mettre_en_cache(utilisateur._id, utilisateur.to_json(), {"username": utilisateur.username})
+
+        return utilisateur._id
+
+    async def obtenir_utilisateur(self, utilisateur_id: str) -> Optional[Utilisateur]:
+        """
+        Récupère un utilisateur par son ID
+
+        Args:
+            utilisateur_id: L'ID de l'utilisateur
+
+        Returns:
+            L'utilisateur trouvé ou None si aucun utilisateur n'est trouvé
+        """
+        utilisateur_json = await self.cache.obtenir(utilisateur_id)
+        if not utilisateur_json:
+            utilisateur_json = await self.cache.charger_une_fois(
+                self.cache.cle(utilisateur_id),
+                lambda: self.cache.obtenir(utilisateur_id),
+                lambda: self._charger_utilisateur({"_id": ObjectId(utilisateur_id)})
+            )
+            if not utilisateur_json:
+                return None
+
+        return Utilisateur.from_json(utilisateur_json)
+
+    async def obtenir_utilisateur_par_username(self, username: str) -> Optional[Utilisateur]:
+        """
+        Récupère un utilisateur par son nom d'utilisateur
+
+        Args:
+            username: Le nom d'utilisateur
+
+        Returns:
+            L'utilisateur trouvé ou None si aucun utilisateur n'est trouvé
+        """
+        utilisateur_json = await self.cache.obtenir_par_index("username", username)
+        if not utilisateur_json:
+            utilisateur_json = await self.cache.charger_une_fois(
+                self.cache.cle_index("username", username),
+                lambda: self.cache.obtenir_par_index("username", username),
+                lambda: self._charger_par_username(username)
+            )
+
+        if not utilisateur_json or utilisateur_json == MARQUEUR_ABSENT:
+            return None
+
+        return Utilisateur.from_json(utilisateur_json)
+
+    async def _charger_par_username(self, username: str) -> str:
+        """Lit un utilisateur par nom dans MongoDB; s'il n'existe pas, l'inscrit au cache négatif"""
+        return (await self._charger_utilisateur({"username": username})
+                or await self.cache.marquer_absent("username", username))
+
+    async def _charger_utilisateur(self, filtre: Dict[str, Any]) -> Optional[str]:
+        """Lit un utilisateur dans MongoDB et le met en cache avec son index username"""
+        data = await self.collection.find_one(filtre)
+        if not data:
+            return None
+
+        utilisateur = Utilisateur.from_dict(data)
+        utilisateur_json = utilisateur.to_json()
+        await self.cache.mettre_en_cache(utilisateur._id, utilisateur_json, {"username": utilisateur.username})
+        return utilisateur_json
+
+    async def authentifier(self, username: str, password: str, client: Optional[str] = None) -> Optional[Dict[str, Any]]:
+        """
+        Authentifie un utilisateur
+
+        Args:
+            username: Le nom d'utilisateur
+            password: Le mot de passe
+            client: L'identifiant du client (adresse IP...), pour limiter ses tentatives
+
+        Returns:
+            Dictionnaire contenant le token de session et les infos de l'utilisateur,
+            ou None si l'authentification échoue
+
+        Raises:
+            RateLimitError: Si trop de tentatives ont été faites pour ce nom ou ce client
+        """
+        attente = await self.limiteur.consommer(username, client)
+        if attente is not None:
+            raise RateLimitError(attente)
+
+        utilisateur = await self.obtenir_utilisateur_par_username(username)
+
+        if not utilisateur or not await self.mots_de_passe.verifier_async(password, utilisateur.password_hash):
+            return None
+
+        if self.mots_de_passe.doit_rehacher(utilisateur.password_hash):
+            await self._rehacher(utilisateur, await self.mots_de_passe.hacher_async(password))
+
+        await self.limiteur.reinitialiser(username)
+        session = self.jetons.emettre(utilisateur) if self.jetons else await self.sessions.creer(utilisateur)
+        return UtilisateurService._resultat_connexion(utilisateur, session)
+
+    async def _rehacher(self, utilisateur: Utilisateur, nouveau_hash: str) -> None:
+        """Remplace le hash d'un utilisateur par un hash au coût configuré, sauf changement concurrent"""
+        resultat = await self.collection.update_one(
+            {"_id": ObjectId(utilisateur._id), "password_hash": utilisateur.password_hash},
+            {"$set": {"password_hash": nouveau_hash}}
+        )
+        if resultat.modified_count:
+            utilisateur.password_hash = nouveau_hash
+            await self.cache.mettre_en_cache(utilisateur._id, utilisateur.to_json(), {"username": utilisateur.username})
+
+    async def verifier_session(self, session_token: str) -> Optional[Dict[str, Any]]:
+        """
+        Vérifie si une session est valide et prolonge sa durée de vie
+
+        Args:
+            session_token: Le token de session
+
+        Returns:
+            Les informations de session ou None si la session est invalide ou expirée
+        """
+        if self.jetons and JetonService.est_signe(session_token):
+            return await self.jetons.verifier(session_token)
+        return await self.sessions.verifier(session_token)
+
+    async def deconnecter(self, session_token: str) -> bool:
+        """
+        Déconnecte un utilisateur en supprimant sa session
+
+        Args:
+            session_token: Le token de session
+
+        Returns:
+            True si la déconnexion a réussi, False sinon
+        """
+        if self.jetons and JetonService.est_signe(session_token):
+            return await self.jetons.revoquer_jeton(session_token)
+        return await self.sessions.supprimer(session_token)
+
+    async def deconnecter_partout(self, utilisateur_id: str) -> int:
+        """Ferme toutes les sessions d'un utilisateur, révoque ses jetons signés et retourne le nombre de sessions fermées"""
+        if self.jetons:
+            await self.jetons.revoquer_utilisateur(utilisateur_id)
+        return await self.sessions.supprimer_sessions_utilisateur(utilisateur_id)
+
+    async def lister_sessions(self, utilisateur_id: str) -> List[Dict[str, Any]]:
+        """Liste les sessions actives d'un utilisateur: [{token, creation, expiration}]"""
+        return await self.sessions.lister_sessions(utilisateur_id)
+
+    async def changer_mot_de_passe(self, utilisateur_id: str, password: str) -> bool:
+        """
+        Change le mot de passe d'un utilisateur et ferme toutes ses sessions
+
+        Args:
+            utilisateur_id: L'ID de l'utilisateur
+            password: Le nouveau mot de passe en clair
+
+        Returns:
+            True si le mot de passe a été changé, False si l'utilisateur n'existe pas
+        """
+        data = await self.collection.find_one_and_update(
+            {"_id": ObjectId(utilisateur_id)},
+            {"$set": {"password_hash": await self.mots_de_passe.hacher_async(password)}},
+            return_document=ReturnDocument.AFTER
+        )
+        if data is None:
+            return False
+
+        utilisateur = Utilisateur.from_dict(data)
+        await self.cache.mettre_en_cache(utilisateur._id, utilisateur.to_json(), {"username": utilisateur.username})
+        await self.deconnecter_partout(utilisateur_id)
+        return True
+
+    async def mettre_a_jour_utilisateur(self, utilisateur: Utilisateur) -> bool:
+        """
+        Met à jour un utilisateur
+
+        Args:
+            utilisateur: L'utilisateur à mettre à jour
+
+        Returns:
+            True si la mise à jour a réussi, False sinon
+        """
+        if not utilisateur._id:
+            return False
+
+        update_data = UtilisateurService._donnees_mise_a_jour(utilisateur)
+        ancien = await self.collection.find_one_and_update(
+            {"_id": ObjectId(utilisateur._id)},
+            {"$set": update_data},
+            projection=dict.fromkeys(update_data, 1),
+            return_document=ReturnDocument.BEFORE
+        )
+
+        if ancien is None or all(ancien.get(champ) == valeur for champ, valeur in update_data.items()):
+            return False
+
+        if ancien.get("username") != utilisateur.username:
+            await self.cache.invalider_index({"username": ancien.get("username")})
+        await self.cache.mettre_en_cache(utilisateur._id, utilisateur.to_json(), {"username": utilisateur.username})
+        return True
+
+    async def supprimer_utilisateur(self, utilisateur_id: str) -> bool:
+        """
+        Supprime un utilisateur
+
+        Args:
+            utilisateur_id: L'ID de l'utilisateur à supprimer
+
+        Returns:
+            True si la suppression a réussi, False sinon
+        """
+        data = await self.collection.find_one_and_delete({"_id": ObjectId(utilisateur_id)}, {"username": 1})
+        if data is None:
+            return False
+
+        await self.cache.invalider(utilisateur_id, {"username": data["username"]})
+        await self.deconnecter_partout(utilisateur_id)
+        return True
+
+    async def lister_utilisateurs(self) -> List[Utilisateur]:
+        """
+        Liste tous les utilisateurs
+
+        Returns:
+            Liste de tous les utilisateurs
+        """
+        return [Utilisateur.from_dict(data) async for data in self.collection.find()]
+
+    async def lister_utilisateurs_par_role(self, role: Role) -> List[Utilisateur]:
+        """
+        Liste tous les utilisateurs ayant un rôle spécifique
+
+        Args:
+            role: Le rôle recherché
+
+        Returns:
+            Liste des utilisateurs ayant ce rôle
+        """
+        role_value = role.value if isinstance(role, Role) else role
+        return [Utilisateur.from_dict(data) async for data in self.collection.find({"role": role_value})]
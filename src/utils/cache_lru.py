@@ -0,0 +1,98 @@
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Optional
+
+class CacheLRU:
+    """Cache en mémoire borné en taille (éviction LRU) et en âge (TTL), sûr entre threads"""
+
+    def __init__(self, taille_max: int = 1000, ttl: float = 30.0):
+        """
+        Initialise le cache
+
+        Args:
+            taille_max: Nombre maximal d'entrées (les moins récemment utilisées sont évincées)
+            ttl: Durée de vie d'une entrée en secondes
+        """
+        self.taille_max = taille_max
+        self.ttl = ttl
+        self._donnees = OrderedDict()  # clé -> (valeur, instant d'expiration)
+        self._verrou = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    def obtenir(self, cle: str) -> Optional[Any]:
+        """
+        Retourne la valeur associée à une clé
+
+        Args:
+            cle: La clé
+
+        Returns:
+            La valeur, ou None si la clé est absente ou expirée
+        """
+        with self._verrou:
+            entree = self._donnees.get(cle)
+            if entree is None:
+                self.misses += 1
+                return None
+
+            valeur, expiration = entree
+            if expiration < time.monotonic():
+                del self._donnees[cle]
+                self.expirations += 1
+                self.misses += 1
+                return None
+
+            self._donnees.move_to_end(cle)
+            self.hits += 1
+            return valeur
+
+    def definir(self, cle: str, valeur: Any) -> None:
+        """
+        Associe une valeur à une clé
+
+        Args:
+            cle: La clé
+            valeur: La valeur (None n'est pas mis en cache)
+        """
+        if valeur is None or self.taille_max <= 0:
+            return
+
+        with self._verrou:
+            self._donnees[cle] = (valeur, time.monotonic() + self.ttl)
+            self._donnees.move_to_end(cle)
+            while len(self._donnees) > self.taille_max:
+                self._donnees.popitem(last=False)
+                self.evictions += 1
+
+    def supprimer(self, *cles: str) -> None:
+        """Retire des clés du cache"""
+        with self._verrou:
+            for cle in cles:
+                self._donnees.pop(cle, None)
+
+    def vider(self) -> None:
+        """Vide le cache"""
+        with self._verrou:
+            self._donnees.clear()
+
+    def statistiques(self) -> Dict[str, Any]:
+        """
+        Retourne les compteurs du cache
+
+        Returns:
+            Dictionnaire {taille, hits, misses, evictions, expirations, taux_hits}
+        """
+        with self._verrou:
+            total = self.hits + self.misses
+            return {
+                "taille": len(self._donnees),
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "expirations": self.expirations,
+                "taux_hits": self.hits / total if total else 0.0
+            }
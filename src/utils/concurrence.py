@@ -0,0 +1,83 @@
+import asyncio
+from typing import Any, Awaitable, Callable, Iterable, Iterator, List, TypeVar
+
+T = TypeVar("T")
+
+async def executer_en_parallele(fonction: Callable[[T], Awaitable[Any]], elements: Iterable[T],
+                                limite: int = 10) -> List[Any]:
+    """
+    Applique une coroutine à chaque élément avec au plus `limite` appels simultanés
+
+    Args:
+        fonction: La coroutine à appliquer
+        elements: Les éléments à traiter
+        limite: Nombre maximal d'appels en cours en même temps
+
+    Returns:
+        Les résultats, dans l'ordre des éléments
+    """
+    semaphore = asyncio.Semaphore(limite)
+
+    async def executer(element):
+        async with semaphore:
+            return await fonction(element)
+
+    return await asyncio.gather(*(executer(element) for element in elements))
+
+async def executer_en_flux(fonction: Callable[[T], Awaitable[Any]], elements: Iterable[T],
+                           limite: int = 10) -> None:
+    """
+    Applique une coroutine à chaque élément en consommant les éléments au fur et à mesure
+
+    Contrairement à executer_en_parallele, l'élément suivant n'est lu que lorsqu'un
+    appel se termine: au plus `limite` éléments sont en mémoire à la fois, ce qui
+    convient à un générateur produisant de gros lots.
+
+    Args:
+        fonction: La coroutine à appliquer
+        elements: Les éléments à traiter (itérable, éventuellement un générateur)
+        limite: Nombre maximal d'appels en cours en même temps
+
+    Raises:
+        Exception: La première erreur levée par un appel (les appels en cours sont annulés)
+    """
+    en_cours = set()
+    try:
+        for element in elements:
+            if len(en_cours) >= limite:
+                termines, en_cours = await asyncio.wait(en_cours, return_when=asyncio.FIRST_COMPLETED)
+                for tache in termines:
+                    tache.result()
+            en_cours.add(asyncio.ensure_future(fonction(element)))
+
+        while en_cours:
+            termines, en_cours = await asyncio.wait(en_cours, return_when=asyncio.FIRST_COMPLETED)
+            for tache in termines:
+                tache.result()
+    except BaseException:
+        for tache in en_cours:
+            tache.cancel()
+        raise
+
+def decouper(elements: Iterable[T], taille_lot: int) -> Iterator[List[T]]:
+    """
+    Découpe des éléments en lots, au fil de leur lecture
+
+    Seul le lot en cours est gardé en mémoire: un curseur MongoDB passé en entrée
+    n'est lu qu'au rythme du traitement des lots.
+
+    Args:
+        elements: Les éléments (itérable, éventuellement un générateur)
+        taille_lot: Nombre d'éléments par lot
+
+    Returns:
+        Les lots
+    """
+    lot = []
+    for element in elements:
+        lot.append(element)
+        if len(lot) >= taille_lot:
+            yield lot
+            lot = []
+    if lot:
+        yield lot
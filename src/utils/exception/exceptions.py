@@ -25,6 +25,13 @@ class AuthenticationError(ApplicationError):
         super().__init__(message)
 
 
+class RateLimitError(AuthenticationError):
+    """Exception levée quand trop de tentatives de connexion ont été faites"""
+    def __init__(self, attente: float = 0):
+        self.attente = attente
+        super().__init__(f"Trop de tentatives de connexion, réessayez dans {max(1, round(attente))} secondes")
+
+
 class AuthorizationError(ApplicationError):
     """Exception levée pour les erreurs d'autorisation (permissions)"""
     def __init__(self, message="Vous n'avez pas les droits nécessaires pour cette action"):
@@ -48,4 +55,16 @@ class DuplicateResourceError(ApplicationError):
         if identifier:
             message += f" avec l'identifiant '{identifier}'"
         message += " existe déjà"
-        super().__init__(message) 
\ No newline at end of file
+        super().__init__(message)
+
+
+class ConfigurationError(ApplicationError):
+    """Exception levée quand la configuration (variables d'environnement) est invalide"""
+    def __init__(self, message="Configuration invalide"):
+        super().__init__(message)
+
+
+class VersionConflictError(ApplicationError):
+    """Exception levée quand une ressource a été modifiée entre sa lecture et sa mise à jour"""
+    def __init__(self, message="La ressource a été modifiée par un autre utilisateur"):
+        super().__init__(message)
@@ -0,0 +1,83 @@
+"""
+Tests de la structure en colonnes des notes (ClasseFrame)
+
+Exécution:
+    python -m unittest discover -s tests
+"""
+import random
+import unittest
+
+from src.models.classe_frame import ClasseFrame, BORNES_MENTIONS, NOMS_MENTIONS
+from src.services.etudiant.agregation import mention_pour
+
+
+def document(numero: int, notes: dict, classe: str = "L1") -> dict:
+    """Document étudiant minimal (_id, classe, notes)"""
+    return {"_id": f"{numero:024x}", "classe": classe, "notes": notes}
+
+
+class TestMentions(unittest.TestCase):
+    """Moyennes situées exactement sur une borne de mention"""
+
+    def test_moyenne_sur_une_borne(self):
+        # (12.97 + 16.23 + 0.8) / 3 = 10 exactement, mais pas en flottant
+        frame = ClasseFrame.depuis_documents([document(1, {"a": 12.97, "b": 16.23, "c": 0.8})])
+
+        self.assertEqual(frame.moyennes()[0], 10.0)
+        self.assertEqual(NOMS_MENTIONS[frame.mentions()[0]], "passable")
+
+    def test_bornes_aleatoires(self):
+        generateur = random.Random(11)
+        documents, attendues = [], []
+        for numero in range(4000):
+            borne = generateur.choice(BORNES_MENTIONS[1:])
+            nombre = generateur.randint(2, 6)
+            # Notes à deux décimales dont la somme vaut exactement borne * nombre (en centièmes)
+            while True:
+                centiemes = [generateur.randint(0, 2000) for _ in range(nombre - 1)]
+                derniere = borne * 100 * nombre - sum(centiemes)
+                if 0 <= derniere <= 2000:
+                    break
+            notes = {f"m{i}": c / 100 for i, c in enumerate(centiemes + [derniere])}
+            documents.append(document(numero, notes))
+            attendues.append(mention_pour(borne))
+
+        frame = ClasseFrame.depuis_documents(documents)
+        obtenues = [NOMS_MENTIONS[i] for i in frame.mentions()]
+
+        self.assertEqual(obtenues, attendues)
+
+    def test_sans_note(self):
+        frame = ClasseFrame.depuis_documents([document(1, {}), document(2, {"a": 15})])
+
+        self.assertEqual(list(frame.mentions()), [-1, NOMS_MENTIONS.index("bien")])
+        self.assertEqual(frame.repartition_mentions()["bien"], 1)
+
+
+class TestStatistiques(unittest.TestCase):
+    """Statistiques par matière et classement"""
+
+    def test_statistiques_sans_bruit_float32(self):
+        frame = ClasseFrame.depuis_documents([document(1, {"a": 9.7}), document(2, {"a": 13.7})])
+        stats = frame.statistiques_matieres()["a"]
+
+        self.assertEqual(stats["min"], 9.7)
+        self.assertEqual(stats["max"], 13.7)
+        self.assertEqual(stats["moyenne"], 11.7)
+        self.assertEqual(stats["ecart_type"], 2.0)
+
+    def test_rangs_et_ordre(self):
+        frame = ClasseFrame.depuis_documents([
+            document(1, {"a": 12}),
+            document(2, {"a": 15}),
+            document(3, {"a": 12}),
+            document(4, {"a": 8}),
+        ])
+        moyennes = frame.moyennes()
+
+        self.assertEqual(list(frame.rangs(moyennes)), [2, 1, 2, 4])
+        self.assertEqual(list(frame.ordre(moyennes)), [1, 0, 2, 3])
+
+
+if __name__ == "__main__":
+    unittest.main()